@@ -1,7 +1,10 @@
-from flask import Flask, render_template, request, jsonify
-from datetime import datetime
-import json
-from typing import List, Dict
+from flask import Flask, Response, render_template, request, jsonify
+import hmac
+import os
+import time
+from functools import partial
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 
 # -------------------------------
 # Project Configuration
@@ -12,18 +15,62 @@ from config import (
     HOST,
     PORT,
     DATA_DIR,
-    OUTPUTS_DIR
+    OUTPUTS_DIR,
+    DEBUG_ENDPOINT_TOKEN,
+    JSON_FILES_COMPACT,
+    CONVERSATION_LOG_MAX_BYTES,
+    DEFAULT_SESSION_ID,
+    ADMISSION_DEADLINE_SECONDS,
+    ADMISSION_DEGRADED_MODE,
+    CONTEXT_WINDOW_TURNS
 )
 
 # NLP Pipeline
-from nlp.pipeline import run_nlp_pipeline
+from nlp.pipeline import run_nlp_pipeline, run_windowed_nlp_pipeline
+from nlp.context_window import ConversationWindow
+from nlp.turns import Role, Turn
+from nlp import ner, keywords
+from nlp.rules import get_rules, read_rule_tables, start_reload
+from nlp.stage_graph import StageTimeout
 
 # Logger
-from utils.logger import get_logger
+from utils.logger import get_logger, get_log_queue_size
+
+# Diagnostics
+from utils.memory import memory_profiler
+from utils.profiling import cpu_profile, should_profile
+
+# Admission control
+from utils.admission import Overloaded, admission_controller, render_prometheus
+
+# Serialization & compression
+from utils.serialization import (
+    FastJSONProvider,
+    append_json_array,
+    compress_response,
+    dumps
+)
+
+# Storage (None = flat JSON files)
+from utils.storage import (
+    FIELD_BITS as ENTITY_FIELD_BITS,
+    SEARCH_MODES,
+    get_storage
+)
+
+# Delta responses
+from utils.sessions import (
+    Conversation,
+    ConversationStore,
+    make_etag,
+    session_store,
+    valid_session_id
+)
 
 # Validators
 from utils.validators import (
     validate_conversation,
+    validate_nlp_output,
     validate_structured_summary,
     validate_sentiment_intent,
     validate_soap_note
@@ -34,6 +81,7 @@ from utils.validators import (
 # -------------------------------
 app = Flask(__name__)
 app.config["APP_NAME"] = APP_NAME
+app.json = FastJSONProvider(app)
 
 logger = get_logger(__name__)
 logger.info(f"{APP_NAME} application started")
@@ -41,7 +89,25 @@ logger.info(f"{APP_NAME} application started")
 # -------------------------------
 # In-memory conversation store
 # -------------------------------
-conversation_history: List[Dict] = []
+# One history per session, each with a bounded analysis window
+# (CONTEXT_WINDOW_TURNS = 0 analyzes the full history)
+conversations = ConversationStore(
+    make_window=(
+        partial(ConversationWindow, CONTEXT_WINDOW_TURNS)
+        if CONTEXT_WINDOW_TURNS > 0 else None
+    )
+)
+
+# Configured storage backend (None = flat JSON files in data/)
+storage = get_storage()
+
+# Result of the most recent pipeline self-check in this process
+worker_health: Dict = {"self_check": None, "checked_at": None}
+
+SELF_CHECK_CONVERSATION = [
+    Turn.now(Role.PATIENT, "I have had neck pain since the car accident."),
+    Turn.now(Role.PHYSICIAN, "Can you tell me more about the pain?")
+]
 
 # -------------------------------
 # File Paths (from config)
@@ -56,6 +122,14 @@ SOAP_FILE = OUTPUTS_DIR / "soap_note.json"
 # Routes
 # ------------------------------------------------------------------
 
+@app.after_request
+def compress(response):
+    """
+    gzip large responses for clients that accept it
+    """
+    return compress_response(response, request.accept_encodings)
+
+
 @app.route("/")
 def index():
     """
@@ -78,85 +152,544 @@ def chat():
             logger.warning("Empty patient message received")
             return jsonify({"error": "Empty message"}), 400
 
-        # -------------------------------
-        # Store patient message
-        # -------------------------------
-        conversation_history.append({
-            "role": "Patient",
-            "text": patient_message,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        session_id = data.get("session_id")
+        if session_id is not None and not valid_session_id(session_id):
+            return jsonify({"error": "Invalid session_id"}), 400
 
-        if not validate_conversation(conversation_history):
-            logger.error("Conversation validation failed")
-            return jsonify({"error": "Invalid conversation format"}), 400
+        payload, status, nlp_output, turns = handle_chat_turn(
+            patient_message,
+            session_id or DEFAULT_SESSION_ID,
+            profile=should_profile(profile_requested(request.headers)),
+            deadline=request_deadline(request.headers)
+        )
+
+        if status != 200:
+            return error_response(payload, status)
 
-        logger.info("Patient message stored and validated")
+        if session_id is not None and nlp_output is not None:
+            payload = session_payload(
+                payload, nlp_output, session_id, data.get("base_version")
+            )
 
         # -------------------------------
-        # Generate physician reply
+        # Persist conversation + outputs
         # -------------------------------
-        physician_reply = generate_physician_reply(patient_message)
+        if storage is not None:
+            storage.save_chat_turn(
+                session_id or DEFAULT_SESSION_ID, turns, nlp_output
+            )
+        else:
+            append_conversation_log(session_id or DEFAULT_SESSION_ID, turns)
+            if nlp_output is not None:
+                save_nlp_outputs(nlp_output)
 
-        conversation_history.append({
-            "role": "Physician",
-            "text": physician_reply,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        logger.info("Conversation and NLP outputs saved")
 
-        logger.info("Physician reply generated")
+        response = jsonify(payload)
+        if "version" in payload:
+            response.set_etag(
+                make_etag(payload["version"], nlp_output["rules_version"])
+            )
 
-        # -------------------------------
-        # Run NLP pipeline
-        # -------------------------------
-        nlp_output = run_nlp_pipeline(conversation_history)
-        logger.info("NLP pipeline executed successfully")
+        return response, status
 
-        # -------------------------------
-        # Validate NLP outputs
-        # -------------------------------
-        if not validate_structured_summary(nlp_output["summary"]):
-            logger.error("Structured summary validation failed")
-            return jsonify({"error": "Invalid summary output"}), 500
+    except Exception:
+        logger.exception("Unhandled error during chat processing")
+        return jsonify({"error": "Internal server error"}), 500
 
-        if not validate_sentiment_intent(
-            nlp_output["sentiment"],
-            nlp_output["intent"]
-        ):
-            logger.error("Sentiment/intent validation failed")
-            return jsonify({"error": "Invalid sentiment output"}), 500
 
-        if not validate_soap_note(nlp_output["soap_note"]):
-            logger.error("SOAP note validation failed")
-            return jsonify({"error": "Invalid SOAP output"}), 500
+@app.route("/chat/state", methods=["GET"])
+def chat_state():
+    """
+    Full snapshot of the last output sent to a session.
+    Honors If-None-Match with 304 Not Modified.
+    """
+    session_id = request.args.get("session_id")
+    if not valid_session_id(session_id):
+        return jsonify({"error": "Invalid session_id"}), 400
 
-        logger.info("NLP outputs validated successfully")
+    state = session_store.get(session_id)
+    if state is None:
+        return jsonify({"error": "Unknown session"}), 404
 
-        # -------------------------------
-        # Persist conversation + outputs
-        # -------------------------------
-        save_conversation(conversation_history)
-        save_nlp_outputs(nlp_output)
+    version, output = state
+    etag = make_etag(version, output.get("rules_version"))
 
-        logger.info("Conversation and NLP outputs saved")
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    response = jsonify({"version": version, "snapshot": output})
+    response.set_etag(etag)
+
+    return response
+
+
+@app.route("/search/entities", methods=["GET"])
+def search_entities():
+    """
+    Sessions by indexed entity / keyword terms.
+
+    Query parameters:
+        all: term every session must mention (repeatable; AND)
+        any: term at least one of which must be mentioned (repeatable; OR)
+        since, until: ISO date or timestamp bounds
+        field: symptom | diagnosis | treatment | prognosis | keyword
+        limit: maximum sessions returned (default 100)
+    """
+    if storage is None:
+        return jsonify({"error": "Search requires STORAGE_BACKEND=sqlite"}), 501
+
+    all_of = request.args.getlist("all")
+    any_of = request.args.getlist("any")
+
+    if not all_of and not any_of:
+        return jsonify({"error": "Provide at least one 'all' or 'any' term"}), 400
+
+    field = request.args.get("field")
+    if field is not None and field not in ENTITY_FIELD_BITS:
+        return jsonify({"error": f"Unknown field: {field}"}), 400
+
+    limit = request.args.get("limit", 100, type=int)
+
+    start = time.perf_counter()
+    sessions = storage.search_sessions(
+        all_of=all_of,
+        any_of=any_of,
+        since=request.args.get("since"),
+        until=request.args.get("until"),
+        field=field,
+        limit=max(1, min(limit, 1000))
+    )
 
+    return jsonify({
+        "sessions": sessions,
+        "count": len(sessions),
+        "took_ms": round((time.perf_counter() - start) * 1000, 2)
+    })
+
+
+@app.route("/search/turns", methods=["GET"])
+def search_turns():
+    """
+    Full-text search over stored turns, best matches first.
+
+    Query parameters:
+        q: free text
+        mode: all (default) | any | phrase
+        session_id: restrict to one session
+        limit: maximum turns returned (default 20)
+    """
+    if storage is None:
+        return jsonify({"error": "Search requires STORAGE_BACKEND=sqlite"}), 501
+
+    text = request.args.get("q", "").strip()
+    if not text:
+        return jsonify({"error": "Missing query"}), 400
+
+    mode = request.args.get("mode", "all")
+    if mode not in SEARCH_MODES:
+        return jsonify({"error": f"Unknown mode: {mode}"}), 400
+
+    limit = request.args.get("limit", 20, type=int)
+
+    start = time.perf_counter()
+    results = storage.search_turns(
+        text,
+        mode=mode,
+        session_id=request.args.get("session_id"),
+        limit=max(1, min(limit, 200))
+    )
+
+    return jsonify({
+        "results": results,
+        "count": len(results),
+        "took_ms": round((time.perf_counter() - start) * 1000, 2)
+    })
+
+
+@app.route("/healthz", methods=["GET"])
+def healthz():
+    """
+    Per-worker health check (reports the serving process id)
+    """
+    healthy = worker_health["self_check"] is not False
+
+    return jsonify({
+        "status": "ok" if healthy else "failing",
+        "pid": os.getpid(),
+        "self_check": worker_health["self_check"],
+        "checked_at": worker_health["checked_at"],
+        "conversation_sessions": len(conversations),
+        "conversation_turns": sum(len(c.turns) for c in conversations.values()),
+        "rules_version": get_rules().version
+    }), 200 if healthy else 503
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Admission control counters in Prometheus text format
+    """
+    return Response(
+        render_prometheus(admission_controller.metrics()),
+        mimetype="text/plain; version=0.0.4"
+    )
+
+
+@app.route("/debug/memory", methods=["GET"])
+def debug_memory():
+    """
+    Report RSS, per-stage allocation deltas and in-process store sizes.
+    Requires the X-Debug-Token header to match DEBUG_ENDPOINT_TOKEN.
+    """
+    if not DEBUG_ENDPOINT_TOKEN:
+        return jsonify({"error": "Not found"}), 404
+
+    if not has_debug_token(request.headers):
+        logger.warning("Rejected /debug/memory request with invalid token")
+        return jsonify({"error": "Forbidden"}), 403
+
+    report = memory_profiler.report()
+    report["stores"] = get_store_sizes()
+
+    return jsonify(report)
+
+
+@app.route("/admin/rules/reload", methods=["POST"])
+def admin_reload_rules():
+    """
+    Validate RULES_PATH, then rebuild the rule tables on a background
+    thread and swap them in for this worker (202 with the pending
+    version); requests already running finish on the previous version.
+    Requires the X-Debug-Token header to match DEBUG_ENDPOINT_TOKEN.
+    """
+    if not DEBUG_ENDPOINT_TOKEN:
+        return jsonify({"error": "Not found"}), 404
+
+    if not has_debug_token(request.headers):
+        logger.warning("Rejected /admin/rules/reload request with invalid token")
+        return jsonify({"error": "Forbidden"}), 403
+
+    try:
+        pending, _ = read_rule_tables()
+    except (OSError, ValueError) as exc:
+        logger.error(f"Rule tables reload rejected: {exc}")
         return jsonify({
-            "physician_reply": physician_reply,
-            "summary": nlp_output["summary"],
-            "sentiment": nlp_output["sentiment"],
-            "intent": nlp_output["intent"],
-            "soap_note": nlp_output["soap_note"]
-        })
+            "error": "Invalid rules file",
+            "detail": str(exc),
+            "rules_version": get_rules().version
+        }), 422
 
-    except Exception:
-        logger.exception("Unhandled error during chat processing")
-        return jsonify({"error": "Internal server error"}), 500
+    start_reload()
+
+    return jsonify({
+        "rules_version": get_rules().version,
+        "pending_version": pending,
+        "pid": os.getpid()
+    }), 202
 
 
 # ------------------------------------------------------------------
 # Helper Functions
 # ------------------------------------------------------------------
 
+def run_pipeline_self_check() -> bool:
+    """
+    Run the NLP pipeline on a fixed sample and validate its outputs.
+    Also serves as a warm-up before a worker takes traffic.
+    """
+    try:
+        output = run_nlp_pipeline(SELF_CHECK_CONVERSATION)
+        healthy = validate_nlp_output(output)
+    except Exception:
+        logger.exception("Pipeline self-check raised an error")
+        healthy = False
+
+    worker_health["self_check"] = healthy
+    worker_health["checked_at"] = time.time()
+
+    return healthy
+
+
+def has_debug_token(headers) -> bool:
+    """
+    Check the X-Debug-Token header against DEBUG_ENDPOINT_TOKEN.
+    """
+    if not DEBUG_ENDPOINT_TOKEN:
+        return False
+
+    token = headers.get("X-Debug-Token", "")
+    return hmac.compare_digest(token, DEBUG_ENDPOINT_TOKEN)
+
+
+def profile_requested(headers) -> bool:
+    """
+    Authorized clients may force CPU profiling with X-Profile: 1.
+    """
+    if headers.get("X-Profile") != "1":
+        return False
+
+    return has_debug_token(headers)
+
+
+def get_store_sizes() -> Dict:
+    """
+    Sizes of the long-lived in-process stores that grow over time.
+    """
+    active = conversations.values()
+
+    return {
+        "conversation_sessions": len(active),
+        "conversation_turns": sum(len(c.turns) for c in active),
+        "conversation_chars": sum(
+            len(turn.text) for c in active for turn in c.turns
+        ),
+        "ner_vocab_strings": len(ner.nlp.vocab.strings),
+        "ner_vocab_lexemes": len(ner.nlp.vocab),
+        "keywords_vocab_strings": len(keywords.nlp.vocab.strings),
+        "keywords_vocab_lexemes": len(keywords.nlp.vocab),
+        "log_queue_pending": get_log_queue_size()
+    }
+
+
+def handle_chat_turn(
+    patient_message: str,
+    session_id: str = DEFAULT_SESSION_ID,
+    profile: bool = False,
+    deadline: Optional[float] = None
+) -> Tuple[Dict, int, Optional[Dict], List[Turn]]:
+    """
+    Store the patient turn in the session's history, generate the
+    physician reply, run and validate the NLP pipeline on that
+    history only. Shared by the WSGI and ASGI apps; persistence is
+    left to the caller.
+
+    Turns of one session are processed one at a time. A turn first
+    waits (within its deadline) for the session's earlier turns, then
+    takes a pipeline slot only for run_chat_turn, so requests queued
+    behind a slow turn of one session hold no slots other sessions
+    could use.
+
+    The pipeline call runs under admission control. When the pipeline
+    is overloaded the turn is either shed (429/503, nothing stored)
+    or, in degraded mode, answered with the physician reply only. A
+    turn still waiting for its session at the deadline is shed.
+
+    Returns:
+        (response payload, HTTP status, NLP output or None,
+         turns appended to the history)
+    """
+    conversation = conversations.get(session_id)
+
+    if deadline is None:
+        deadline = admission_controller.deadline
+    expires_at = time.monotonic() + deadline
+
+    if not conversation.lock.acquire(timeout=deadline):
+        exc = admission_controller.shed("deadline")
+        return shed_payload(exc), exc.status, None, []
+
+    try:
+        sync_conversation(session_id, conversation)
+
+        try:
+            with admission_controller.admit(max(0.0, expires_at - time.monotonic())):
+                return run_chat_turn(conversation, patient_message, profile)
+
+        except Overloaded as exc:
+            if ADMISSION_DEGRADED_MODE:
+                return degraded_chat_turn(conversation, patient_message)
+
+            return shed_payload(exc), exc.status, None, []
+
+    finally:
+        conversation.lock.release()
+
+
+def shed_payload(exc: Overloaded) -> Dict:
+    """
+    Error payload for a shed request (429/503 with Retry-After).
+    """
+    logger.warning(f"Shedding chat request ({exc.reason})")
+
+    return {
+        "error": "Server overloaded",
+        "reason": exc.reason,
+        "retry_after": exc.retry_after
+    }
+
+
+def run_chat_turn(
+    conversation: Conversation,
+    patient_message: str,
+    profile: bool = False
+) -> Tuple[Dict, int, Optional[Dict], List[Turn]]:
+    """
+    Full turn: store messages, run and validate the NLP pipeline.
+    """
+
+    # -------------------------------
+    # Store patient message
+    # -------------------------------
+    # Earlier turns were validated when they were appended
+    turns = [append_turn(conversation, "Patient", patient_message)]
+
+    if not validate_conversation(turns):
+        logger.error("Conversation validation failed")
+        return {"error": "Invalid conversation format"}, 400, None, turns
+
+    logger.info("Patient message stored and validated")
+
+    # -------------------------------
+    # Generate physician reply
+    # -------------------------------
+    physician_reply = generate_physician_reply(patient_message)
+
+    turns.append(append_turn(conversation, "Physician", physician_reply))
+
+    logger.info("Physician reply generated")
+
+    # -------------------------------
+    # Run NLP pipeline
+    # -------------------------------
+    try:
+        with cpu_profile("chat", profile):
+            if conversation.window is not None:
+                nlp_output = run_windowed_nlp_pipeline(conversation.window)
+            else:
+                nlp_output = run_nlp_pipeline(conversation.turns)
+    except StageTimeout as exc:
+        logger.error(f"NLP pipeline timed out: {exc}")
+        return {"error": "Pipeline timed out", "stage": exc.stage}, 504, None, turns
+    logger.info("NLP pipeline executed successfully")
+
+    # -------------------------------
+    # Validate NLP outputs
+    # -------------------------------
+    if not validate_structured_summary(nlp_output["summary"]):
+        logger.error("Structured summary validation failed")
+        return {"error": "Invalid summary output"}, 500, None, turns
+
+    if not validate_sentiment_intent(
+        nlp_output["sentiment"],
+        nlp_output["intent"]
+    ):
+        logger.error("Sentiment/intent validation failed")
+        return {"error": "Invalid sentiment output"}, 500, None, turns
+
+    if not validate_soap_note(nlp_output["soap_note"]):
+        logger.error("SOAP note validation failed")
+        return {"error": "Invalid SOAP output"}, 500, None, turns
+
+    logger.info("NLP outputs validated successfully")
+
+    payload = {
+        "physician_reply": physician_reply,
+        "summary": nlp_output["summary"],
+        "sentiment": nlp_output["sentiment"],
+        "intent": nlp_output["intent"],
+        "soap_note": nlp_output["soap_note"],
+        "rules_version": nlp_output["rules_version"]
+    }
+
+    return payload, 200, nlp_output, turns
+
+
+def degraded_chat_turn(
+    conversation: Conversation,
+    patient_message: str
+) -> Tuple[Dict, int, Optional[Dict], List[Turn]]:
+    """
+    Overload fallback: store the turn and reply, skip the NLP stages.
+    """
+    admission_controller.record_degraded()
+    logger.warning("Pipeline overloaded; serving degraded reply")
+
+    physician_reply = generate_physician_reply(patient_message)
+
+    turns = [
+        append_turn(conversation, "Patient", patient_message),
+        append_turn(conversation, "Physician", physician_reply)
+    ]
+
+    return {"physician_reply": physician_reply, "degraded": True}, 200, None, turns
+
+
+def session_payload(
+    payload: Dict,
+    nlp_output: Dict,
+    session_id: str,
+    base_version
+) -> Dict:
+    """
+    Replace the full NLP fields with a patch against the version the
+    client holds (or a snapshot if it holds another version).
+    nlp_output must come from this session's own history.
+    """
+    if not isinstance(base_version, int) or isinstance(base_version, bool):
+        base_version = None
+
+    update = session_store.update(session_id, nlp_output, base_version)
+
+    return {"physician_reply": payload["physician_reply"], **update}
+
+
+def request_deadline(headers) -> float:
+    """
+    Per-request deadline: X-Request-Deadline (seconds), capped at
+    the configured default.
+    """
+    try:
+        requested = float(headers.get("X-Request-Deadline", ""))
+    except ValueError:
+        return ADMISSION_DEADLINE_SECONDS
+
+    return max(0.0, min(requested, ADMISSION_DEADLINE_SECONDS))
+
+
+def error_response(payload: Dict, status: int):
+    """
+    JSON error response; adds Retry-After for shed requests.
+    """
+    response = jsonify(payload)
+    response.status_code = status
+
+    if "retry_after" in payload:
+        response.headers["Retry-After"] = str(payload["retry_after"])
+
+    return response
+
+
+def sync_conversation(session_id: str, conversation: Conversation) -> None:
+    """
+    Append turns of this session that are stored but not yet held
+    in memory: turns handled by other workers, or the whole history
+    after a restart or LRU eviction. No-op for flat-file storage.
+    """
+    if storage is None:
+        return
+
+    # One statement, so one consistent read keyed on the turn index
+    # this worker's copy ends at; a separate count query could see a
+    # different state than the rows fetched after it
+    for row in storage.get_turns(session_id, start=conversation.turn_count):
+        conversation.append(Turn.from_dict(row))
+
+
+def append_turn(conversation: Conversation, role: str, text: str) -> Turn:
+    """
+    Append a turn to a session's history and, if enabled, its
+    analysis window
+    """
+    turn = Turn.now(role, text)
+
+    conversation.append(turn)
+
+    return turn
+
+
 def generate_physician_reply(patient_text: str) -> str:
     """
     Rule-based physician response.
@@ -174,34 +707,62 @@ def generate_physician_reply(patient_text: str) -> str:
         return "Please continue, I’m listening."
 
 
-def save_conversation(conversation: List[Dict]) -> None:
+def serialize_turns(session_id: str, turns: List[Turn]) -> str:
     """
-    Save conversation history to JSON file
+    Render turns as a JSON array in the conversation log format
     """
-    with LOG_FILE.open("w", encoding="utf-8") as f:
-        json.dump(conversation, f, indent=2, ensure_ascii=False)
+    return dumps(
+        [{"session_id": session_id, **turn.to_dict()} for turn in turns],
+        pretty=not JSON_FILES_COMPACT
+    )
 
 
-def save_nlp_outputs(nlp_output: Dict) -> None:
+def serialize_nlp_outputs(nlp_output: Dict) -> Dict[Path, str]:
     """
-    Save NLP outputs to individual JSON files
+    Render NLP outputs as {file path: JSON text}, one file per output
     """
-    with SUMMARY_FILE.open("w", encoding="utf-8") as f:
-        json.dump(nlp_output["summary"], f, indent=2, ensure_ascii=False)
+    pretty = not JSON_FILES_COMPACT
 
-    with SENTIMENT_FILE.open("w", encoding="utf-8") as f:
-        json.dump(
+    return {
+        SUMMARY_FILE: dumps(nlp_output["summary"], pretty=pretty),
+        SENTIMENT_FILE: dumps(
             {
                 "Sentiment": nlp_output["sentiment"],
                 "Intent": nlp_output["intent"]
             },
-            f,
-            indent=2,
-            ensure_ascii=False
-        )
+            pretty=pretty
+        ),
+        SOAP_FILE: dumps(nlp_output["soap_note"], pretty=pretty)
+    }
+
+
+def write_files(files: Dict[Path, str]) -> None:
+    """
+    Write rendered JSON files to disk
+    """
+    for path, text in files.items():
+        with path.open("w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def append_conversation_log(session_id: str, turns: List[Turn]) -> None:
+    """
+    Append new turns, tagged with their session, to the conversation
+    log; earlier turns are not re-serialized. The log is rotated at
+    CONVERSATION_LOG_MAX_BYTES.
+    """
+    append_json_array(
+        LOG_FILE,
+        serialize_turns(session_id, turns),
+        max_bytes=CONVERSATION_LOG_MAX_BYTES
+    )
 
-    with SOAP_FILE.open("w", encoding="utf-8") as f:
-        json.dump(nlp_output["soap_note"], f, indent=2, ensure_ascii=False)
+
+def save_nlp_outputs(nlp_output: Dict) -> None:
+    """
+    Save NLP outputs to individual JSON files
+    """
+    write_files(serialize_nlp_outputs(nlp_output))
 
 
 # ------------------------------------------------------------------
@@ -0,0 +1,289 @@
+"""
+ASGI entry point for Physician Notetaker
+
+Async variant of the chat endpoints built on Quart (Flask's
+async twin). Connections are handled on the event loop; chat turns
+run on a bounded thread pool under the same admission control as
+app.py, and persistence uses async file I/O. Idle or slow clients
+therefore cost a coroutine, not a thread.
+
+When every pipeline slot and queue place is taken, a request is
+shed (429) on the event loop before it reaches the thread pool, and
+time spent waiting for a worker thread counts against its deadline.
+
+Usage:
+    hypercorn asgi:app --bind 127.0.0.1:5000
+
+Shares conversation state and pipeline logic with app.py.
+
+Python version: 3.13.5
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiofiles
+from quart import Quart, Response, render_template, request, jsonify
+from quart.wrappers.response import DataBody
+
+from config import (
+    APP_NAME,
+    DEFAULT_SESSION_ID,
+    ADMISSION_DEGRADED_MODE,
+    ASYNC_PIPELINE_WORKERS
+)
+
+import app as wsgi_app
+from nlp.rules import get_rules
+from nlp.turns import Turn
+from utils.admission import Overloaded
+from utils.logger import get_logger
+from utils.profiling import should_profile
+from utils.serialization import (
+    COMPRESSIBLE_MIMETYPES,
+    FastJSONProvider,
+    gzip_body,
+    mark_gzip_encoded,
+    should_compress
+)
+from utils.sessions import make_etag, session_store, valid_session_id
+
+
+# -------------------------------
+# App Initialization
+# -------------------------------
+app = Quart(__name__)
+app.config["APP_NAME"] = APP_NAME
+app.json = FastJSONProvider(app)
+
+logger = get_logger(__name__)
+
+pipeline_executor = ThreadPoolExecutor(
+    max_workers=ASYNC_PIPELINE_WORKERS,
+    thread_name_prefix="nlp-pipeline"
+)
+
+
+# ------------------------------------------------------------------
+# Routes
+# ------------------------------------------------------------------
+
+@app.after_request
+async def compress(response):
+    """
+    gzip large in-memory responses for clients that accept it
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    # File bodies (static assets) are streamed; leave them alone
+    if not isinstance(response.response, DataBody):
+        return response
+
+    data = await response.get_data()
+
+    if should_compress(
+        response.status_code,
+        response.mimetype,
+        response.headers.get("Content-Encoding"),
+        len(data),
+        request.accept_encodings["gzip"]
+    ):
+        response.set_data(gzip_body(data))
+        mark_gzip_encoded(response)
+
+    return response
+
+
+@app.route("/")
+async def index():
+    """
+    Render main UI (Physician Notetaker dashboard)
+    """
+    return await render_template("index.html")
+
+
+@app.route("/chat", methods=["POST"])
+async def chat():
+    """
+    Handle one turn of patient conversation; the NLP pipeline
+    runs on the bounded executor
+    """
+    try:
+        data = await request.get_json(silent=True) or {}
+        patient_message = data.get("message", "").strip()
+
+        if not patient_message:
+            logger.warning("Empty patient message received")
+            return jsonify({"error": "Empty message"}), 400
+
+        session_id = data.get("session_id")
+        if session_id is not None and not valid_session_id(session_id):
+            return jsonify({"error": "Invalid session_id"}), 400
+
+        profile = should_profile(wsgi_app.profile_requested(request.headers))
+        deadline = wsgi_app.request_deadline(request.headers)
+        loop = asyncio.get_running_loop()
+
+        if not ADMISSION_DEGRADED_MODE:
+            try:
+                wsgi_app.admission_controller.check_capacity()
+            except Overloaded as exc:
+                return error_response(wsgi_app.shed_payload(exc), exc.status)
+
+        payload, status, nlp_output, turns, files = await loop.run_in_executor(
+            pipeline_executor,
+            partial(
+                run_chat_turn,
+                patient_message,
+                session_id or DEFAULT_SESSION_ID,
+                profile,
+                deadline,
+                time.monotonic()
+            )
+        )
+
+        if status != 200:
+            return error_response(payload, status)
+
+        if session_id is not None and nlp_output is not None:
+            payload = wsgi_app.session_payload(
+                payload, nlp_output, session_id, data.get("base_version")
+            )
+
+        if wsgi_app.storage is not None:
+            await loop.run_in_executor(
+                pipeline_executor,
+                partial(
+                    wsgi_app.storage.save_chat_turn,
+                    session_id or DEFAULT_SESSION_ID,
+                    turns,
+                    nlp_output
+                )
+            )
+        else:
+            await loop.run_in_executor(
+                pipeline_executor,
+                partial(
+                    wsgi_app.append_conversation_log,
+                    session_id or DEFAULT_SESSION_ID,
+                    turns
+                )
+            )
+            await write_files_async(files)
+        logger.info("Conversation and NLP outputs saved")
+
+        response = jsonify(payload)
+        if "version" in payload:
+            response.set_etag(
+                make_etag(payload["version"], nlp_output["rules_version"])
+            )
+
+        return response, status
+
+    except Exception:
+        logger.exception("Unhandled error during async chat processing")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/chat/state", methods=["GET"])
+async def chat_state():
+    """
+    Full snapshot of the last output sent to a session.
+    Honors If-None-Match with 304 Not Modified.
+    """
+    session_id = request.args.get("session_id")
+    if not valid_session_id(session_id):
+        return jsonify({"error": "Invalid session_id"}), 400
+
+    state = session_store.get(session_id)
+    if state is None:
+        return jsonify({"error": "Unknown session"}), 404
+
+    version, output = state
+    etag = make_etag(version, output.get("rules_version"))
+
+    if request.if_none_match.contains_weak(etag):
+        response = Response("", status=304)
+        response.set_etag(etag)
+        return response
+
+    response = jsonify({"version": version, "snapshot": output})
+    response.set_etag(etag)
+
+    return response
+
+
+@app.route("/healthz", methods=["GET"])
+async def healthz():
+    """
+    Health check for the async server
+    """
+    healthy = wsgi_app.worker_health["self_check"] is not False
+
+    return jsonify({
+        "status": "ok" if healthy else "failing",
+        "pid": os.getpid(),
+        "self_check": wsgi_app.worker_health["self_check"],
+        "inflight_limit": wsgi_app.admission_controller.max_concurrent,
+        "rules_version": get_rules().version
+    }), 200 if healthy else 503
+
+
+# ------------------------------------------------------------------
+# Helper Functions
+# ------------------------------------------------------------------
+
+def run_chat_turn(
+    patient_message: str,
+    session_id: str,
+    profile: bool,
+    deadline: float,
+    submitted_at: float
+) -> Tuple[Dict, int, Optional[Dict], List[Turn], Dict[Path, str]]:
+    """
+    Run one turn on a pipeline worker thread and, for flat-file
+    storage, render the output files there too, so no JSON encoding
+    happens on the event loop.
+    """
+    # Time spent waiting for this thread counts against the deadline
+    deadline = max(0.0, deadline - (time.monotonic() - submitted_at))
+
+    payload, status, nlp_output, turns = wsgi_app.handle_chat_turn(
+        patient_message, session_id, profile, deadline
+    )
+
+    files = {}
+    if status == 200 and nlp_output is not None and wsgi_app.storage is None:
+        files = wsgi_app.serialize_nlp_outputs(nlp_output)
+
+    return payload, status, nlp_output, turns, files
+
+
+def error_response(payload: Dict, status: int):
+    """
+    JSON error response; adds Retry-After for shed requests.
+    """
+    response = jsonify(payload)
+    response.status_code = status
+
+    if "retry_after" in payload:
+        response.headers["Retry-After"] = str(payload["retry_after"])
+
+    return response
+
+
+async def write_files_async(files: Dict[Path, str]) -> None:
+    """
+    Write rendered JSON files without blocking the event loop
+    """
+    for path, text in files.items():
+        async with aiofiles.open(path, "w", encoding="utf-8") as f:
+            await f.write(text)
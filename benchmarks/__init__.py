@@ -0,0 +1,6 @@
+"""
+Benchmark and load-testing tools for Physician Notetaker
+
+Run modules from the project root, e.g.:
+    python -m benchmarks.load_test --help
+"""
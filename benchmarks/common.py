@@ -0,0 +1,155 @@
+"""
+Shared helpers for benchmark tools
+
+Provides:
+- Conversation corpus loading (recorded JSON logs, raw transcripts)
+- Synthetic multi-turn conversations
+- Latency percentiles and table formatting
+
+Python version: 3.13.5
+"""
+
+import json
+import math
+import random
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from config import DATA_DIR, TRANSCRIPTS_DIR
+
+
+# -------------------------------------------------------------------
+# Corpus Loading
+# -------------------------------------------------------------------
+
+DEFAULT_CORPUS = [
+    DATA_DIR / "conversation_log.json",
+    TRANSCRIPTS_DIR
+]
+
+SYNTHETIC_PATIENT_TURNS = [
+    "Good morning, doctor. I'm doing better, but I still have some discomfort.",
+    "I was in a car accident last month and hurt my neck.",
+    "I had pain in my neck and back almost right away.",
+    "The first weeks were difficult and I had trouble sleeping.",
+    "I took painkillers and went to physiotherapy sessions.",
+    "The stiffness is improving but I still get occasional backaches.",
+    "I'm a bit worried this will affect me in the future.",
+    "It's a relief to hear that, thank you.",
+    "Sometimes the pain comes back when I sit for a long time.",
+    "I haven't noticed any other problems since the accident."
+]
+
+
+def load_patient_turns(path: Path) -> List[str]:
+    """
+    Load patient utterances from a recorded conversation.
+
+    Supports:
+    - JSON lists in the conversation_log.json format
+    - Raw transcripts with Physician:/Patient: prefixes
+    """
+
+    path = Path(path)
+
+    if path.suffix == ".json":
+        with path.open("r", encoding="utf-8") as f:
+            entries = json.load(f)
+        return [
+            entry["text"] for entry in entries
+            if entry.get("role") == "Patient" and entry.get("text")
+        ]
+
+    turns = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.lower().startswith("patient:"):
+            text = line[len("patient:"):].strip()
+            if text:
+                turns.append(text)
+
+    return turns
+
+
+def load_corpus(paths: Sequence[Path] = DEFAULT_CORPUS) -> List[List[str]]:
+    """
+    Load every conversation found in the given files or directories.
+    Each conversation is a list of patient utterances.
+    """
+
+    conversations = []
+
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files = sorted(path.glob("*.txt")) + sorted(path.glob("*.json"))
+        else:
+            files = [path]
+
+        for file in files:
+            if not file.exists():
+                continue
+            turns = load_patient_turns(file)
+            if turns:
+                conversations.append(turns)
+
+    return conversations
+
+
+def synthetic_conversation(turns: int, seed: int = 0) -> List[str]:
+    """
+    Build a synthetic conversation of the requested length.
+    """
+
+    rng = random.Random(seed)
+    return [rng.choice(SYNTHETIC_PATIENT_TURNS) for _ in range(turns)]
+
+
+# -------------------------------------------------------------------
+# Statistics & Formatting
+# -------------------------------------------------------------------
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile; returns 0.0 for an empty sequence.
+    """
+
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize a latency sample in milliseconds.
+    """
+
+    return {
+        "count": len(latencies_ms),
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 2)
+        if latencies_ms else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+        "max_ms": round(max(latencies_ms), 2) if latencies_ms else 0.0
+    }
+
+
+def format_table(headers: Sequence[str], rows: Sequence[Sequence]) -> str:
+    """
+    Render rows as a plain-text table.
+    """
+
+    cells = [[str(h) for h in headers]] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+
+    lines = []
+    for index, row in enumerate(cells):
+        lines.append("  ".join(c.rjust(w) for c, w in zip(row, widths)))
+        if index == 0:
+            lines.append("  ".join("-" * w for w in widths))
+
+    return "\n".join(lines)
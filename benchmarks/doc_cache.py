@@ -0,0 +1,108 @@
+"""
+Parsed Doc cache benchmark
+
+Runs the full pipeline (tagger + parser + rules) over a synthetic
+archive of conversations, then builds the DocBin cache once and
+re-analyzes the same archive from it (matchers + rules only), and
+reports per-transcript cost of each path and the cache size on disk.
+
+Usage:
+    python -m benchmarks.doc_cache --conversations 2000 --turns 20
+
+Python version: 3.13.5
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.common import SYNTHETIC_PATIENT_TURNS, format_table
+from nlp.doc_cache import DocCache, reanalyze
+from nlp.pipeline import run_nlp_pipeline
+
+
+PHYSICIAN_TURNS = [
+    "Can you tell me more about the location and severity of the pain?",
+    "Did you take any painkillers or attend physiotherapy?",
+    "Your range of motion looks good and there is no tenderness.",
+    "I expect a full recovery within six months of the accident."
+]
+
+
+def synthetic_archive(
+    conversations: int,
+    turns: int,
+    seed: int = 0
+) -> List[Tuple[str, List[Dict]]]:
+    rng = random.Random(seed)
+
+    return [
+        (
+            f"conversation-{index}",
+            [
+                {
+                    "role": "Patient" if i % 2 == 0 else "Physician",
+                    "text": rng.choice(
+                        SYNTHETIC_PATIENT_TURNS if i % 2 == 0 else PHYSICIAN_TURNS
+                    )
+                }
+                for i in range(turns)
+            ]
+        )
+        for index in range(conversations)
+    ]
+
+
+def benchmark(args) -> List[List]:
+    archive = synthetic_archive(args.conversations, args.turns)
+    rows = []
+
+    def add_row(name: str, elapsed: float):
+        rows.append([
+            name, round(elapsed, 2),
+            round(elapsed / len(archive) * 1000, 2),
+            round(len(archive) / elapsed)
+        ])
+
+    start = time.perf_counter()
+    for _, turns in archive:
+        run_nlp_pipeline(turns)
+    add_row("full pipeline (parse + rules)", time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory(prefix="doc_cache_") as tmp:
+        cache = DocCache(Path(tmp))
+
+        start = time.perf_counter()
+        cache.build(archive, n_process=args.processes)
+        add_row("build cache (parse once)", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in reanalyze(DocCache(Path(tmp))):
+            pass
+        add_row("reanalyze from cache", time.perf_counter() - start)
+
+        size = sum(p.stat().st_size for p in cache.directory.iterdir())
+        print(f"Cache: {len(cache.shards)} shards, {size / 1024 / 1024:.1f} MB")
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--conversations", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args)
+    print(format_table(["path", "seconds", "ms_per_transcript", "transcripts_per_s"], rows))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Entity index query benchmark
+
+Fills a fresh SQLite database with synthetic session summaries
+(random symptoms / diagnoses / treatments over a year of
+timestamps) through index_outputs, then measures query latency for
+AND, OR, mixed and date-range queries.
+
+Usage:
+    python -m benchmarks.entity_index --sessions 1000000 --queries 200
+
+Python version: 3.13.5
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from benchmarks.common import format_table, latency_summary
+from utils.storage import SQLiteStorage
+
+
+SYMPTOMS = [
+    "neck pain", "back pain", "headache", "stiffness", "discomfort",
+    "trouble sleeping", "dizziness", "nausea", "anxiety", "backache"
+]
+DIAGNOSES = [
+    "whiplash injury", "lower back strain", "concussion", "sprain",
+    "tension headache", "Not mentioned"
+]
+TREATMENTS = [
+    "physiotherapy", "painkillers", "analgesics", "rest", "ice",
+    "x-ray", "massage"
+]
+
+QUERIES = {
+    "and_2": {"all_of": ["whiplash injury", "physiotherapy"]},
+    "or_3": {"any_of": ["concussion", "sprain", "dizziness"]},
+    "and_or": {"all_of": ["neck pain"], "any_of": ["painkillers", "rest"]},
+    "and_month": {
+        "all_of": ["whiplash injury", "physiotherapy"],
+        "since": "2026-03-01",
+        "until": "2026-03-31"
+    }
+}
+
+
+def synthetic_summaries(count: int, seed: int = 0) -> Iterator[Tuple[str, Dict, str]]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+
+    for index in range(count):
+        timestamp = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        yield (
+            f"session-{index}",
+            {
+                "Symptoms": rng.sample(SYMPTOMS, rng.randint(1, 3)),
+                "Diagnosis": rng.choice(DIAGNOSES),
+                "Treatment": rng.sample(TREATMENTS, rng.randint(1, 2))
+            },
+            timestamp.isoformat()
+        )
+
+
+def benchmark(args) -> List[List]:
+    rows = []
+
+    with tempfile.TemporaryDirectory(prefix="entity_index_") as tmp:
+        storage = SQLiteStorage(Path(tmp) / "bench.db")
+
+        start = time.perf_counter()
+        postings = storage.index_outputs(synthetic_summaries(args.sessions))
+        elapsed = time.perf_counter() - start
+        print(
+            f"Indexed {args.sessions} sessions ({postings} postings) "
+            f"in {elapsed:.1f}s"
+        )
+
+        for name, query in QUERIES.items():
+            storage.search_sessions(limit=args.limit, **query)  # warm-up
+
+            latencies = []
+            for _ in range(args.queries):
+                t0 = time.perf_counter()
+                results = storage.search_sessions(limit=args.limit, **query)
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+            summary = latency_summary(latencies)
+            rows.append([
+                name, len(results), summary["p50_ms"], summary["p99_ms"]
+            ])
+
+        storage.close()
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args)
+    print(format_table(["query", "results", "p50_ms", "p99_ms"], rows))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Keyword extractor benchmark
+
+Compares the noun-chunk extractor (dependency parser) with the
+parser-free POS-pattern extractor on the sample transcripts:
+- Mean time per transcript
+- Keyword overlap (Jaccard) of the top-k results and of the full
+  candidate sets
+
+Usage:
+    python -m benchmarks.keyword_extractors --repeat 20
+
+Python version: 3.13.5
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+from benchmarks.common import format_table
+from config import DATA_DIR, MAX_KEYWORDS, TRANSCRIPTS_DIR
+from nlp.keywords import (
+    extract_keywords_noun_chunks,
+    extract_keywords_pos_patterns
+)
+from nlp.preprocessing import build_transcript_string
+
+
+EXTRACTORS = {
+    "noun_chunks": extract_keywords_noun_chunks,
+    "pos_patterns": extract_keywords_pos_patterns
+}
+
+# Large enough to return every candidate
+ALL_CANDIDATES = 10_000
+
+
+def load_transcripts(paths: List[Path]) -> Dict[str, str]:
+    """
+    Load raw .txt transcripts and .json conversation logs as text.
+    """
+
+    transcripts = {}
+
+    for path in paths:
+        files = sorted(path.glob("*")) if path.is_dir() else [path]
+        for file in files:
+            if file.suffix == ".txt":
+                transcripts[file.name] = file.read_text(encoding="utf-8")
+            elif file.suffix == ".json":
+                with file.open("r", encoding="utf-8") as f:
+                    transcripts[file.name] = build_transcript_string(json.load(f))
+
+    return transcripts
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def benchmark(transcripts: Dict[str, str], repeat: int) -> List[List]:
+    rows = []
+
+    for name, text in transcripts.items():
+        timings = {}
+        for extractor, func in EXTRACTORS.items():
+            func(text)  # warm-up
+            start = time.perf_counter()
+            for _ in range(repeat):
+                func(text)
+            timings[extractor] = (time.perf_counter() - start) / repeat * 1000
+
+        top_k = {e: set(f(text, MAX_KEYWORDS)) for e, f in EXTRACTORS.items()}
+        every = {e: set(f(text, ALL_CANDIDATES)) for e, f in EXTRACTORS.items()}
+
+        rows.append([
+            name,
+            len(text),
+            round(timings["noun_chunks"], 2),
+            round(timings["pos_patterns"], 2),
+            round(timings["noun_chunks"] / timings["pos_patterns"], 2),
+            round(jaccard(top_k["noun_chunks"], top_k["pos_patterns"]), 2),
+            round(jaccard(every["noun_chunks"], every["pos_patterns"]), 2)
+        ])
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="*", type=Path,
+                        default=[TRANSCRIPTS_DIR, DATA_DIR / "conversation_log.json"])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    transcripts = load_transcripts(args.paths)
+    if not transcripts:
+        print("No transcripts found", file=sys.stderr)
+        return 1
+
+    print(format_table(
+        [
+            "transcript", "chars", "noun_chunks_ms", "pos_patterns_ms",
+            "speedup", f"top{MAX_KEYWORDS}_jaccard", "all_jaccard"
+        ],
+        benchmark(transcripts, args.repeat)
+    ))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
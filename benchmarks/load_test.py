@@ -0,0 +1,298 @@
+"""
+Concurrent load-test harness for the /chat endpoint
+
+Simulates many clinician sessions against a locally running
+instance. Each session replays a multi-turn conversation from the
+recorded or synthetic corpus; sessions arrive as a Poisson process
+at a configurable rate.
+
+Reports:
+- Throughput (requests/s)
+- p50 / p95 / p99 latency
+- Error rate
+- Latency vs. turn number
+
+Targets must be on localhost. With --in-process, requests go
+through Flask's test client instead of the network.
+
+Usage:
+    python app.py &
+    python -m benchmarks.load_test --sessions 50 --arrival-rate 5
+
+Python version: 3.13.5
+"""
+
+import argparse
+import ipaddress
+import json
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+
+from benchmarks.common import (
+    format_table,
+    latency_summary,
+    load_corpus,
+    synthetic_conversation
+)
+
+
+# -------------------------------------------------------------------
+# Clients
+# -------------------------------------------------------------------
+
+def ensure_localhost(url: str) -> None:
+    """
+    Refuse to generate load against anything but the local machine.
+    """
+
+    host = urlparse(url).hostname or ""
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror as exc:
+        raise ValueError(f"Cannot resolve load-test target {host!r}") from exc
+
+    if not all(ipaddress.ip_address(a).is_loopback for a in addresses):
+        raise ValueError(
+            f"Load-test target {host!r} is not a loopback address"
+        )
+
+
+def http_client(base_url: str, timeout: float) -> Callable[[Dict], int]:
+    """
+    Return a function that POSTs a JSON payload to /chat
+    and returns the HTTP status code.
+    """
+
+    ensure_localhost(base_url)
+    url = base_url.rstrip("/") + "/chat"
+
+    def send(payload: Dict) -> int:
+        body = json.dumps(payload).encode("utf-8")
+        req = urllib.request.Request(
+            url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as exc:
+            return exc.code
+
+    return send
+
+
+def in_process_client() -> Callable[[Dict], int]:
+    """
+    Stand-in client that calls the Flask app directly.
+    """
+
+    from app import app
+
+    client = app.test_client()
+    lock = threading.Lock()
+
+    def send(payload: Dict) -> int:
+        # Flask's test client is not safe for concurrent use
+        with lock:
+            return client.post("/chat", json=payload).status_code
+
+    return send
+
+
+# -------------------------------------------------------------------
+# Load Generation
+# -------------------------------------------------------------------
+
+def run_session(
+    send: Callable[[Dict], int],
+    session_id: str,
+    turns: List[str],
+    think_time: float
+) -> List[Tuple[int, float, bool]]:
+    """
+    Replay one conversation and return (turn, latency_ms, ok) tuples.
+    """
+
+    results = []
+
+    for turn_number, message in enumerate(turns, start=1):
+        start = time.perf_counter()
+        try:
+            status = send({"message": message, "session_id": session_id})
+            ok = 200 <= status < 300
+        except (OSError, urllib.error.URLError):
+            ok = False
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        results.append((turn_number, latency_ms, ok))
+
+        if think_time > 0:
+            time.sleep(think_time)
+
+    return results
+
+
+def run_load_test(
+    send: Callable[[Dict], int],
+    conversations: List[List[str]],
+    sessions: int,
+    arrival_rate: float,
+    concurrency: int,
+    think_time: float,
+    seed: int = 0
+) -> Dict:
+    """
+    Start sessions at the given arrival rate and collect results.
+    """
+
+    rng = random.Random(seed)
+    futures = []
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index in range(sessions):
+            turns = conversations[index % len(conversations)]
+            futures.append(executor.submit(
+                run_session, send, f"load-{seed}-{index}", turns, think_time
+            ))
+
+            if arrival_rate > 0:
+                time.sleep(rng.expovariate(arrival_rate))
+
+        results = [r for future in futures for r in future.result()]
+
+    wall_time = time.perf_counter() - start
+
+    return build_report(results, wall_time)
+
+
+def build_report(results: List[Tuple[int, float, bool]], wall_time: float) -> Dict:
+    """
+    Aggregate raw per-request results into a report.
+    """
+
+    latencies = [latency for _, latency, _ in results]
+    errors = sum(1 for _, _, ok in results if not ok)
+
+    by_turn = defaultdict(list)
+    for turn, latency, _ in results:
+        by_turn[turn].append(latency)
+
+    return {
+        "requests": len(results),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(results) / wall_time, 2) if wall_time else 0.0,
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+        "latency": latency_summary(latencies),
+        "latency_by_turn": {
+            turn: latency_summary(values)
+            for turn, values in sorted(by_turn.items())
+        }
+    }
+
+
+def print_report(report: Dict) -> None:
+    latency = report["latency"]
+
+    print(f"Requests:    {report['requests']}")
+    print(f"Wall time:   {report['wall_time_s']} s")
+    print(f"Throughput:  {report['throughput_rps']} req/s")
+    print(f"Error rate:  {report['error_rate']:.2%}")
+    print(
+        f"Latency:     p50={latency['p50_ms']} ms  "
+        f"p95={latency['p95_ms']} ms  p99={latency['p99_ms']} ms"
+    )
+    print()
+    print(format_table(
+        ["turn", "n", "p50_ms", "p95_ms", "p99_ms"],
+        [
+            [turn, s["count"], s["p50_ms"], s["p95_ms"], s["p99_ms"]]
+            for turn, s in report["latency_by_turn"].items()
+        ]
+    ))
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000",
+                        help="Base URL of a local instance")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Use Flask's test client instead of HTTP")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--arrival-rate", type=float, default=2.0,
+                        help="New sessions per second (0 = all at once)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Maximum simultaneously active sessions")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Seconds between turns within a session")
+    parser.add_argument("--synthetic-turns", type=int, default=0,
+                        help="Use synthetic conversations of this length")
+    parser.add_argument("--corpus", nargs="*",
+                        help="Conversation files or directories to replay")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json-out", help="Write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.synthetic_turns:
+        conversations = [
+            synthetic_conversation(args.synthetic_turns, seed=args.seed + i)
+            for i in range(max(1, args.sessions))
+        ]
+    elif args.corpus:
+        conversations = load_corpus(args.corpus)
+    else:
+        conversations = load_corpus()
+
+    if not conversations:
+        print("No conversations found in corpus", file=sys.stderr)
+        return 1
+
+    if args.in_process:
+        send = in_process_client()
+    else:
+        send = http_client(args.url, args.timeout)
+
+    report = run_load_test(
+        send,
+        conversations,
+        sessions=args.sessions,
+        arrival_rate=args.arrival_rate,
+        concurrency=args.concurrency,
+        think_time=args.think_time,
+        seed=args.seed
+    )
+
+    print_report(report)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
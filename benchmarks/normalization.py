@@ -0,0 +1,153 @@
+"""
+Text normalization throughput benchmark
+
+Builds a synthetic transcript corpus (speaker-prefixed, ambiguous and
+non-ASCII lines) and measures lines per second for:
+- The previous per-line functions (two uncompiled re.sub calls per
+  line; lowercase + str.replace per speaker prefix), kept here as the
+  baseline
+- normalize_text / parse_speaker_line per line
+- normalize_texts / split_speaker_lines on the whole batch, inline
+  and on a thread pool
+
+Usage:
+    python -m benchmarks.normalization --lines 1000000 --workers 4
+
+Python version: 3.13.5
+"""
+
+import argparse
+import random
+import re
+import sys
+import sysconfig
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.common import SYNTHETIC_PATIENT_TURNS, format_table
+from nlp.preprocessing import (
+    normalize_text,
+    normalize_texts,
+    parse_speaker_line,
+    split_speaker_lines
+)
+
+
+PREFIXES = ["Physician: ", "Patient: ", "PATIENT: ", ""]
+
+EXTRA_LINES = [
+    "Did you take any painkillers (ibuprofen, paracetamol)?",
+    "Pain   was 7/10 -- maybe 8/10 at night!!",
+    "Café visit, then the pain in my neck returned…"
+]
+
+
+def synthetic_lines(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    texts = SYNTHETIC_PATIENT_TURNS + EXTRA_LINES
+
+    return [
+        rng.choice(PREFIXES) + rng.choice(texts)
+        for _ in range(count)
+    ]
+
+
+# -------------------------------------------------------------------
+# Baseline (previous implementation)
+# -------------------------------------------------------------------
+
+def legacy_normalize_text(text: str) -> str:
+    if not text:
+        return ""
+
+    text = text.lower()
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"[^\w\s.,]", "", text)
+
+    return text.strip()
+
+
+def legacy_split_lines(lines: List[str]) -> List[Dict]:
+    conversation = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.lower().startswith("physician:"):
+            conversation.append({
+                "role": "Physician",
+                "text": legacy_normalize_text(line.replace("Physician:", "", 1))
+            })
+        elif line.lower().startswith("patient:"):
+            conversation.append({
+                "role": "Patient",
+                "text": legacy_normalize_text(line.replace("Patient:", "", 1))
+            })
+        else:
+            conversation.append({
+                "role": "Patient",
+                "text": legacy_normalize_text(line)
+            })
+
+    return conversation
+
+
+# -------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------
+
+def cases(workers: int) -> Dict[str, Callable[[List[str]], List]]:
+    return {
+        "legacy normalize_text": lambda lines: [legacy_normalize_text(l) for l in lines],
+        "normalize_text": lambda lines: [normalize_text(l) for l in lines],
+        "normalize_texts": lambda lines: normalize_texts(lines, workers=1),
+        f"normalize_texts x{workers}": lambda lines: normalize_texts(lines, workers=workers),
+        "legacy split lines": legacy_split_lines,
+        "parse_speaker_line": lambda lines: [parse_speaker_line(l) for l in lines],
+        "split_speaker_lines": lambda lines: split_speaker_lines(lines, workers=1),
+        f"split_speaker_lines x{workers}": lambda lines: split_speaker_lines(
+            lines, workers=workers
+        )
+    }
+
+
+def benchmark(args) -> List[List]:
+    lines = synthetic_lines(args.lines)
+    rows = []
+    baseline = {}
+
+    for name, func in cases(args.workers).items():
+        start = time.perf_counter()
+        func(lines)
+        elapsed = time.perf_counter() - start
+
+        kind = "split" if "split" in name or "speaker" in name else "normalize"
+        baseline.setdefault(kind, elapsed)
+
+        rows.append([
+            name, round(elapsed, 2), round(len(lines) / elapsed),
+            f"{baseline[kind] / elapsed:.1f}x"
+        ])
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    gil = "disabled" if sysconfig.get_config_var("Py_GIL_DISABLED") else "enabled"
+    print(f"{args.lines} lines, GIL {gil}")
+
+    rows = benchmark(args)
+    print(format_table(["function", "seconds", "lines_per_s", "speedup"], rows))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
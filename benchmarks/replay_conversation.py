@@ -0,0 +1,220 @@
+"""
+Conversation replay benchmark for per-turn latency growth
+
+Feeds a recorded conversation turn by turn through the same code
+path as /chat (history append, validation, run_nlp_pipeline,
+persistence) in-process, and records latency and memory at every
+turn. Outputs are written to a temporary directory so the real
+data/ files are left untouched.
+
+The growth ratio (mean latency of the last quarter of turns over
+the first quarter) can be checked against a threshold in regression
+runs with --max-growth-ratio.
+
+Usage:
+    python -m benchmarks.replay_conversation --turns 200
+    python -m benchmarks.replay_conversation --csv replay.csv --max-growth-ratio 3
+
+Python version: 3.13.5
+"""
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.common import format_table, load_patient_turns
+from config import DATA_DIR, DEFAULT_SESSION_ID
+from utils.memory import get_rss_bytes
+
+
+# -------------------------------------------------------------------
+# Replay
+# -------------------------------------------------------------------
+
+def replay(
+    turns: List[str],
+    output_dir: Path,
+    trace_memory: bool = False,
+    window: Optional[int] = None
+) -> List[Dict]:
+    """
+    Replay patient turns through /chat and record per-turn metrics.
+
+    window overrides CONTEXT_WINDOW_TURNS (0 = analyze full history).
+    """
+
+    import app as app_module
+    from nlp.context_window import ConversationWindow
+
+    if window is not None:
+        app_module.conversations.make_window = (
+            partial(ConversationWindow, window) if window > 0 else None
+        )
+
+    # Redirect persistence away from the real data directory
+    app_module.LOG_FILE = output_dir / "conversation_log.json"
+    app_module.SUMMARY_FILE = output_dir / "structured_summary.json"
+    app_module.SENTIMENT_FILE = output_dir / "sentiment_intent.json"
+    app_module.SOAP_FILE = output_dir / "soap_note.json"
+    app_module.conversations.clear()
+
+    client = app_module.app.test_client()
+
+    if trace_memory:
+        tracemalloc.start()
+
+    rows = []
+
+    for turn_number, message in enumerate(turns, start=1):
+        start = time.perf_counter()
+        response = client.post("/chat", json={"message": message})
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        history = app_module.conversations.get(DEFAULT_SESSION_ID).turns
+
+        row = {
+            "turn": turn_number,
+            "status": response.status_code,
+            "latency_ms": round(latency_ms, 2),
+            "history_turns": len(history),
+            "history_chars": sum(len(turn.text) for turn in history),
+            "rss_mb": round(get_rss_bytes() / 1024 / 1024, 1)
+        }
+
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            row["traced_mb"] = round(current / 1024 / 1024, 2)
+            row["traced_peak_mb"] = round(peak / 1024 / 1024, 2)
+            tracemalloc.reset_peak()
+
+        rows.append(row)
+
+    if trace_memory:
+        tracemalloc.stop()
+
+    return rows
+
+
+def growth_ratio(rows: List[Dict]) -> float:
+    """
+    Mean latency of the last quarter of turns divided by
+    that of the first quarter.
+    """
+
+    quarter = max(1, len(rows) // 4)
+    first = [r["latency_ms"] for r in rows[:quarter]]
+    last = [r["latency_ms"] for r in rows[-quarter:]]
+
+    baseline = sum(first) / len(first)
+    if baseline == 0:
+        return 0.0
+
+    return round((sum(last) / len(last)) / baseline, 2)
+
+
+# -------------------------------------------------------------------
+# Output
+# -------------------------------------------------------------------
+
+def render_curve(rows: List[Dict], width: int = 40) -> str:
+    """
+    Plain-text bar chart of latency per turn.
+    """
+
+    peak = max(r["latency_ms"] for r in rows) or 1.0
+    lines = []
+
+    for row in rows:
+        bar = "#" * max(1, round(row["latency_ms"] / peak * width))
+        lines.append(f"{row['turn']:>5} {row['latency_ms']:>10.2f} ms  {bar}")
+
+    return "\n".join(lines)
+
+
+def write_csv(rows: List[Dict], path: Path) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--log", default=str(DATA_DIR / "conversation_log.json"),
+                        help="Conversation log or transcript to replay")
+    parser.add_argument("--turns", type=int, default=0,
+                        help="Number of turns (cycles the log; 0 = log length)")
+    parser.add_argument("--window", type=int, default=None,
+                        help="Context window in turns (0 = full history; "
+                             "default: CONTEXT_WINDOW_TURNS)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record tracemalloc current/peak per turn")
+    parser.add_argument("--csv", help="Write per-turn rows to this CSV file")
+    parser.add_argument("--json-out", help="Write rows and summary as JSON")
+    parser.add_argument("--max-growth-ratio", type=float, default=0.0,
+                        help="Exit non-zero if the growth ratio exceeds this")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    turns = load_patient_turns(Path(args.log))
+    if not turns:
+        print(f"No patient turns found in {args.log}", file=sys.stderr)
+        return 1
+
+    if args.turns:
+        turns = [turns[i % len(turns)] for i in range(args.turns)]
+
+    with tempfile.TemporaryDirectory(prefix="replay_") as tmp:
+        rows = replay(
+            turns,
+            Path(tmp),
+            trace_memory=args.trace_memory,
+            window=args.window
+        )
+
+    ratio = growth_ratio(rows)
+    failed = sum(1 for r in rows if r["status"] != 200)
+
+    columns = list(rows[0].keys())
+    print(format_table(columns, [[r[c] for c in columns] for r in rows]))
+    print()
+    print(render_curve(rows))
+    print()
+    print(f"Turns: {len(rows)}  Failed: {failed}  Growth ratio: {ratio}")
+
+    if args.csv:
+        write_csv(rows, Path(args.csv))
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"growth_ratio": ratio, "rows": rows}, f, indent=2)
+
+    if failed:
+        return 1
+
+    if args.max_growth_ratio and ratio > args.max_growth_ratio:
+        print(
+            f"Growth ratio {ratio} exceeds limit {args.max_growth_ratio}",
+            file=sys.stderr
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Sentiment backend benchmark
+
+Compares the keyword baseline with the transformer backend on CPU:
+- keywords: rule tables (detect_sentiment)
+- transformer fp32 / int8: one text per forward pass
+- int8 + micro-batcher: --clients threads submitting concurrently
+
+Reports latency per text, throughput and agreement with the keyword
+labels. Without --model-dir a randomly initialized checkpoint of the
+requested size is used: timings are representative, labels are not.
+
+Usage:
+    python -m benchmarks.sentiment_backends --texts 500 --clients 8
+    python -m benchmarks.sentiment_backends --model-dir models/sentiment/bert_sentiment_model
+
+Python version: 3.13.5
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from benchmarks.common import (
+    SYNTHETIC_PATIENT_TURNS,
+    format_table,
+    latency_summary,
+    load_corpus
+)
+from config import SENTIMENT_BATCH_MAX_SIZE, SENTIMENT_BATCH_MAX_WAIT_MS
+from nlp.sentiment_intent import detect_sentiment
+from nlp.sentiment_model import (
+    MicroBatcher,
+    SentimentClassifier,
+    create_random_model,
+    require_torch
+)
+
+
+def sample_texts(count: int, seed: int = 0) -> List[str]:
+    """
+    Patient texts of 1-8 utterances, as the pipeline sees them.
+    """
+
+    rng = random.Random(seed)
+    turns = [t for conversation in load_corpus() for t in conversation]
+    turns = turns or SYNTHETIC_PATIENT_TURNS
+
+    return [
+        " ".join(rng.choice(turns) for _ in range(rng.randint(1, 8)))
+        for _ in range(count)
+    ]
+
+
+def time_sequential(predict: Callable[[str], str], texts: List[str]):
+    labels, latencies = [], []
+
+    start = time.perf_counter()
+    for text in texts:
+        t0 = time.perf_counter()
+        labels.append(predict(text))
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    return labels, latencies, time.perf_counter() - start
+
+
+def time_concurrent(batcher: MicroBatcher, texts: List[str], clients: int):
+    def call(text: str):
+        t0 = time.perf_counter()
+        label = batcher(text)
+        return label, (time.perf_counter() - t0) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(call, texts))
+    elapsed = time.perf_counter() - start
+
+    return [r[0] for r in results], [r[1] for r in results], elapsed
+
+
+def benchmark(args, model_dir: Path) -> List[List]:
+    texts = sample_texts(args.texts, args.seed)
+    rows = []
+    baseline: Optional[List[str]] = None
+
+    def add_row(name: str, labels: List[str], latencies: List[float], elapsed: float):
+        summary = latency_summary(latencies)
+        agreement = sum(a == b for a, b in zip(labels, baseline)) / len(labels)
+        rows.append([
+            name, summary["p50_ms"], summary["p95_ms"],
+            round(len(texts) / elapsed, 1), f"{agreement:.0%}"
+        ])
+
+    baseline, latencies, elapsed = time_sequential(
+        lambda text: detect_sentiment(text.lower()), texts
+    )
+    add_row("keywords", baseline, latencies, elapsed)
+
+    for quantize in (False, True):
+        classifier = SentimentClassifier(
+            model_dir, quantize=quantize, threads=args.threads or None
+        )
+        classifier.predict(texts[:4])  # warm-up
+
+        labels, latencies, elapsed = time_sequential(
+            lambda text: classifier.predict([text])[0], texts
+        )
+        add_row(f"transformer {'int8' if quantize else 'fp32'}", labels, latencies, elapsed)
+
+    batcher = MicroBatcher(classifier.predict, args.batch_size, args.max_wait_ms)
+    labels, latencies, elapsed = time_concurrent(batcher, texts, args.clients)
+    batcher.close()
+    add_row(
+        f"int8 + batcher ({args.clients} clients, "
+        f"mean batch {batcher.items / max(1, batcher.batches):.1f})",
+        labels, latencies, elapsed
+    )
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model-dir", type=Path, help="Fine-tuned checkpoint")
+    parser.add_argument("--texts", type=int, default=300)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=0, help="0 = configured default")
+    parser.add_argument("--batch-size", type=int, default=SENTIMENT_BATCH_MAX_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=SENTIMENT_BATCH_MAX_WAIT_MS)
+    parser.add_argument("--layers", type=int, default=6, help="Random checkpoint size")
+    parser.add_argument("--hidden-size", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    require_torch()
+
+    with tempfile.TemporaryDirectory(prefix="sentiment_model_") as tmp:
+        model_dir = args.model_dir
+        if model_dir is None:
+            # Whole-word vocabulary, so token counts resemble a real WordPiece model
+            text = " ".join(sample_texts(args.texts, args.seed)).lower()
+            words = re.findall(r"[a-z0-9]+", text)
+            model_dir = create_random_model(
+                Path(tmp), words, hidden_size=args.hidden_size,
+                layers=args.layers, heads=max(1, args.hidden_size // 64)
+            )
+
+        rows = benchmark(args, model_dir)
+
+    print(format_table(
+        ["backend", "p50_ms", "p95_ms", "texts_per_s", "agrees_with_keywords"],
+        rows
+    ))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
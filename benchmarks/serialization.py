@@ -0,0 +1,117 @@
+"""
+Serialization and compression benchmark
+
+Builds a batch-sized payload from the current pipeline outputs
+(data/outputs) and the conversation log, then measures:
+- Serialize time and size per encoder (indented stdlib json as used
+  before, compact stdlib json, compact orjson when installed)
+- gzip time and compressed size per compression level
+
+Usage:
+    python -m benchmarks.serialization --batch 1000 --repeat 20
+
+Python version: 3.13.5
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.common import format_table
+from config import DATA_DIR, OUTPUTS_DIR
+from utils.serialization import gzip_body, orjson
+
+
+def load_sample_output() -> Dict:
+    """
+    One pipeline output plus its conversation, from the persisted files.
+    """
+
+    def read(path):
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    sentiment = read(OUTPUTS_DIR / "sentiment_intent.json")
+
+    return {
+        "summary": read(OUTPUTS_DIR / "structured_summary.json"),
+        "sentiment": sentiment["Sentiment"],
+        "intent": sentiment["Intent"],
+        "soap_note": read(OUTPUTS_DIR / "soap_note.json"),
+        "conversation": read(DATA_DIR / "conversation_log.json")
+    }
+
+
+def build_encoders() -> Dict[str, Callable[[object], bytes]]:
+    encoders = {
+        "json_indent2": lambda obj: json.dumps(
+            obj, indent=2, ensure_ascii=False
+        ).encode("utf-8"),
+        "json_compact": lambda obj: json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+    }
+
+    if orjson is not None:
+        encoders["orjson_compact"] = orjson.dumps
+
+    return encoders
+
+
+def time_call(func: Callable, repeat: int) -> float:
+    """
+    Mean milliseconds per call.
+    """
+
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def benchmark(payload, repeat: int, levels: List[int]) -> List[List]:
+    rows = []
+
+    for name, encode in build_encoders().items():
+        body = encode(payload)
+        serialize_ms = time_call(lambda: encode(payload), repeat)
+
+        rows.append([name, "-", round(serialize_ms, 2), round(len(body) / 1024, 1)])
+
+        for level in levels:
+            gzip_ms = time_call(lambda: gzip_body(body, level), repeat)
+            compressed = gzip_body(body, level)
+            rows.append([
+                name,
+                f"gzip-{level}",
+                round(serialize_ms + gzip_ms, 2),
+                round(len(compressed) / 1024, 1)
+            ])
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--batch", type=int, default=1000,
+                        help="Pipeline outputs per payload")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9])
+    args = parser.parse_args(argv)
+
+    payload = {"results": [load_sample_output()] * args.batch}
+
+    rows = benchmark(payload, args.repeat, args.levels)
+    print(format_table(["encoder", "compression", "total_ms", "size_kb"], rows))
+
+    if orjson is None:
+        print("\norjson is not installed; only stdlib encoders were measured")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
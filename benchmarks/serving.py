@@ -0,0 +1,171 @@
+"""
+Multi-worker serving benchmark
+
+Starts gunicorn (gunicorn.conf.py) with 1, 4 and 16 workers in
+turn, drives it with the load-test harness and reports throughput,
+latency and memory. Memory is reported both as summed RSS (which
+double-counts pages shared copy-on-write) and summed PSS (which
+splits shared pages between processes) — PSS is the number that
+reflects real usage. Each run uses a fresh SQLite database, as
+multi-worker serving requires. Linux only.
+
+Usage:
+    python -m benchmarks.serving --workers 1 4 16 --sessions 64
+
+Python version: 3.13.5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import format_table, load_corpus
+from benchmarks.load_test import http_client, run_load_test
+from config import BASE_DIR
+
+
+# -------------------------------------------------------------------
+# Process Memory (Linux /proc)
+# -------------------------------------------------------------------
+
+def child_pids(pid: int) -> List[int]:
+    children = Path(f"/proc/{pid}/task/{pid}/children")
+    if not children.exists():
+        return []
+    return [int(p) for p in children.read_text().split()]
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """
+    Return RSS and PSS (kB) from /proc/<pid>/smaps_rollup.
+    """
+
+    values = {"rss_kb": 0, "pss_kb": 0}
+
+    try:
+        lines = Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()
+    except OSError:
+        return values
+
+    for line in lines:
+        if line.startswith("Rss:"):
+            values["rss_kb"] = int(line.split()[1])
+        elif line.startswith("Pss:"):
+            values["pss_kb"] = int(line.split()[1])
+
+    return values
+
+
+def server_memory(master_pid: int) -> Dict[str, float]:
+    pids = [master_pid] + child_pids(master_pid)
+    totals = [memory_kb(pid) for pid in pids]
+
+    return {
+        "processes": len(pids),
+        "rss_mb": round(sum(t["rss_kb"] for t in totals) / 1024, 1),
+        "pss_mb": round(sum(t["pss_kb"] for t in totals) / 1024, 1)
+    }
+
+
+# -------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------
+
+def wait_until_healthy(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url + "/healthz", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+
+    raise TimeoutError(f"Server at {url} did not become healthy")
+
+
+def benchmark_workers(workers: int, port: int, args, db_dir: Path) -> Dict:
+    env = dict(
+        os.environ,
+        WEB_WORKERS=str(workers),
+        WEB_THREADS=str(args.threads),
+        # Several workers share session history through SQLite only
+        STORAGE_BACKEND="sqlite",
+        SQLITE_DB_PATH=str(db_dir / f"serving_{workers}.db")
+    )
+    url = f"http://127.0.0.1:{port}"
+
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn",
+            "-c", "gunicorn.conf.py",
+            "--bind", f"127.0.0.1:{port}",
+            "app:app"
+        ],
+        cwd=BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    try:
+        wait_until_healthy(url, args.startup_timeout)
+        idle_memory = server_memory(server.pid)
+
+        report = run_load_test(
+            http_client(url, timeout=args.request_timeout),
+            load_corpus(),
+            sessions=args.sessions,
+            arrival_rate=0,
+            concurrency=args.concurrency,
+            think_time=0
+        )
+        loaded_memory = server_memory(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    return {
+        "workers": workers,
+        "idle_pss_mb": idle_memory["pss_mb"],
+        "loaded_pss_mb": loaded_memory["pss_mb"],
+        "loaded_rss_mb": loaded_memory["rss_mb"],
+        "throughput_rps": report["throughput_rps"],
+        "p50_ms": report["latency"]["p50_ms"],
+        "p99_ms": report["latency"]["p99_ms"],
+        "error_rate": report["error_rate"]
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--request-timeout", type=float, default=120)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="serving_") as tmp:
+        rows = [
+            benchmark_workers(n, args.port, args, Path(tmp)) for n in args.workers
+        ]
+
+    columns = list(rows[0].keys())
+    print(format_table(columns, [[row[c] for c in columns] for row in rows]))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Pipeline stage graph benchmark
+
+Times run_nlp_pipeline's stage graph on synthetic conversations of
+increasing length, inline (one stage after another) and on the
+shared stage pool, next to the sum of the stage times and the
+slowest dependency path, which bound the two.
+
+Usage:
+    python -m benchmarks.stage_graph --turns 10 40 160 --repeat 20
+
+Python version: 3.13.5
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.common import format_table, latency_summary, synthetic_conversation
+from nlp.pipeline import PIPELINE_GRAPH
+from nlp.preprocessing import build_transcript_string, extract_patient_sentences
+from nlp.rules import pinned_rules
+from nlp.stage_graph import StageGraph
+
+
+PHYSICIAN_REPLY = "Can you tell me more about the location and severity of the pain?"
+
+
+def graph_inputs(turns: int, seed: int) -> Dict[str, str]:
+    conversation = []
+    for text in synthetic_conversation(turns, seed):
+        conversation.append({"role": "Patient", "text": text})
+        conversation.append({"role": "Physician", "text": PHYSICIAN_REPLY})
+
+    return {
+        "transcript": build_transcript_string(conversation),
+        "patient_text": extract_patient_sentences(conversation)
+    }
+
+
+def stage_times(graph: StageGraph, inputs: Dict) -> Dict[str, float]:
+    """
+    Milliseconds per stage, run one at a time in dependency order.
+    """
+
+    results = dict(inputs)
+    times = {}
+
+    for stage in graph.order:
+        start = time.perf_counter()
+        results[stage.name] = stage.func(*(results[dep] for dep in stage.deps))
+        times[stage.name] = (time.perf_counter() - start) * 1000
+
+    return times
+
+
+def critical_path(graph: StageGraph, times: Dict[str, float]) -> float:
+    finish: Dict[str, float] = {}
+
+    for stage in graph.order:
+        ready = max((finish.get(dep, 0.0) for dep in stage.deps), default=0.0)
+        finish[stage.name] = ready + times[stage.name]
+
+    return max(finish.values())
+
+
+def benchmark(args) -> List[List]:
+    rows = []
+
+    with pinned_rules():
+        for turns in args.turns:
+            inputs = graph_inputs(turns, args.seed)
+
+            # Warm-up (model caches, pool threads)
+            PIPELINE_GRAPH.run(inputs, concurrent=True)
+
+            measured = [stage_times(PIPELINE_GRAPH, inputs) for _ in range(args.repeat)]
+            mean_times = {
+                name: sum(m[name] for m in measured) / len(measured)
+                for name in measured[0]
+            }
+
+            latencies = {}
+            for concurrent in (False, True):
+                samples = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    PIPELINE_GRAPH.run(inputs, concurrent=concurrent)
+                    samples.append((time.perf_counter() - start) * 1000)
+                latencies[concurrent] = latency_summary(samples)
+
+            rows.append([
+                turns,
+                round(sum(mean_times.values()), 2),
+                round(critical_path(PIPELINE_GRAPH, mean_times), 2),
+                latencies[False]["p50_ms"],
+                latencies[True]["p50_ms"],
+                latencies[True]["p95_ms"],
+                max(mean_times, key=mean_times.get)
+            ])
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 40, 160])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args)
+    print(format_table(
+        [
+            "patient_turns", "sum_stages_ms", "slowest_path_ms",
+            "inline_p50_ms", "concurrent_p50_ms", "concurrent_p95_ms",
+            "slowest_stage"
+        ],
+        rows
+    ))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
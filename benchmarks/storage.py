@@ -0,0 +1,139 @@
+"""
+SQLite storage benchmark
+
+Measures, against a fresh database in a temporary directory:
+- Per-turn writes: one save_chat_turn transaction per /chat call
+  (patient + physician turn + pipeline output)
+- Bulk import: turns per second through import_conversations
+- Reader latency while a writer is active (WAL lets readers proceed)
+
+Usage:
+    python -m benchmarks.storage --chat-turns 2000 --import-turns 100000 --readers 4
+
+Python version: 3.13.5
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import format_table, latency_summary, synthetic_conversation
+from utils.storage import SQLiteStorage
+
+
+SAMPLE_OUTPUT = {
+    "summary": {
+        "Patient_Name": "Ms. Jones",
+        "Symptoms": ["Neck Pain", "Back Pain"],
+        "Diagnosis": "Whiplash Injury",
+        "Treatment": ["Physiotherapy", "Painkillers"],
+        "Current_Status": "Occasional backache",
+        "Prognosis": "Full recovery expected"
+    },
+    "sentiment": "Reassured",
+    "intent": "Reporting improvement",
+    "soap_note": {
+        "Subjective": {"Chief_Complaint": "Neck and back pain"},
+        "Plan": {"Treatment": "Continue physiotherapy"}
+    }
+}
+
+
+def conversation_turns(count: int) -> List[Dict]:
+    texts = synthetic_conversation(count)
+    return [
+        {"role": "Patient" if i % 2 == 0 else "Physician", "text": text}
+        for i, text in enumerate(texts)
+    ]
+
+
+def run_readers(storage: SQLiteStorage, sessions: List[str], stop, latencies):
+    index = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        storage.get_turns(sessions[index % len(sessions)])
+        latencies.append((time.perf_counter() - start) * 1000)
+        index += 1
+
+
+def benchmark(args) -> List[List]:
+    rows = []
+
+    with tempfile.TemporaryDirectory(prefix="storage_bench_") as tmp:
+        storage = SQLiteStorage(Path(tmp) / "bench.db")
+        turns = conversation_turns(2)
+        sessions = [f"session-{i}" for i in range(args.sessions)]
+
+        stop = threading.Event()
+        read_latencies: List[float] = []
+        readers = [
+            threading.Thread(
+                target=run_readers,
+                args=(storage, sessions, stop, read_latencies)
+            )
+            for _ in range(args.readers)
+        ]
+
+        # Seed every session so readers have something to read
+        storage.import_conversations((s, turns) for s in sessions)
+        for thread in readers:
+            thread.start()
+
+        # Per-turn transactions
+        write_latencies = []
+        start = time.perf_counter()
+        for i in range(args.chat_turns):
+            t0 = time.perf_counter()
+            storage.save_chat_turn(sessions[i % len(sessions)], turns, SAMPLE_OUTPUT)
+            write_latencies.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - start
+
+        summary = latency_summary(write_latencies)
+        rows.append([
+            "chat_turn", args.chat_turns * len(turns),
+            round(args.chat_turns * len(turns) / elapsed),
+            summary["p50_ms"], summary["p99_ms"]
+        ])
+
+        # Bulk import
+        bulk = conversation_turns(args.import_turns)
+        start = time.perf_counter()
+        written = storage.import_conversations([("bulk-import", bulk)])
+        elapsed = time.perf_counter() - start
+        rows.append(["bulk_import", written, round(written / elapsed), "-", "-"])
+
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        summary = latency_summary(read_latencies)
+        rows.append([
+            f"reads ({args.readers} threads)", len(read_latencies), "-",
+            summary["p50_ms"], summary["p99_ms"]
+        ])
+
+        storage.close()
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chat-turns", type=int, default=2000)
+    parser.add_argument("--import-turns", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args)
+    print(format_table(["operation", "turns", "turns_per_s", "p50_ms", "p99_ms"], rows))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
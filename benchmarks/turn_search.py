@@ -0,0 +1,109 @@
+"""
+Full-text turn search benchmark
+
+Bulk-imports synthetic conversations into a fresh SQLite database
+(turns are indexed by the FTS5 triggers as they are inserted), then
+measures search latency for rare and common words, phrases and
+OR queries.
+
+Usage:
+    python -m benchmarks.turn_search --turns 2000000 --queries 50
+
+Python version: 3.13.5
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from benchmarks.common import SYNTHETIC_PATIENT_TURNS, format_table, latency_summary
+from utils.storage import SQLiteStorage
+
+
+# Extra clinical vocabulary mixed into turns so postings vary in length
+FILLER_WORDS = [
+    "yesterday", "morning", "evening", "shoulder", "knee", "wrist", "ankle",
+    "medication", "ibuprofen", "paracetamol", "appointment", "scan", "swelling",
+    "numbness", "tingling", "fatigue", "dizzy", "fever", "cough", "allergy",
+    "steering", "wheel", "seatbelt", "stairs", "lifting", "running", "work"
+]
+
+QUERIES = [
+    ("common_word", "pain", "all"),
+    ("rare_word", "allergy", "all"),
+    ("two_words", "trouble sleeping", "all"),
+    ("phrase", "steering wheel", "phrase"),
+    ("any_of_3", "fever cough numbness", "any")
+]
+
+SESSION_LENGTH = 50
+
+
+def synthetic_sessions(turns: int, seed: int = 0) -> Iterator[Tuple[str, List[Dict]]]:
+    rng = random.Random(seed)
+
+    for start in range(0, turns, SESSION_LENGTH):
+        count = min(SESSION_LENGTH, turns - start)
+        yield (
+            f"session-{start // SESSION_LENGTH}",
+            [
+                {
+                    "role": "Patient" if i % 2 == 0 else "Physician",
+                    "text": rng.choice(SYNTHETIC_PATIENT_TURNS)
+                    + " " + " ".join(rng.sample(FILLER_WORDS, 3))
+                }
+                for i in range(count)
+            ]
+        )
+
+
+def benchmark(args) -> List[List]:
+    rows = []
+
+    with tempfile.TemporaryDirectory(prefix="turn_search_") as tmp:
+        storage = SQLiteStorage(Path(tmp) / "bench.db")
+
+        start = time.perf_counter()
+        written = storage.import_conversations(synthetic_sessions(args.turns))
+        elapsed = time.perf_counter() - start
+        print(
+            f"Imported and indexed {written} turns in {elapsed:.1f}s "
+            f"({written / elapsed:.0f} turns/s)"
+        )
+
+        for name, text, mode in QUERIES:
+            storage.search_turns(text, mode=mode, limit=args.limit)  # warm-up
+
+            latencies = []
+            for _ in range(args.queries):
+                t0 = time.perf_counter()
+                results = storage.search_turns(text, mode=mode, limit=args.limit)
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+            summary = latency_summary(latencies)
+            rows.append([name, mode, len(results), summary["p50_ms"], summary["p99_ms"]])
+
+        storage.close()
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rows = benchmark(args)
+    print(format_table(["query", "mode", "results", "p50_ms", "p99_ms"], rows))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
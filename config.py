@@ -11,6 +11,7 @@ This file centralizes:
 Python version: 3.13.5
 """
 
+import os
 from pathlib import Path
 
 # -------------------------------------------------------------------
@@ -32,7 +33,11 @@ LOGS_DIR = BASE_DIR / "logs"
 MODELS_DIR = BASE_DIR / "models"
 
 NER_MODEL_DIR = MODELS_DIR / "ner" / "medical_ner_model"
-SENTIMENT_MODEL_PATH = MODELS_DIR / "sentiment" / "bert_sentiment_model.pt"
+# Fine-tuned sequence classifier (transformers save_pretrained directory)
+# used when SENTIMENT_BACKEND = "transformer"
+SENTIMENT_MODEL_PATH = Path(
+    os.environ.get("SENTIMENT_MODEL_PATH", MODELS_DIR / "sentiment" / "bert_sentiment_model")
+)
 SUMMARIZATION_MODEL_DIR = MODELS_DIR / "summarization" / "medical_summarizer"
 
 # Ensure directories exist
@@ -54,6 +59,120 @@ DEBUG = True
 HOST = "127.0.0.1"
 PORT = 5000
 
+# -------------------------------------------------------------------
+# Production Serving (gunicorn -c gunicorn.conf.py app:app)
+# -------------------------------------------------------------------
+
+# Worker processes forked from a master that preloads the models.
+# Defaults to one per core with STORAGE_BACKEND=sqlite, through which
+# workers share session history, and to a single worker otherwise
+WEB_WORKERS = int(os.environ.get(
+    "WEB_WORKERS",
+    (os.cpu_count() or 1) if os.environ.get("STORAGE_BACKEND") == "sqlite" else 1
+))
+
+# Threads per worker (>1 switches to the gthread worker class)
+WEB_THREADS = int(os.environ.get("WEB_THREADS", 1))
+
+# Seconds before an unresponsive worker is killed and replaced
+WEB_TIMEOUT = 60
+
+# Seconds workers get to finish in-flight requests on reload/shutdown
+WEB_GRACEFUL_TIMEOUT = 30
+
+# Recycle a worker after this many requests (0 disables) to cap slow growth
+WEB_MAX_REQUESTS = 0
+WEB_MAX_REQUESTS_JITTER = 50
+
+# -------------------------------------------------------------------
+# Admission Control & Load Shedding
+# -------------------------------------------------------------------
+
+# Pipeline runs allowed at once per process
+ADMISSION_MAX_CONCURRENT = int(
+    os.environ.get("ADMISSION_MAX_CONCURRENT", os.cpu_count() or 1)
+)
+
+# Requests allowed to wait for a slot; beyond this they get 429
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", 32))
+
+# Default per-request deadline in seconds; requests that cannot start
+# within it get 503. Clients may shorten it with X-Request-Deadline.
+ADMISSION_DEADLINE_SECONDS = 10.0
+
+# When overloaded, reply with the physician message only (no NLP stages)
+# instead of rejecting the request
+ADMISSION_DEGRADED_MODE = False
+
+# -------------------------------------------------------------------
+# Async Serving (hypercorn asgi:app)
+# -------------------------------------------------------------------
+
+# Threads running chat turns for the async app. Admission control
+# bounds the pipeline runs; the default leaves a thread for every
+# running and queued request so none waits outside the controller.
+ASYNC_PIPELINE_WORKERS = int(
+    os.environ.get(
+        "ASYNC_PIPELINE_WORKERS",
+        ADMISSION_MAX_CONCURRENT + ADMISSION_MAX_QUEUE
+    )
+)
+
+# -------------------------------------------------------------------
+# Delta Responses
+# -------------------------------------------------------------------
+
+# Sessions whose last-sent output is kept per process (least recently
+# used are dropped; their clients fall back to a full snapshot)
+SESSION_STATE_MAX_SESSIONS = 1024
+
+# Longest accepted client session_id
+SESSION_ID_MAX_LENGTH = 128
+
+# Session used for requests that do not send a session_id
+DEFAULT_SESSION_ID = "default"
+
+# -------------------------------------------------------------------
+# Storage
+# -------------------------------------------------------------------
+
+# "json" appends turns to the flat log in data/ and overwrites the
+# latest outputs (one worker only); "sqlite" appends to an embedded
+# database per session, which every worker reads session history from
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json")
+
+SQLITE_DB_PATH = Path(os.environ.get("SQLITE_DB_PATH", DATA_DIR / "notetaker.db"))
+
+# Milliseconds a writer waits for the database lock before failing
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+# Rows per executemany call during bulk import
+SQLITE_IMPORT_BATCH_SIZE = 1000
+
+# Full-text search ranks only the newest N matching turns; bm25 over
+# every match of a common word is the dominant cost on large databases
+SEARCH_MAX_CANDIDATES = 5000
+
+# -------------------------------------------------------------------
+# Serialization & Compression
+# -------------------------------------------------------------------
+
+# "auto" uses orjson when installed, "orjson" requires it, "json" is stdlib
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "auto")
+
+# Write persisted JSON files without indentation (read by tools, not people)
+JSON_FILES_COMPACT = True
+
+# Flat-file conversation log size at which it is rotated to
+# conversation_log.1.json (replacing the previous one); 0 = never
+CONVERSATION_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+# gzip responses of at least this many bytes when the client accepts it
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+
+# zlib level 1 (fastest) .. 9 (smallest)
+RESPONSE_COMPRESSION_LEVEL = 6
+
 # -------------------------------------------------------------------
 # NLP Pipeline Configuration
 # -------------------------------------------------------------------
@@ -80,6 +199,64 @@ INTENT_LABELS = [
     "Reporting improvement"
 ]
 
+# Sentiment classifier: "keywords" (rule tables) or "transformer"
+# (SENTIMENT_MODEL_PATH on CPU; needs torch + transformers). Intent
+# stays rule-based with either backend.
+SENTIMENT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "keywords")
+
+# Dynamic int8 quantization of the transformer's Linear layers
+SENTIMENT_QUANTIZE = True
+
+# Intra-op threads per process for the transformer (0 = CPU cores
+# divided by WEB_WORKERS, so forked workers do not oversubscribe)
+SENTIMENT_TORCH_THREADS = int(os.environ.get("SENTIMENT_TORCH_THREADS", 0))
+
+# Longest input in tokens; longer patient text keeps its most recent part
+SENTIMENT_MAX_LENGTH = 256
+
+# Micro-batching of concurrent requests: a batch runs when it holds
+# SENTIMENT_BATCH_MAX_SIZE texts or its first text has waited
+# SENTIMENT_BATCH_MAX_WAIT_MS (0 = run whatever is queued at once)
+SENTIMENT_BATCH_MAX_SIZE = 8
+SENTIMENT_BATCH_MAX_WAIT_MS = 5
+
+# Seconds a request waits for its batch result before failing, so a
+# stalled batcher cannot hold requests (and admission slots) forever
+SENTIMENT_BATCH_TIMEOUT_SECONDS = 10
+
+# Padded tokens per forward pass; a batch is sorted by length and split
+# so short texts are not padded to the longest one
+SENTIMENT_BATCH_MAX_TOKENS = 1024
+
+# Transcript exports: a line matching this pattern separates two
+# conversations ("---", "===" or a "Conversation/Session/Encounter: <id>"
+# header, whose id is kept)
+TRANSCRIPT_BOUNDARY_PATTERN = (
+    r"^(?:-{3,}|={3,}|(?:conversation|session|encounter)\s*[:#]\s*(?P<id>\S.*)?)$"
+)
+
+# Encoding of transcript exports; undecodable bytes are replaced
+TRANSCRIPT_ENCODING = "utf-8"
+
+# Utterances normalized per batch chunk (one joined string each)
+NORMALIZE_CHUNK_SIZE = 10_000
+
+# Threads for normalize_texts on large batches (1 = inline). Only
+# useful on a free-threaded interpreter; with the GIL, threads add
+# overhead without running chunks in parallel.
+NORMALIZE_WORKERS = 1
+
+# Smallest batch handed to the thread pool
+NORMALIZE_PARALLEL_MIN_BATCH = 100_000
+
+# Threads shared by independent pipeline stages (parse, keywords,
+# sentiment, ...); 0 runs the stage graph in the request thread
+PIPELINE_STAGE_WORKERS = int(os.environ.get("PIPELINE_STAGE_WORKERS", 4))
+
+# Per-stage timeouts in seconds, e.g. {"doc": 2.0, "summary": 1.0};
+# a chat turn whose stage overruns gets a 504
+PIPELINE_STAGE_TIMEOUTS = {}
+
 # -------------------------------------------------------------------
 # Summarization Configuration
 # -------------------------------------------------------------------
@@ -87,9 +264,54 @@ INTENT_LABELS = [
 # Maximum number of keywords extracted
 MAX_KEYWORDS = 10
 
+# Recent turns analyzed in full; older turns are folded into a rollup
+# of entities, keyword counts and sentiment tallies (0 = analyze the
+# whole conversation every turn)
+CONTEXT_WINDOW_TURNS = 0
+
+# Distinct keywords the rollup keeps counts for; less frequent ones
+# are dropped once the limit is exceeded
+CONTEXT_ROLLUP_MAX_KEYWORDS = 100
+
+# Keyword candidates: "noun_chunks" (dependency parser) or
+# "pos_patterns" (tagger + token patterns, no parser; faster)
+KEYWORD_EXTRACTOR = "noun_chunks"
+
+# Keyword ordering: "tfidf" ranks by corpus IDF (falls back to
+# alphabetical when the table has not been built) or "alphabetical"
+KEYWORD_RANKING = "tfidf"
+
+# Precomputed IDF table (python -m nlp.idf data/transcripts ...)
+KEYWORD_IDF_DIR = MODELS_DIR / "keywords"
+
 # Placeholder summarization model name
 SUMMARIZATION_MODEL_NAME = "rule_based_v1"
 
+# -------------------------------------------------------------------
+# Rule & Lexicon Tables
+# -------------------------------------------------------------------
+
+# NER phrase lists, medical keyword vocabulary and sentiment / intent
+# keywords (versioned JSON; see nlp/rules.py)
+RULES_PATH = Path(os.environ.get("RULES_PATH", DATA_DIR / "rules" / "rules.json"))
+
+# Seconds between checks for a changed rules file; a change is rebuilt
+# in the background and swapped in (0 = reload only on request)
+RULES_CHECK_SECONDS = 5
+
+# -------------------------------------------------------------------
+# Parsed Doc Cache (python -m nlp.doc_cache build / reanalyze ...)
+# -------------------------------------------------------------------
+
+# DocBin shards of parsed transcripts, one subdirectory per model version
+DOC_CACHE_DIR = DATA_DIR / "doc_cache"
+
+# Transcripts per shard file
+DOC_CACHE_SHARD_SIZE = 500
+
+# Texts per nlp.pipe batch while building the cache
+DOC_CACHE_BATCH_SIZE = 64
+
 # -------------------------------------------------------------------
 # Evaluation Configuration
 # -------------------------------------------------------------------
@@ -109,6 +331,53 @@ EVALUATION_METRICS = {
 LOG_LEVEL = "INFO"
 LOG_FILE_PREFIX = "physician_notetaker"
 
+# Output format: "text" (pipe-separated) or "json" (one JSON object per line)
+LOG_FORMAT = "text"
+
+# Daily file rotation: "size", "time" (UTC midnight) or None
+LOG_ROTATION = "size"
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 7
+
+# Records waiting for the background listener; excess records are dropped
+LOG_QUEUE_SIZE = 10000
+
+# Fraction of records kept per level, e.g. {"INFO": 0.1} under heavy load
+LOG_SAMPLING_RATES = {}
+
+# -------------------------------------------------------------------
+# Diagnostics
+# -------------------------------------------------------------------
+
+# tracemalloc snapshots around pipeline stages (adds noticeable overhead)
+MEMORY_PROFILING_ENABLED = False
+
+# Seconds between background snapshots (0 disables the interval thread)
+MEMORY_SNAPSHOT_INTERVAL = 300
+
+# Number of allocation sites reported per diff
+MEMORY_TOP_N = 10
+
+# Frames kept per traced allocation
+MEMORY_TRACE_FRAMES = 1
+
+# Fraction of /chat requests profiled with the stack sampler (0 disables).
+# Authorized clients can also force profiling with the X-Profile: 1 header.
+CPU_PROFILE_SAMPLE_RATE = 0.0
+
+# Seconds between stack samples while profiling. Each sample walks
+# every thread's frames (sys._current_frames) while holding the GIL,
+# which slows the profiled request; shorter intervals resolve short
+# stages better but distort the timings they measure more
+CPU_PROFILE_INTERVAL = 0.005
+
+# Collapsed-stack (.folded) output for flamegraph tools
+CPU_PROFILE_DIR = LOGS_DIR / "profiles"
+
+# Token required in the X-Debug-Token header for /debug/* endpoints.
+# Debug endpoints are disabled (404) when unset.
+DEBUG_ENDPOINT_TOKEN = os.environ.get("DEBUG_ENDPOINT_TOKEN", "")
+
 # -------------------------------------------------------------------
 # Security & Privacy (Important for Healthcare)
 # -------------------------------------------------------------------
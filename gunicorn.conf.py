@@ -0,0 +1,97 @@
+"""
+Gunicorn configuration for production serving of Physician Notetaker
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+
+The master process imports app.py (config, spaCy model, compiled
+matchers), runs one warm-up pipeline call and freezes the garbage
+collector before forking, so workers share model memory
+copy-on-write. Each worker runs a pipeline self-check before it
+accepts traffic. More than one worker requires
+STORAGE_BACKEND=sqlite, the only backend workers can share session
+history through.
+
+Reloads:
+- kill -HUP <master>   restart workers gracefully (same preloaded code)
+- kill -USR2 <master>  start a new master with fresh code/models,
+                       then kill -QUIT the old master
+
+Python version: 3.13.5
+"""
+
+import gc
+import sys
+
+from config import (
+    HOST,
+    PORT,
+    STORAGE_BACKEND,
+    WEB_WORKERS,
+    WEB_THREADS,
+    WEB_TIMEOUT,
+    WEB_GRACEFUL_TIMEOUT,
+    WEB_MAX_REQUESTS,
+    WEB_MAX_REQUESTS_JITTER
+)
+
+
+# -------------------------------------------------------------------
+# Server Settings
+# -------------------------------------------------------------------
+
+# Requests are not routed by session: with several workers, each one
+# catches up on a session's history from the database before a turn.
+# Flat JSON files cannot be shared that way.
+if WEB_WORKERS > 1 and STORAGE_BACKEND != "sqlite":
+    sys.exit(
+        f"WEB_WORKERS={WEB_WORKERS} requires STORAGE_BACKEND=sqlite "
+        "(conversation history is otherwise per worker)"
+    )
+
+bind = f"{HOST}:{PORT}"
+
+workers = WEB_WORKERS
+threads = WEB_THREADS
+worker_class = "gthread" if WEB_THREADS > 1 else "sync"
+
+preload_app = True
+
+timeout = WEB_TIMEOUT
+graceful_timeout = WEB_GRACEFUL_TIMEOUT
+
+max_requests = WEB_MAX_REQUESTS
+max_requests_jitter = WEB_MAX_REQUESTS_JITTER if WEB_MAX_REQUESTS else 0
+
+
+# -------------------------------------------------------------------
+# Server Hooks
+# -------------------------------------------------------------------
+
+def when_ready(server):
+    """
+    Warm up the preloaded pipeline in the master, then move every
+    surviving object into the permanent GC generation so collections
+    in workers do not write to (and un-share) those pages.
+    """
+
+    from app import run_pipeline_self_check
+
+    if not run_pipeline_self_check():
+        server.log.error("Pipeline warm-up failed in master")
+
+    gc.freeze()
+    server.log.info("Models preloaded; forking %s workers", workers)
+
+
+def post_worker_init(worker):
+    """
+    Per-worker health check before the worker accepts requests.
+    """
+
+    from gunicorn.arbiter import Arbiter
+    from app import run_pipeline_self_check
+
+    if not run_pipeline_self_check():
+        worker.log.error("Pipeline self-check failed in worker %s", worker.pid)
+        sys.exit(Arbiter.WORKER_BOOT_ERROR)
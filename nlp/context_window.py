@@ -0,0 +1,185 @@
+"""
+Bounded context window for long conversations
+
+Keeps the most recent turns in full and folds older turns into a
+compact rollup:
+- Accumulated entity sets (Symptoms, Diagnosis, Treatment, Prognosis)
+- Keyword counts (the most frequent CONTEXT_ROLLUP_MAX_KEYWORDS)
+- Sentiment / intent tallies
+- Context cues used by the rule-based inference helpers
+
+Each turn is analyzed once when it leaves the window, so per-turn
+work and memory are bounded by the window size rather than the
+length of the visit.
+
+Python version: 3.13.5
+"""
+
+import threading
+from collections import Counter, deque
+from typing import Dict, List, Tuple
+
+from config import CONTEXT_ROLLUP_MAX_KEYWORDS
+from nlp.ner import extract_medical_entities
+from nlp.keywords import extract_keywords
+from nlp.sentiment_intent import analyze_sentiment_and_intent
+from nlp.preprocessing import build_transcript_string, extract_patient_sentences
+from nlp.turns import Turn
+from nlp import soap, summarization
+
+
+# -------------------------------------------------------------------
+# Context Cues
+# -------------------------------------------------------------------
+
+# Phrases checked by the infer_* helpers in summarization.py and soap.py.
+# Cues seen in folded turns are replayed to those helpers.
+CONTEXT_CUES = (
+    soap.ACCIDENT_CUE,
+    *summarization.INFERENCE_CUES,
+    *soap.FULL_RANGE_CUES
+)
+
+ENTITY_FIELDS = ("Symptoms", "Diagnosis", "Treatment", "Prognosis")
+
+
+# -------------------------------------------------------------------
+# Rollup
+# -------------------------------------------------------------------
+
+class ConversationRollup:
+    """
+    Compact summary of turns that have left the window.
+    """
+
+    def __init__(self):
+        # dicts used as insertion-ordered sets
+        self.entities: Dict[str, Dict[str, None]] = {
+            field: {} for field in ENTITY_FIELDS
+        }
+        self.keyword_counts: Counter = Counter()
+        self.sentiment_counts: Counter = Counter()
+        self.intent_counts: Counter = Counter()
+        self.cues: Dict[str, None] = {}
+        self.turns_folded = 0
+
+    def fold(self, turn: Turn) -> None:
+        """
+        Analyze one evicted turn and merge it into the rollup.
+        """
+
+        text = build_transcript_string([turn])
+        lowered = text.lower()
+
+        for field, values in extract_medical_entities(text).items():
+            for value in values:
+                self.entities[field][value] = None
+
+        self.keyword_counts.update(extract_keywords(text))
+        if len(self.keyword_counts) > CONTEXT_ROLLUP_MAX_KEYWORDS:
+            self.keyword_counts = Counter(
+                dict(self.keyword_counts.most_common(CONTEXT_ROLLUP_MAX_KEYWORDS))
+            )
+
+        patient_text = extract_patient_sentences([turn])
+        if patient_text:
+            result = analyze_sentiment_and_intent(patient_text)
+            self.sentiment_counts[result["Sentiment"]] += 1
+            self.intent_counts[result["Intent"]] += 1
+
+        for cue in CONTEXT_CUES:
+            if cue in lowered:
+                self.cues[cue] = None
+
+        self.turns_folded += 1
+
+    def copy(self) -> "ConversationRollup":
+        clone = ConversationRollup()
+        clone.entities = {f: dict(v) for f, v in self.entities.items()}
+        clone.keyword_counts = self.keyword_counts.copy()
+        clone.sentiment_counts = self.sentiment_counts.copy()
+        clone.intent_counts = self.intent_counts.copy()
+        clone.cues = dict(self.cues)
+        clone.turns_folded = self.turns_folded
+        return clone
+
+    def context_line(self) -> str:
+        """
+        One transcript line carrying the cues of folded turns.
+        """
+
+        if not self.cues:
+            return ""
+
+        return "Earlier in visit: " + "; ".join(self.cues)
+
+
+# -------------------------------------------------------------------
+# Window
+# -------------------------------------------------------------------
+
+class ConversationWindow:
+    """
+    The last `size` turns in full, plus a rollup of everything older.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.turns: deque = deque()
+        self.rollup = ConversationRollup()
+        self._lock = threading.Lock()
+
+    def append(self, turn: Turn) -> None:
+        with self._lock:
+            self.turns.append(turn)
+
+            while len(self.turns) > self.size:
+                self.rollup.fold(self.turns.popleft())
+
+    def snapshot(self) -> Tuple[List[Turn], ConversationRollup]:
+        """
+        Consistent copy of the window and rollup for one pipeline run.
+        """
+
+        with self._lock:
+            return list(self.turns), self.rollup.copy()
+
+
+# -------------------------------------------------------------------
+# Merge Helpers
+# -------------------------------------------------------------------
+
+def merge_entities(
+    window_entities: Dict[str, List[str]],
+    rollup: ConversationRollup
+) -> Dict[str, List[str]]:
+    """
+    Union of rollup and window entities, older first, without duplicates.
+    """
+
+    merged = {}
+    for field in ENTITY_FIELDS:
+        values = dict(rollup.entities[field])
+        for value in window_entities.get(field, []):
+            values[value] = None
+        merged[field] = list(values)
+
+    return merged
+
+
+def merge_keywords(
+    window_keywords: List[str],
+    rollup: ConversationRollup,
+    max_keywords: int
+) -> List[str]:
+    """
+    Window keywords first, then the most frequent folded keywords.
+    """
+
+    merged = dict.fromkeys(window_keywords)
+    for keyword, _ in rollup.keyword_counts.most_common():
+        if len(merged) >= max_keywords:
+            break
+        merged.setdefault(keyword, None)
+
+    return list(merged)[:max_keywords]
@@ -0,0 +1,314 @@
+"""
+On-disk cache of parsed transcripts (spaCy DocBin shards)
+
+Re-running an archive after a rule-table change (the rules file,
+see nlp/rules.py, or the SOAP helpers) needs only matcher and rule time,
+not another pass of the tagger and parser. `build` parses each
+conversation's transcript once and stores two Docs per transcript
+(as-is for NER, lowercased for keywords); `reanalyze` streams the
+shards through run_nlp_pipeline_on_docs.
+
+Layout:
+    DOC_CACHE_DIR/<model fingerprint>/shard-00000.spacy
+    DOC_CACHE_DIR/<model fingerprint>/index.jsonl  (keys per shard)
+
+Entries are keyed by the SHA-256 of the transcript, so a rebuild
+parses only transcripts that are new; a different model (name,
+version, spaCy version or components) gets its own directory.
+
+Usage:
+    python -m nlp.doc_cache build data/transcripts exports/dictations.txt
+    python -m nlp.doc_cache reanalyze --out reanalysis.jsonl
+
+Python version: 3.13.5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+
+from config import DOC_CACHE_BATCH_SIZE, DOC_CACHE_DIR, DOC_CACHE_SHARD_SIZE
+from nlp.model_loader import load_spacy_model
+from nlp.pipeline import run_nlp_pipeline_on_docs
+from nlp.preprocessing import (
+    build_transcript_string,
+    extract_patient_sentences,
+    iter_conversations
+)
+
+
+INDEX_FILE = "index.jsonl"
+SHARD_NAME = "shard-{:05d}.spacy"
+
+
+def model_fingerprint(nlp: Language) -> str:
+    """
+    Directory name identifying the model whose analyses are cached.
+    """
+
+    meta = nlp.meta
+    identity = json.dumps([
+        meta.get("lang"), meta.get("name"), meta.get("version"),
+        spacy.__version__, nlp.pipe_names
+    ])
+    digest = hashlib.sha1(identity.encode("utf-8")).hexdigest()[:12]
+
+    return f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}-{digest}"
+
+
+def transcript_key(transcript: str) -> str:
+    return hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------------------------
+# Cache
+# -------------------------------------------------------------------
+
+class DocCache:
+    """
+    DocBin shards of parsed transcripts for one model.
+    """
+
+    def __init__(self, directory: Path = DOC_CACHE_DIR, nlp: Optional[Language] = None):
+        self.nlp = nlp or load_spacy_model()
+        self.directory = Path(directory) / model_fingerprint(self.nlp)
+
+        self.shards: List[str] = []
+        self.index: Dict[str, str] = {}  # transcript key -> shard name
+
+        index_path = self.directory / INDEX_FILE
+        if index_path.exists():
+            with index_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.shards.append(entry["shard"])
+                    self.index.update(dict.fromkeys(entry["keys"], entry["shard"]))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # ---------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------
+
+    def build(
+        self,
+        conversations: Iterable[Tuple[str, List]],
+        shard_size: int = DOC_CACHE_SHARD_SIZE,
+        batch_size: int = DOC_CACHE_BATCH_SIZE,
+        n_process: int = 1
+    ) -> int:
+        """
+        Parse and store every (conversation_id, turns) whose transcript
+        is not cached yet. Returns transcripts added.
+        """
+
+        pending = self._uncached(conversations)
+        added = 0
+
+        while True:
+            batch = list(islice(pending, shard_size))
+            if not batch:
+                return added
+
+            self._write_shard(batch, batch_size, n_process)
+            added += len(batch)
+
+    def _uncached(
+        self,
+        conversations: Iterable[Tuple[str, List]]
+    ) -> Iterator[Tuple[Dict, str]]:
+        queued = set()
+
+        for conversation_id, turns in conversations:
+            transcript = build_transcript_string(turns)
+            key = transcript_key(transcript)
+
+            if key in self.index or key in queued:
+                continue
+            queued.add(key)
+
+            yield {
+                "key": key,
+                "id": str(conversation_id),
+                "patient_text": extract_patient_sentences(turns)
+            }, transcript
+
+    def _write_shard(
+        self,
+        batch: List[Tuple[Dict, str]],
+        batch_size: int,
+        n_process: int
+    ) -> None:
+        texts = []
+        for _, transcript in batch:
+            texts.extend((transcript, transcript.lower()))
+
+        doc_bin = DocBin(store_user_data=True)
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+
+        for i, doc in enumerate(docs):
+            if i % 2 == 0:
+                doc.user_data.update(batch[i // 2][0])
+            doc_bin.add(doc)
+
+        # Shard first, then its index line: an interrupted build leaves
+        # an unindexed file that the next build overwrites
+        name = SHARD_NAME.format(len(self.shards))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{name}.tmp"
+        tmp_path.write_bytes(doc_bin.to_bytes())
+        os.replace(tmp_path, self.directory / name)
+
+        keys = [metadata["key"] for metadata, _ in batch]
+        with (self.directory / INDEX_FILE).open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"shard": name, "keys": keys}) + "\n")
+
+        self.shards.append(name)
+        self.index.update(dict.fromkeys(keys, name))
+
+    # ---------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------
+
+    def _read_shard(self, name: str) -> Iterator[Tuple[Dict, Doc, Doc]]:
+        doc_bin = DocBin(store_user_data=True).from_disk(self.directory / name)
+        docs = doc_bin.get_docs(self.nlp.vocab)
+
+        # Docs are stored in pairs: transcript, then lowercased transcript
+        for doc in docs:
+            yield dict(doc.user_data), doc, next(docs)
+
+    def iter_entries(self) -> Iterator[Tuple[Dict, Doc, Doc]]:
+        """
+        (metadata, transcript Doc, lowercased Doc) for every cached
+        transcript, one shard in memory at a time.
+        """
+
+        for name in self.shards:
+            yield from self._read_shard(name)
+
+    def get(self, key: str) -> Optional[Tuple[Doc, Doc]]:
+        """
+        Docs of one transcript (loads its whole shard).
+        """
+
+        if key not in self.index:
+            return None
+
+        for metadata, doc, lowered in self._read_shard(self.index[key]):
+            if metadata["key"] == key:
+                return doc, lowered
+
+        return None
+
+
+def reanalyze(cache: DocCache) -> Iterator[Tuple[str, Dict]]:
+    """
+    Run the current rules over every cached transcript without
+    re-parsing. Yields (conversation_id, NLP output).
+    """
+
+    for metadata, doc, lowered in cache.iter_entries():
+        yield metadata["id"], run_nlp_pipeline_on_docs(
+            doc, lowered, metadata["patient_text"]
+        )
+
+
+# -------------------------------------------------------------------
+# Corpus Reading
+# -------------------------------------------------------------------
+
+def iter_corpus(paths: Iterable[Path]) -> Iterator[Tuple[str, List]]:
+    """
+    (conversation_id, turns) from transcript exports (.txt), gold
+    corpora (.jsonl) and conversation logs (.json), files or
+    directories.
+    """
+
+    from utils.evaluation import load_gold_corpus
+
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+
+        for file in files:
+            if file.suffix == ".txt":
+                for conversation_id, turns in iter_conversations(file):
+                    yield f"{file.stem}/{conversation_id}", turns
+
+            elif file.suffix == ".jsonl":
+                for record in load_gold_corpus(file):
+                    yield f"{file.stem}/{record['id']}", record["conversation"]
+
+            elif file.suffix == ".json":
+                with file.open("r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, list) and entries:
+                    yield file.stem, entries
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Parsed transcript cache")
+    parser.add_argument("--cache-dir", type=Path, default=DOC_CACHE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Parse and cache transcripts")
+    build.add_argument("corpus", nargs="+", help="Transcript files or directories")
+    build.add_argument("--processes", type=int, default=1)
+
+    rerun = commands.add_parser("reanalyze", help="Re-run rules over cached Docs")
+    rerun.add_argument("--out", type=Path, help="JSONL output (default: stdout)")
+
+    args = parser.parse_args(argv)
+    cache = DocCache(args.cache_dir)
+    start = time.perf_counter()
+
+    if args.command == "build":
+        added = cache.build(iter_corpus(args.corpus), n_process=args.processes)
+        print(
+            f"Cached {added} new transcripts ({len(cache)} total) in "
+            f"{time.perf_counter() - start:.1f}s at {cache.directory}"
+        )
+        return 0
+
+    from utils.serialization import dumps
+
+    out = args.out.open("w", encoding="utf-8") if args.out else sys.stdout
+    count = 0
+
+    try:
+        for conversation_id, output in reanalyze(cache):
+            out.write(dumps({"id": conversation_id, **output}) + "\n")
+            count += 1
+    finally:
+        if args.out:
+            out.close()
+
+    print(
+        f"Re-analyzed {count} transcripts in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
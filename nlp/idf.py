@@ -0,0 +1,214 @@
+"""
+IDF table for corpus-level TF-IDF keyword ranking
+
+The table is precomputed offline over the transcript corpus and
+stored as:
+- idf_vocab.json: term list (index = row in the value array) + metadata
+- idf_values.npy: float32 IDF values, loaded memory-mapped
+
+At request time only the pages for looked-up terms are touched,
+and candidate phrases are scored with one vectorized operation,
+so ranking stays cheap even with a 100k-term vocabulary.
+
+Build:
+    python -m nlp.idf data/transcripts data/conversation_log.json
+
+Python version: 3.13.5
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from config import KEYWORD_IDF_DIR
+
+
+VOCAB_FILE = "idf_vocab.json"
+VALUES_FILE = "idf_values.npy"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+SPEAKER_PREFIX = re.compile(r"^\s*(physician|patient)\s*:", re.IGNORECASE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens; shared by the builder and the scorer.
+    """
+
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+# -------------------------------------------------------------------
+# IDF Table
+# -------------------------------------------------------------------
+
+class IdfTable:
+    """
+    Memory-mapped IDF lookup with vectorized phrase scoring.
+    """
+
+    def __init__(self, vocab: Sequence[str], values: np.ndarray):
+        self.index: Dict[str, int] = {term: i for i, term in enumerate(vocab)}
+        self.values = values
+
+        # Unseen terms are treated as rarer than anything in the corpus
+        self.unseen_idf = float(values.max()) if len(values) else 1.0
+
+    @classmethod
+    def load(cls, directory: Path = KEYWORD_IDF_DIR) -> "IdfTable":
+        with (directory / VOCAB_FILE).open("r", encoding="utf-8") as f:
+            vocab = json.load(f)["terms"]
+
+        values = np.load(directory / VALUES_FILE, mmap_mode="r")
+        return cls(vocab, values)
+
+    def score(self, phrases: Sequence[str], counts: Sequence[int]) -> np.ndarray:
+        """
+        TF-IDF score per phrase: term frequency in the document times
+        the mean IDF of the phrase's tokens.
+        """
+
+        phrase_ids = []
+        term_ids = []
+
+        for phrase_id, phrase in enumerate(phrases):
+            for token in tokenize(phrase):
+                phrase_ids.append(phrase_id)
+                term_ids.append(self.index.get(token, -1))
+
+        if not term_ids:
+            return np.zeros(len(phrases), dtype=np.float32)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        phrase_ids = np.asarray(phrase_ids, dtype=np.int64)
+
+        known = term_ids >= 0
+        idf = np.full(len(term_ids), self.unseen_idf, dtype=np.float32)
+        idf[known] = self.values[term_ids[known]]
+
+        totals = np.bincount(phrase_ids, weights=idf, minlength=len(phrases))
+        lengths = np.bincount(phrase_ids, minlength=len(phrases))
+
+        mean_idf = np.divide(
+            totals, lengths, out=np.zeros_like(totals), where=lengths > 0
+        )
+
+        return mean_idf * np.asarray(counts, dtype=np.float64)
+
+    def rank(self, counts: Dict[str, int]) -> List[str]:
+        """
+        Order candidate phrases by descending TF-IDF (ties alphabetical).
+        """
+
+        phrases = sorted(counts)
+        scores = self.score(phrases, [counts[p] for p in phrases])
+
+        # lexsort: last key is primary; stable alphabetical tie-break
+        order = np.lexsort((np.arange(len(phrases)), -scores))
+        return [phrases[i] for i in order]
+
+
+@lru_cache(maxsize=1)
+def get_idf_table(directory: Path = KEYWORD_IDF_DIR) -> Optional[IdfTable]:
+    """
+    Load the precomputed table once; None if it has not been built.
+    """
+
+    if not (directory / VOCAB_FILE).exists() or not (directory / VALUES_FILE).exists():
+        return None
+
+    return IdfTable.load(directory)
+
+
+# -------------------------------------------------------------------
+# Offline Builder
+# -------------------------------------------------------------------
+
+def build_idf_table(documents: Iterable[str], output_dir: Path) -> int:
+    """
+    Compute smoothed IDF over documents and write the table.
+
+    idf(t) = ln((1 + N) / (1 + df(t))) + 1
+
+    Returns:
+        int: Vocabulary size
+    """
+
+    document_frequency: Counter = Counter()
+    total_documents = 0
+
+    for document in documents:
+        document_frequency.update(set(tokenize(document)))
+        total_documents += 1
+
+    terms = sorted(document_frequency)
+    values = np.array(
+        [
+            math.log((1 + total_documents) / (1 + document_frequency[t])) + 1
+            for t in terms
+        ],
+        dtype=np.float32
+    )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with (output_dir / VOCAB_FILE).open("w", encoding="utf-8") as f:
+        json.dump({"documents": total_documents, "terms": terms}, f)
+
+    np.save(output_dir / VALUES_FILE, values)
+
+    get_idf_table.cache_clear()
+
+    return len(terms)
+
+
+def iter_corpus_documents(paths: Iterable[Path]) -> Iterable[str]:
+    """
+    Yield one document per conversation turn from .txt transcripts
+    and .json conversation logs (files or directories).
+    """
+
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+
+        for file in files:
+            if file.suffix == ".json":
+                with file.open("r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, list):
+                    for entry in entries:
+                        if isinstance(entry, dict) and entry.get("text"):
+                            yield entry["text"]
+
+            elif file.suffix == ".txt":
+                with file.open("r", encoding="utf-8") as f:
+                    for line in f:
+                        line = SPEAKER_PREFIX.sub("", line).strip()
+                        if line:
+                            yield line
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the keyword IDF table")
+    parser.add_argument("corpus", nargs="+", help="Transcript files or directories")
+    parser.add_argument("--out", default=str(KEYWORD_IDF_DIR))
+    args = parser.parse_args(argv)
+
+    size = build_idf_table(iter_corpus_documents(args.corpus), Path(args.out))
+    print(f"Wrote IDF table with {size} terms to {args.out}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,42 +5,51 @@ Extracts important medical keywords and key phrases
 from conversation transcripts.
 
 Approach:
-- spaCy noun chunks
-- Rule-based filtering for medical relevance
+- spaCy noun chunks (default), or
+- Token-pattern phrases over tagger output, which never runs
+  the dependency parser (KEYWORD_EXTRACTOR = "pos_patterns")
+- Rule-based filtering for medical relevance (vocabulary from the
+  reloadable rules file, see nlp/rules.py)
+- Corpus TF-IDF ranking (see nlp/idf.py)
 
 Python version: 3.13.5
 """
 
-from typing import List
-import spacy
+from collections import Counter
+from typing import Iterable, List
 
-# Load spaCy English model
-# Run once: python -m spacy download en_core_web_sm
-nlp = spacy.load("en_core_web_sm")
+from spacy.matcher import Matcher
+
+from config import KEYWORD_RANKING, KEYWORD_EXTRACTOR
+from nlp.idf import get_idf_table
+from nlp.rules import get_rules
+
+from nlp.model_loader import load_spacy_model
+
+# Shared spaCy English model (see nlp/model_loader.py)
+nlp = load_spacy_model()
+
+# Components not needed for POS-pattern extraction
+PARSER_FREE_DISABLED = [
+    name for name in ("parser", "ner", "lemmatizer")
+    if name in nlp.pipe_names
+]
 
 
 # -------------------------------------------------------------------
-# Medical Relevance Vocabulary
+# Noun Phrase Patterns (parser-free)
 # -------------------------------------------------------------------
 
-MEDICAL_KEY_TERMS = {
-    "pain",
-    "injury",
-    "accident",
-    "whiplash",
-    "physiotherapy",
-    "treatment",
-    "recovery",
-    "back",
-    "neck",
-    "head",
-    "spine",
-    "muscle",
-    "therapy",
-    "painkillers",
-    "analgesics",
-    "examination"
-}
+# Optional determiner/possessive, modifiers, then a noun head —
+# approximates noun chunks from tagger output alone
+NOUN_PHRASE_PATTERN = [
+    {"TAG": {"IN": ["DT", "PRP$"]}, "OP": "?"},
+    {"POS": {"IN": ["ADJ", "NOUN", "PROPN", "NUM"]}, "OP": "*"},
+    {"POS": {"IN": ["NOUN", "PROPN"]}}
+]
+
+noun_phrase_matcher = Matcher(nlp.vocab)
+noun_phrase_matcher.add("NOUN_PHRASE", [NOUN_PHRASE_PATTERN], greedy="LONGEST")
 
 
 # -------------------------------------------------------------------
@@ -59,36 +68,134 @@ def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
         List[str]: List of extracted keywords
     """
 
+    if KEYWORD_EXTRACTOR == "pos_patterns":
+        return extract_keywords_pos_patterns(text, max_keywords)
+
+    return extract_keywords_noun_chunks(text, max_keywords)
+
+
+def extract_keywords_noun_chunks(text: str, max_keywords: int = 10) -> List[str]:
+    """
+    Keyword extraction from dependency-parser noun chunks.
+    """
+
     if not text:
         return []
 
-    doc = nlp(text.lower())
+    return keywords_from_noun_chunks(nlp(text.lower()), max_keywords)
+
+
+def extract_keywords_pos_patterns(text: str, max_keywords: int = 10) -> List[str]:
+    """
+    Keyword extraction from POS token patterns; runs only the
+    tagger (no dependency parser, NER or lemmatizer).
+    """
+
+    if not text:
+        return []
+
+    doc = nlp(text.lower(), disable=PARSER_FREE_DISABLED)
+
+    return keywords_from_pos_patterns(doc, max_keywords)
+
+
+def parse_for_keywords(text: str):
+    """
+    Lowercased Doc for extract_keywords_from_doc, running only the
+    components the configured extractor reads.
+    """
+
+    if KEYWORD_EXTRACTOR == "pos_patterns":
+        return nlp(text.lower(), disable=PARSER_FREE_DISABLED)
+
+    return nlp(text.lower())
+
+
+def extract_keywords_from_doc(doc, max_keywords: int = 10) -> List[str]:
+    """
+    extract_keywords for an already-parsed, lowercased transcript Doc
+    (e.g. loaded from the DocBin cache); runs no pipeline components.
+    """
+
+    if KEYWORD_EXTRACTOR == "pos_patterns":
+        return keywords_from_pos_patterns(doc, max_keywords)
 
-    keywords = set()
+    return keywords_from_noun_chunks(doc, max_keywords)
 
+
+def keywords_from_noun_chunks(doc, max_keywords: int = 10) -> List[str]:
     # 1️⃣ Extract noun chunks
-    for chunk in doc.noun_chunks:
-        chunk_text = chunk.text.strip()
+    phrases = (chunk.text for chunk in doc.noun_chunks)
 
-        # Check if chunk contains medical terms
-        if any(term in chunk_text for term in MEDICAL_KEY_TERMS):
-            keywords.add(chunk_text)
+    return rank_keywords(count_candidates(phrases, doc), max_keywords)
 
-    # 2️⃣ Extract standalone medical tokens
-    for token in doc:
-        if token.text in MEDICAL_KEY_TERMS:
-            keywords.add(token.text)
 
-    # Normalize and limit output
-    normalized = normalize_keywords(list(keywords))
+def keywords_from_pos_patterns(doc, max_keywords: int = 10) -> List[str]:
+    # 1️⃣ Extract pattern-matched noun phrases
+    phrases = (
+        span.text
+        for span in noun_phrase_matcher(doc, as_spans=True)
+    )
 
-    return normalized[:max_keywords]
+    return rank_keywords(count_candidates(phrases, doc), max_keywords)
 
 
 # -------------------------------------------------------------------
 # Helper Functions
 # -------------------------------------------------------------------
 
+def count_candidates(phrases: Iterable[str], doc) -> Counter:
+    """
+    Count medically relevant phrases plus standalone medical tokens.
+    """
+
+    rules = get_rules()
+    keywords = Counter()
+
+    for phrase in phrases:
+        phrase = phrase.strip()
+
+        # Check if phrase contains medical terms
+        if rules.medical_term_pattern.search(phrase):
+            keywords[phrase] += 1
+
+    # 2️⃣ Extract standalone medical tokens
+    for token in doc:
+        if token.text in rules.medical_key_terms:
+            keywords[token.text] += 1
+
+    return keywords
+
+
+def rank_keywords(counts: Counter, max_keywords: int) -> List[str]:
+    """
+    Order candidate keywords and limit output.
+
+    Uses corpus TF-IDF when configured and the IDF table exists;
+    otherwise keeps the alphabetical order of normalize_keywords.
+    """
+
+    idf_table = get_idf_table() if KEYWORD_RANKING == "tfidf" else None
+
+    if idf_table is None or not counts:
+        return normalize_keywords(list(counts))[:max_keywords]
+
+    ranked = []
+    seen = set()
+
+    for kw in idf_table.rank(counts):
+        kw = kw.strip()
+        if len(kw) < 3 or kw.title() in seen:
+            continue
+        seen.add(kw.title())
+        ranked.append(kw.title())
+
+        if len(ranked) >= max_keywords:
+            break
+
+    return ranked
+
+
 def normalize_keywords(keywords: List[str]) -> List[str]:
     """
     Normalize keywords:
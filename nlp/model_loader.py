@@ -0,0 +1,28 @@
+"""
+Shared spaCy model loader for Physician Notetaker
+
+Every NLP module uses the same Language instance, so the model
+is loaded once per process. In multi-worker serving the master
+process loads it before forking and workers share its memory
+copy-on-write.
+
+Python version: 3.13.5
+"""
+
+from functools import lru_cache
+
+import spacy
+from spacy.language import Language
+
+from config import SPACY_MODEL
+
+
+@lru_cache(maxsize=None)
+def load_spacy_model(name: str = SPACY_MODEL) -> Language:
+    """
+    Load (once) and return the spaCy pipeline.
+
+    Run once: python -m spacy download en_core_web_sm
+    """
+
+    return spacy.load(name)
@@ -8,75 +8,22 @@ Extracts:
 - Treatment
 - Prognosis
 
-Uses spaCy with rule-based + pattern matching.
+Uses spaCy with rule-based + pattern matching. Phrase lists are
+loaded from the rules file and can be reloaded at runtime (see
+nlp/rules.py).
 Can be upgraded to BioBERT / ClinicalBERT later.
 
 Python version: 3.13.5
 """
 
 from typing import Dict, List
-import spacy
 from spacy.matcher import PhraseMatcher
 
-# Load spaCy English model
-# Run once: python -m spacy download en_core_web_sm
-nlp = spacy.load("en_core_web_sm")
+from nlp.model_loader import load_spacy_model
+from nlp.rules import get_rules
 
-
-# -------------------------------------------------------------------
-# Medical Phrase Lists (Rule-Based Seed)
-# -------------------------------------------------------------------
-
-SYMPTOM_TERMS = [
-    "neck pain",
-    "back pain",
-    "headache",
-    "backache",
-    "stiffness",
-    "discomfort",
-    "pain"
-]
-
-DIAGNOSIS_TERMS = [
-    "whiplash injury",
-    "whiplash",
-    "back strain",
-    "neck strain"
-]
-
-TREATMENT_TERMS = [
-    "physiotherapy",
-    "painkillers",
-    "analgesics",
-    "physical therapy",
-    "x-ray",
-    "x rays"
-]
-
-PROGNOSIS_TERMS = [
-    "full recovery",
-    "recover",
-    "improving",
-    "no long term damage",
-    "no lasting damage"
-]
-
-
-# -------------------------------------------------------------------
-# Matcher Setup
-# -------------------------------------------------------------------
-
-def build_matcher(terms: List[str]) -> PhraseMatcher:
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-    patterns = [nlp.make_doc(term) for term in terms]
-    matcher.add("MEDICAL_TERMS", patterns)
-    return matcher
-
-
-symptom_matcher = build_matcher(SYMPTOM_TERMS)
-diagnosis_matcher = build_matcher(DIAGNOSIS_TERMS)
-treatment_matcher = build_matcher(TREATMENT_TERMS)
-prognosis_matcher = build_matcher(PROGNOSIS_TERMS)
+# Shared spaCy English model (see nlp/model_loader.py)
+nlp = load_spacy_model()
 
 
 # -------------------------------------------------------------------
@@ -94,18 +41,18 @@ def extract_medical_entities(text: str) -> Dict[str, List[str]]:
         Dict[str, List[str]]: Medical entities
     """
 
-    doc = nlp(text)
+    return extract_medical_entities_from_doc(nlp(text))
 
-    symptoms = extract_entities(doc, symptom_matcher)
-    diagnosis = extract_entities(doc, diagnosis_matcher)
-    treatment = extract_entities(doc, treatment_matcher)
-    prognosis = extract_entities(doc, prognosis_matcher)
+
+def extract_medical_entities_from_doc(doc) -> Dict[str, List[str]]:
+    """
+    Matcher half of extract_medical_entities, for an already-parsed
+    transcript Doc (e.g. loaded from the DocBin cache).
+    """
 
     return {
-        "Symptoms": normalize_entities(symptoms),
-        "Diagnosis": normalize_entities(diagnosis),
-        "Treatment": normalize_entities(treatment),
-        "Prognosis": normalize_entities(prognosis)
+        field: normalize_entities(extract_entities(doc, matcher))
+        for field, matcher in get_rules().entity_matchers.items()
     }
 
 
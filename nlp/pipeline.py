@@ -7,6 +7,21 @@ Coordinates:
 - Sentiment & intent analysis
 - SOAP note generation
 
+A run is a graph of stages (see nlp/stage_graph.py):
+
+    transcript ─┬─ doc ────────── entities ─┬─ summary
+                ├─ lowered_doc ── keywords ─┘
+                │                 entities ──── soap
+    patient_text ── sentiment_intent
+
+Parsing for NER, the keyword parse and sentiment run concurrently;
+the transcript is parsed once for both summary and SOAP. Given
+cached Docs for doc and lowered_doc (run_nlp_pipeline_on_docs),
+the same graph runs without the tagger and parser.
+
+Each run pins one version of the rule tables (nlp/rules.py) from
+start to finish and reports it as "rules_version".
+
 Python Version: 3.13.5
 """
 
@@ -19,8 +34,114 @@ from nlp.preprocessing import (
 from nlp.summarization import generate_medical_summary
 from nlp.sentiment_intent import analyze_sentiment_and_intent
 from nlp.soap import generate_soap_note
+from nlp.ner import extract_medical_entities_from_doc
+from nlp.keywords import (
+    extract_keywords,
+    extract_keywords_from_doc,
+    parse_for_keywords
+)
+from nlp.context_window import (
+    ConversationRollup,
+    ConversationWindow,
+    merge_entities,
+    merge_keywords
+)
+from nlp.model_loader import load_spacy_model
+from nlp.rules import pinned_rules
+from nlp.stage_graph import Stage, StageGraph
+from config import MAX_KEYWORDS, PIPELINE_STAGE_TIMEOUTS
+from utils.memory import memory_profiler
+
+
+# -------------------------------------------------------------------
+# Stage Graphs
+# -------------------------------------------------------------------
+
+def pipeline_stage(name: str, func, *deps: str) -> Stage:
+    return Stage(name, func, deps, timeout=PIPELINE_STAGE_TIMEOUTS.get(name))
+
+
+def parse_transcript(transcript: str):
+    return load_spacy_model()(transcript)
+
+
+def window_entities(doc, rollup: ConversationRollup) -> Dict[str, List[str]]:
+    return merge_entities(extract_medical_entities_from_doc(doc), rollup)
+
+
+def window_keywords(transcript: str, rollup: ConversationRollup) -> List[str]:
+    return merge_keywords(extract_keywords(transcript), rollup, MAX_KEYWORDS)
 
 
+def window_sentiment_intent(patient_text: str, rollup: ConversationRollup) -> Dict:
+    """
+    Current window, else the most common folded tally.
+    """
+
+    if patient_text:
+        return analyze_sentiment_and_intent(patient_text)
+
+    if rollup.sentiment_counts:
+        return {
+            "Sentiment": rollup.sentiment_counts.most_common(1)[0][0],
+            "Intent": rollup.intent_counts.most_common(1)[0][0]
+        }
+
+    return analyze_sentiment_and_intent("")
+
+
+PIPELINE_GRAPH = StageGraph(
+    [
+        pipeline_stage("doc", parse_transcript, "transcript"),
+        pipeline_stage("entities", extract_medical_entities_from_doc, "doc"),
+        pipeline_stage("lowered_doc", parse_for_keywords, "transcript"),
+        pipeline_stage("keywords", extract_keywords_from_doc, "lowered_doc"),
+        pipeline_stage(
+            "summary", generate_medical_summary,
+            "transcript", "entities", "keywords"
+        ),
+        pipeline_stage(
+            "sentiment_intent", analyze_sentiment_and_intent, "patient_text"
+        ),
+        pipeline_stage("soap", generate_soap_note, "transcript", "entities")
+    ],
+    inputs=("transcript", "patient_text")
+)
+
+# Window analyzed in full and merged with the rollup; summary and
+# SOAP read the window transcript plus cues from folded turns
+WINDOWED_PIPELINE_GRAPH = StageGraph(
+    [
+        pipeline_stage("doc", parse_transcript, "window_transcript"),
+        pipeline_stage("entities", window_entities, "doc", "rollup"),
+        pipeline_stage("keywords", window_keywords, "window_transcript", "rollup"),
+        pipeline_stage(
+            "summary", generate_medical_summary,
+            "inference_transcript", "entities", "keywords"
+        ),
+        pipeline_stage(
+            "sentiment_intent", window_sentiment_intent, "patient_text", "rollup"
+        ),
+        pipeline_stage("soap", generate_soap_note, "inference_transcript", "entities")
+    ],
+    inputs=("window_transcript", "inference_transcript", "patient_text", "rollup")
+)
+
+
+def pipeline_output(results: Dict, rules_version: str) -> Dict:
+    return {
+        "summary": results["summary"],
+        "sentiment": results["sentiment_intent"]["Sentiment"],
+        "intent": results["sentiment_intent"]["Intent"],
+        "soap_note": results["soap"],
+        "rules_version": rules_version
+    }
+
+
+# -------------------------------------------------------------------
+# Pipelines
+# -------------------------------------------------------------------
+
 def run_nlp_pipeline(conversation: List[Dict]) -> Dict:
     """
     Run the complete NLP pipeline on the conversation history.
@@ -38,26 +159,92 @@ def run_nlp_pipeline(conversation: List[Dict]) -> Dict:
         - sentiment
         - intent
         - soap_note
+        - rules_version
+
+    Raises:
+        StageTimeout if a stage exceeds PIPELINE_STAGE_TIMEOUTS
     """
 
-    # 1️ Build transcript
-    full_transcript = build_transcript_string(conversation)
+    with pinned_rules() as rules:
+        # 1️ Build transcript + patient-only text
+        with memory_profiler.stage("preprocessing"):
+            full_transcript = build_transcript_string(conversation)
+            patient_text = extract_patient_sentences(conversation)
 
-    # 2️ Extract patient-only text
-    patient_text = extract_patient_sentences(conversation)
+        # 2️ Summary, sentiment & intent, SOAP note
+        results = PIPELINE_GRAPH.run({
+            "transcript": full_transcript,
+            "patient_text": patient_text
+        })
 
-    # 3️ Medical NLP summarization
-    summary = generate_medical_summary(full_transcript)
+        return pipeline_output(results, rules.version)
 
-    # 4️ Sentiment & intent analysis
-    sentiment_intent = analyze_sentiment_and_intent(patient_text)
 
-    # 5️ SOAP note generation
-    soap_note = generate_soap_note(full_transcript)
+def run_nlp_pipeline_on_docs(transcript_doc, lowered_doc, patient_text: str) -> Dict:
+    """
+    Same output as run_nlp_pipeline, from already-parsed Docs (see
+    nlp/doc_cache.py). Only matchers, keyword ranking and the rule
+    helpers run, so rule-table changes can be re-applied to an
+    archive without re-running the tagger and parser.
 
-    return {
-        "summary": summary,
-        "sentiment": sentiment_intent["Sentiment"],
-        "intent": sentiment_intent["Intent"],
-        "soap_note": soap_note
-    }
+    Args:
+        transcript_doc: nlp(build_transcript_string(conversation))
+        lowered_doc: nlp(the same transcript lowercased)
+        patient_text (str): extract_patient_sentences(conversation)
+
+    Returns:
+        Dict with the same keys as run_nlp_pipeline
+
+    Raises:
+        StageTimeout if a stage exceeds PIPELINE_STAGE_TIMEOUTS
+    """
+
+    with pinned_rules() as rules:
+        results = PIPELINE_GRAPH.run({
+            "transcript": transcript_doc.text,
+            "patient_text": patient_text,
+            "doc": transcript_doc,
+            "lowered_doc": lowered_doc
+        })
+
+        return pipeline_output(results, rules.version)
+
+
+def run_windowed_nlp_pipeline(window: ConversationWindow) -> Dict:
+    """
+    Run the pipeline on the recent-turn window plus the rollup of
+    older turns. Per-turn cost is bounded by the window size.
+
+    Args:
+        window (ConversationWindow): Recent turns + rollup
+
+    Returns:
+        Dict with the same keys as run_nlp_pipeline
+
+    Raises:
+        StageTimeout if a stage exceeds PIPELINE_STAGE_TIMEOUTS
+    """
+
+    with pinned_rules() as rules:
+        turns, rollup = window.snapshot()
+
+        # 1️ Build window transcript (+ cues from folded turns)
+        with memory_profiler.stage("preprocessing"):
+            window_transcript = build_transcript_string(turns)
+            patient_text = extract_patient_sentences(turns)
+
+            context_line = rollup.context_line()
+            inference_transcript = (
+                f"{window_transcript}\n{context_line}"
+                if context_line else window_transcript
+            )
+
+        # 2️ Summary, sentiment & intent, SOAP note
+        results = WINDOWED_PIPELINE_GRAPH.run({
+            "window_transcript": window_transcript,
+            "inference_transcript": inference_transcript,
+            "patient_text": patient_text,
+            "rollup": rollup
+        })
+
+        return pipeline_output(results, rules.version)
@@ -6,12 +6,46 @@ Handles:
 - Speaker separation
 - Missing / ambiguous data handling
 - Transcript formatting
+- Streaming ingestion of large transcript exports
 
 Python version: 3.13.5
 """
 
+import mmap
 import re
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from config import (
+    NORMALIZE_CHUNK_SIZE,
+    NORMALIZE_PARALLEL_MIN_BATCH,
+    NORMALIZE_WORKERS,
+    TRANSCRIPT_BOUNDARY_PATTERN,
+    TRANSCRIPT_ENCODING
+)
+from nlp.turns import Turn, turn_fields
+
+
+BOUNDARY_RE = re.compile(TRANSCRIPT_BOUNDARY_PATTERN, re.IGNORECASE)
+
+# Characters dropped by normalization (everything except word
+# characters, whitespace, "." and ","). NUL is kept so it can join a
+# batch into one string; inputs containing it take the per-text path.
+BATCH_SEPARATOR = "\x00"
+DISALLOWED_RE = re.compile(r"[^\w\s.,\x00]")
+DISALLOWED_ASCII = {
+    code: None
+    for code in range(128)
+    if DISALLOWED_RE.match(chr(code))
+}
+
+# Lowercased line prefix before the first ":" → role
+SPEAKER_PREFIXES = {
+    "physician": "Physician",
+    "patient": "Patient"
+}
 
 
 # -------------------------------------------------------------------
@@ -22,63 +56,155 @@ def normalize_text(text: str) -> str:
     """
     Normalize medical text by:
     - Lowercasing
-    - Removing extra whitespace
     - Standardizing punctuation
+    - Removing extra whitespace
     """
 
     if not text:
         return ""
 
     text = text.lower()
-    text = re.sub(r"\s+", " ", text)           # collapse whitespace
-    text = re.sub(r"[^\w\s.,]", "", text)      # keep basic punctuation
+    if text.isascii():
+        text = text.translate(DISALLOWED_ASCII)  # keep basic punctuation
+    else:
+        text = DISALLOWED_RE.sub("", text)
+    text = text.replace(BATCH_SEPARATOR, "")
 
-    return text.strip()
+    return " ".join(text.split())                # collapse whitespace
 
 
-def split_by_speaker(transcript: str) -> List[Dict]:
+def _normalize_chunk(texts: Sequence[str]) -> List[str]:
+    """
+    Normalize a chunk with one lower / translate call over the joined
+    ASCII texts instead of one per utterance; the rare non-ASCII texts
+    go through the regex one by one.
     """
-    Split raw transcript into speaker-tagged segments.
 
-    Expected format:
-        Physician: ...
-        Patient: ...
+    ascii_indices = [i for i, text in enumerate(texts) if text.isascii()]
+    ascii_texts = [texts[i] for i in ascii_indices]
+    joined = BATCH_SEPARATOR.join(ascii_texts)
+
+    if joined.count(BATCH_SEPARATOR) != len(ascii_texts) - 1:
+        return [normalize_text(text) for text in texts]
+
+    joined = joined.lower().translate(DISALLOWED_ASCII)
+
+    if len(ascii_texts) == len(texts):
+        return [" ".join(part.split()) for part in joined.split(BATCH_SEPARATOR)]
+
+    normalized = [None] * len(texts)
+    for i, part in zip(ascii_indices, joined.split(BATCH_SEPARATOR)):
+        normalized[i] = " ".join(part.split())
+
+    return [
+        normalize_text(texts[i]) if text is None else text
+        for i, text in enumerate(normalized)
+    ]
+
+
+def normalize_texts(
+    texts: Sequence[str],
+    workers: int = NORMALIZE_WORKERS
+) -> List[str]:
+    """
+    Batch form of normalize_text (same output, in order).
+
+    Batches of at least NORMALIZE_PARALLEL_MIN_BATCH are split into
+    chunks normalized on a thread pool when workers > 1; this only
+    pays off on a free-threaded (no-GIL) interpreter.
+    """
+
+    texts = [text or "" for text in texts]
+    if not texts:
+        return []
+
+    chunks = [
+        texts[offset:offset + NORMALIZE_CHUNK_SIZE]
+        for offset in range(0, len(texts), NORMALIZE_CHUNK_SIZE)
+    ]
+
+    if workers > 1 and len(texts) >= NORMALIZE_PARALLEL_MIN_BATCH:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_normalize_chunk, chunks)
+    else:
+        results = map(_normalize_chunk, chunks)
+
+    return [text for chunk in results for text in chunk]
+
+
+def classify_speaker(line: str) -> Tuple[str, str]:
+    """
+    Role and utterance of a stripped, non-empty line from its
+    "Physician:" / "Patient:" prefix (any case). Lines without one
+    are ambiguous and assigned to the patient.
+    """
+
+    prefix, colon, rest = line.partition(":")
+    role = SPEAKER_PREFIXES.get(prefix.lower()) if colon else None
+
+    if role is None:
+        return "Patient", line
+
+    return role, rest
+
+
+def parse_speaker_line(line: str) -> Optional[Dict]:
+    """
+    Turn one transcript line into a speaker-tagged segment.
 
     Returns:
-        List of dicts with 'role' and 'text'
+        Dict with 'role' and 'text', or None for a blank line
     """
 
-    conversation = []
+    line = line.strip()
+    if not line:
+        return None
+
+    role, text = classify_speaker(line)
+    return {"role": role, "text": normalize_text(text)}
+
+
+def split_speaker_lines(
+    lines: Iterable[str],
+    workers: int = NORMALIZE_WORKERS
+) -> List[Dict]:
+    """
+    Batch form of parse_speaker_line: classify every line in one pass,
+    then normalize all utterances together.
+    """
+
+    roles = []
+    texts = []
 
-    lines = transcript.split("\n")
     for line in lines:
         line = line.strip()
-        if not line:
-            continue
+        if line:
+            role, text = classify_speaker(line)
+            roles.append(role)
+            texts.append(text)
+
+    return [
+        {"role": role, "text": text}
+        for role, text in zip(roles, normalize_texts(texts, workers=workers))
+    ]
 
-        if line.lower().startswith("physician:"):
-            conversation.append({
-                "role": "Physician",
-                "text": normalize_text(line.replace("Physician:", "", 1))
-            })
 
-        elif line.lower().startswith("patient:"):
-            conversation.append({
-                "role": "Patient",
-                "text": normalize_text(line.replace("Patient:", "", 1))
-            })
+def split_by_speaker(transcript: str) -> List[Dict]:
+    """
+    Split raw transcript into speaker-tagged segments.
 
-        else:
-            # Ambiguous speaker — assign to patient by default
-            conversation.append({
-                "role": "Patient",
-                "text": normalize_text(line)
-            })
+    Expected format:
+        Physician: ...
+        Patient: ...
 
-    return conversation
+    Returns:
+        List of dicts with 'role' and 'text'
+    """
+
+    return split_speaker_lines(transcript.split("\n"))
 
 
-def extract_patient_sentences(conversation: List[Dict]) -> str:
+def extract_patient_sentences(conversation: List[Union[Turn, Dict]]) -> str:
     """
     Extract only patient utterances.
 
@@ -88,15 +214,15 @@ def extract_patient_sentences(conversation: List[Dict]) -> str:
     """
 
     patient_text = [
-        entry["text"]
-        for entry in conversation
-        if entry.get("role") == "Patient"
+        text
+        for role, text in map(turn_fields, conversation)
+        if role == "Patient"
     ]
 
     return " ".join(patient_text)
 
 
-def extract_physician_sentences(conversation: List[Dict]) -> str:
+def extract_physician_sentences(conversation: List[Union[Turn, Dict]]) -> str:
     """
     Extract physician utterances.
 
@@ -106,9 +232,9 @@ def extract_physician_sentences(conversation: List[Dict]) -> str:
     """
 
     physician_text = [
-        entry["text"]
-        for entry in conversation
-        if entry.get("role") == "Physician"
+        text
+        for role, text in map(turn_fields, conversation)
+        if role == "Physician"
     ]
 
     return " ".join(physician_text)
@@ -161,13 +287,100 @@ def resolve_ambiguity(entity_list: List[str]) -> List[str]:
 # Formatting Helpers
 # -------------------------------------------------------------------
 
-def build_transcript_string(conversation: List[Dict]) -> str:
+def build_transcript_string(conversation: List[Union[Turn, Dict]]) -> str:
     """
-    Convert conversation list into formatted transcript string.
+    Convert conversation list (Turns or dicts) into formatted
+    transcript string.
     """
 
     lines = [
-        f'{entry["role"]}: {entry["text"]}'
-        for entry in conversation
+        f"{role}: {text}"
+        for role, text in map(turn_fields, conversation)
     ]
-    return "\n".join(lines)
\ No newline at end of file
+    return "\n".join(lines)
+
+
+# -------------------------------------------------------------------
+# Streaming Ingestion
+# -------------------------------------------------------------------
+
+def iter_file_lines(path: Path, use_mmap: bool = True) -> Iterator[str]:
+    """
+    Lines of a transcript file, decoded one at a time.
+
+    With mmap the OS pages the file in and out on demand, so resident
+    memory does not grow with file size; empty files (which cannot be
+    mapped) and use_mmap=False fall back to buffered reads.
+    """
+
+    with open(path, "rb") as f:
+        if use_mmap and Path(path).stat().st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from _decode_lines(iter(mapped.readline, b""))
+        else:
+            yield from _decode_lines(f)
+
+
+def _decode_lines(raw_lines: Iterable[bytes]) -> Iterator[str]:
+    first = True
+
+    for raw in raw_lines:
+        line = raw.decode(TRANSCRIPT_ENCODING, errors="replace")
+
+        if first:
+            line = line.lstrip("\ufeff")  # byte order mark
+            first = False
+
+        yield line
+
+
+def stream_turns(lines: Iterable[str]) -> Iterator[Tuple[str, Dict]]:
+    """
+    Lazily split transcript lines into (conversation_id, turn) pairs.
+
+    A line matching TRANSCRIPT_BOUNDARY_PATTERN ends the current
+    conversation. Header ids ("Session: 1234") are kept; otherwise
+    conversations are numbered conversation-0, conversation-1, ...
+    Speaker prefixes and ambiguous lines are handled as in
+    split_by_speaker.
+    """
+
+    conversation_id = None
+    pending_id = None
+    count = 0
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        boundary = BOUNDARY_RE.match(stripped)
+        if boundary:
+            conversation_id = None
+            if boundary.group("id"):
+                pending_id = boundary.group("id").strip()
+            continue
+
+        if conversation_id is None:
+            conversation_id = pending_id or f"conversation-{count}"
+            pending_id = None
+            count += 1
+
+        yield conversation_id, parse_speaker_line(stripped)
+
+
+def iter_conversations(
+    path: Path,
+    use_mmap: bool = True
+) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Conversations of a transcript export, one at a time.
+
+    Only the current conversation is held in memory. The output feeds
+    SQLiteStorage.import_conversations directly.
+    """
+
+    turns = stream_turns(iter_file_lines(path, use_mmap=use_mmap))
+
+    for conversation_id, group in groupby(turns, key=lambda pair: pair[0]):
+        yield conversation_id, [turn for _, turn in group]
@@ -0,0 +1,316 @@
+"""
+Hot-reloadable rule and lexicon tables for Physician Notetaker
+
+The NER phrase lists, the medical keyword vocabulary and the
+sentiment / intent keyword sets are read from a versioned JSON file
+(RULES_PATH) and compiled into an immutable RuleSet: PhraseMatchers,
+a single-pass keyword regex and frozensets.
+
+Reloading builds a complete new RuleSet and replaces the active one
+with a single assignment:
+- A pipeline run pins the RuleSet it started with (pinned_rules) and
+  finishes on it, even if a reload lands mid-run
+- A file that fails to parse or validate leaves the active rules in
+  place
+- Workers pick up a changed file within RULES_CHECK_SECONDS, or
+  immediately through POST /admin/rules/reload; either way the
+  rebuild runs on a background thread
+
+Validate a rules file before deploying it:
+    python -m nlp.rules data/rules/rules.json
+
+Python version: 3.13.5
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+
+from config import INTENT_LABELS, RULES_CHECK_SECONDS, RULES_PATH, SENTIMENT_LABELS
+from nlp.model_loader import load_spacy_model
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+ENTITY_FIELDS = ("Symptoms", "Diagnosis", "Treatment", "Prognosis")
+
+# Versions end up in ETags, so keep them to token characters
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+# -------------------------------------------------------------------
+# Compiled Rules
+# -------------------------------------------------------------------
+
+class RuleSet:
+    """
+    One compiled, read-only version of the rule tables.
+    """
+
+    def __init__(self, version: str, tables: Dict, nlp: Language):
+        self.version = version
+        self.tables = tables
+
+        self.entity_matchers: Dict[str, PhraseMatcher] = {
+            field: build_phrase_matcher(nlp, tables["ner"][field])
+            for field in ENTITY_FIELDS
+        }
+
+        self.medical_key_terms: FrozenSet[str] = frozenset(tables["medical_key_terms"])
+
+        # Single-pass substring check for all medical terms (longest first)
+        self.medical_term_pattern = re.compile(
+            "|".join(
+                re.escape(term)
+                for term in sorted(self.medical_key_terms, key=len, reverse=True)
+            )
+        )
+
+        self.sentiment_keywords: Dict[str, FrozenSet[str]] = {
+            label: frozenset(words)
+            for label, words in tables["sentiment"].items()
+        }
+
+        # Checked in file order; the first matching intent wins
+        self.intent_keywords: Dict[str, FrozenSet[str]] = {
+            intent: frozenset(words)
+            for intent, words in tables["intent"].items()
+        }
+
+
+def build_phrase_matcher(nlp: Language, terms: List[str]) -> PhraseMatcher:
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    matcher.add("MEDICAL_TERMS", list(nlp.tokenizer.pipe(terms)))
+    return matcher
+
+
+def validate_rule_tables(tables: Dict) -> None:
+    """
+    Raise ValueError describing the first problem in a rules file.
+    """
+
+    def check_terms(name: str, terms) -> None:
+        if (
+            not isinstance(terms, list) or not terms
+            or not all(isinstance(t, str) and t.strip() for t in terms)
+        ):
+            raise ValueError(f"{name} must be a non-empty list of strings")
+
+    if not isinstance(tables, dict):
+        raise ValueError("Rules file must contain a JSON object")
+
+    version = tables.get("version")
+    if version is not None and not VERSION_PATTERN.match(str(version)):
+        raise ValueError(f"Invalid rules version: {version!r}")
+
+    for section in ("ner", "sentiment", "intent"):
+        if not isinstance(tables.get(section), dict):
+            raise ValueError(f"Missing section: {section}")
+
+    for field in ENTITY_FIELDS:
+        check_terms(f"ner.{field}", tables["ner"].get(field))
+
+    check_terms("medical_key_terms", tables.get("medical_key_terms"))
+
+    for label in ("Anxious", "Reassured"):
+        check_terms(f"sentiment.{label}", tables["sentiment"].get(label))
+
+    for label, words in tables["sentiment"].items():
+        if label not in SENTIMENT_LABELS:
+            raise ValueError(f"Unknown sentiment label: {label}")
+        check_terms(f"sentiment.{label}", words)
+
+    for intent, words in tables["intent"].items():
+        if intent not in INTENT_LABELS:
+            raise ValueError(f"Unknown intent label: {intent}")
+        check_terms(f"intent.{intent}", words)
+
+
+def read_rule_tables(path: Path = RULES_PATH) -> Tuple[str, Dict]:
+    """
+    Read and validate a rules file without compiling it. The version
+    is the file's "version" field, or a content hash when it has none.
+
+    Returns:
+        (version, tables)
+    """
+
+    raw = Path(path).read_bytes()
+    tables = json.loads(raw)
+    validate_rule_tables(tables)
+
+    return str(tables.get("version") or hashlib.sha256(raw).hexdigest()[:12]), tables
+
+
+def load_rules(path: Path = RULES_PATH, nlp: Optional[Language] = None) -> RuleSet:
+    """
+    Read, validate and compile a rules file.
+    """
+
+    version, tables = read_rule_tables(path)
+
+    return RuleSet(version, tables, nlp or load_spacy_model())
+
+
+# -------------------------------------------------------------------
+# Active Rules & Reloading
+# -------------------------------------------------------------------
+
+def _file_state(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+_active: RuleSet = load_rules()
+_active_path = Path(RULES_PATH)
+_active_state = _file_state(RULES_PATH)
+_pinned: ContextVar[Optional[RuleSet]] = ContextVar("pinned_rules", default=None)
+
+_reload_lock = threading.Lock()
+_last_check = time.monotonic()
+
+
+def get_rules() -> RuleSet:
+    """
+    The RuleSet pinned for the current pipeline run, else the active one.
+    """
+
+    return _pinned.get() or _active
+
+
+@contextmanager
+def pinned_rules() -> Iterator[RuleSet]:
+    """
+    Pin the active RuleSet for one pipeline run; nested runs keep
+    the outer pin.
+    """
+
+    pinned = _pinned.get()
+    if pinned is not None:
+        yield pinned
+        return
+
+    check_for_update()
+
+    rules = _active
+    token = _pinned.set(rules)
+    try:
+        yield rules
+    finally:
+        _pinned.reset(token)
+
+
+def reload_rules(path: Path = RULES_PATH) -> Tuple[str, str]:
+    """
+    Build a RuleSet from `path` and make it active. Runs in the
+    calling thread; pipeline runs already in flight keep their pin.
+
+    Returns:
+        (previous version, new version)
+
+    Raises:
+        OSError / ValueError if the file cannot be read or is invalid
+        (the active rules are left unchanged)
+    """
+
+    global _active, _active_path, _active_state
+
+    with _reload_lock:
+        state = _file_state(path)
+        rules = load_rules(path)
+
+        previous = _active
+        _active = rules
+        _active_path = Path(path)
+        _active_state = state
+
+    logger.info(f"Rule tables reloaded: {previous.version} -> {rules.version}")
+
+    return previous.version, rules.version
+
+
+def check_for_update() -> bool:
+    """
+    At most every RULES_CHECK_SECONDS, stat the active rules file and
+    start a background reload if it changed. Returns True if one
+    started.
+    """
+
+    global _last_check
+
+    now = time.monotonic()
+    if RULES_CHECK_SECONDS <= 0 or now - _last_check < RULES_CHECK_SECONDS:
+        return False
+    _last_check = now
+
+    path = _active_path
+    state = _file_state(path)
+    if state is None or state == _active_state or _reload_lock.locked():
+        return False
+
+    start_reload(path)
+    return True
+
+
+def start_reload(path: Path = RULES_PATH) -> threading.Thread:
+    """
+    Run reload_rules(path) on a background thread, so the caller does
+    not wait for the matchers to compile. A failed build is logged
+    and leaves the active rules in place.
+    """
+
+    state = _file_state(path)
+
+    def background_reload():
+        global _active_state
+
+        try:
+            reload_rules(path)
+        except Exception:
+            logger.exception("Rule tables reload failed; keeping current rules")
+            # Do not retry the same broken file on every check
+            _active_state = state
+
+    thread = threading.Thread(target=background_reload, name="rules-reload", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Validate a rules file")
+    parser.add_argument("path", nargs="?", type=Path, default=RULES_PATH)
+    path = parser.parse_args(argv).path
+
+    try:
+        rules = load_rules(path)
+    except (OSError, ValueError) as exc:
+        print(f"Invalid rules file {path}: {exc}")
+        return 1
+
+    print(f"{path}: version {rules.version}")
+    for field in ENTITY_FIELDS:
+        print(f"  ner.{field}: {len(rules.tables['ner'][field])} terms")
+    print(f"  medical_key_terms: {len(rules.medical_key_terms)} terms")
+    print(f"  sentiment labels: {', '.join(rules.sentiment_keywords)}")
+    print(f"  intents: {', '.join(rules.intent_keywords)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,50 +6,22 @@ Detects:
 - Neutral reporting
 - Reassured emotional state
 
-Designed for:
-- Rule-based inference (current)
-- Transformer-based fine-tuning (future)
+Backends (SENTIMENT_BACKEND):
+- "keywords": rule-based inference over the rule tables
+- "transformer": quantized CPU classifier (see nlp/sentiment_model.py);
+  intent stays rule-based
 
 Python version: 3.13.5
 """
 
 from typing import Dict
 
+from config import SENTIMENT_BACKEND
+from nlp.rules import get_rules
 
-# -------------------------------------------------------------------
-# Keyword Sets (Lightweight Baseline)
-# -------------------------------------------------------------------
 
-ANXIOUS_KEYWORDS = {
-    "worried", "scared", "anxious", "concerned", "pain",
-    "afraid", "trouble", "difficulty"
-}
-
-REASSURED_KEYWORDS = {
-    "better", "relief", "fine", "okay", "good",
-    "improving", "recovered", "happy"
-}
-
-NEUTRAL_KEYWORDS = {
-    "had", "experienced", "noticed", "went",
-    "received", "took"
-}
-
-
-INTENT_KEYWORDS = {
-    "Seeking reassurance": {
-        "worried", "hope", "concerned", "afraid"
-    },
-    "Reporting symptoms": {
-        "pain", "hurt", "ache", "discomfort", "stiff"
-    },
-    "Expressing concern": {
-        "trouble", "difficulty", "problem"
-    },
-    "Reporting improvement": {
-        "better", "improving", "relief"
-    }
-}
+if SENTIMENT_BACKEND not in {"keywords", "transformer"}:
+    raise ValueError(f"Unknown SENTIMENT_BACKEND: {SENTIMENT_BACKEND}")
 
 
 # -------------------------------------------------------------------
@@ -71,7 +43,12 @@ def analyze_sentiment_and_intent(patient_text: str) -> Dict:
 
     text = patient_text.lower()
 
-    sentiment = detect_sentiment(text)
+    if SENTIMENT_BACKEND == "transformer":
+        from nlp.sentiment_model import classify_sentiment
+        sentiment = classify_sentiment(patient_text)
+    else:
+        sentiment = detect_sentiment(text)
+
     intent = detect_intent(text)
 
     return {
@@ -92,10 +69,12 @@ def detect_sentiment(text: str) -> str:
     - Reassured
     """
 
-    if any(word in text for word in ANXIOUS_KEYWORDS):
+    keywords = get_rules().sentiment_keywords
+
+    if any(word in text for word in keywords["Anxious"]):
         return "Anxious"
 
-    if any(word in text for word in REASSURED_KEYWORDS):
+    if any(word in text for word in keywords["Reassured"]):
         return "Reassured"
 
     return "Neutral"
@@ -110,7 +89,7 @@ def detect_intent(text: str) -> str:
     Identify patient intent based on keyword patterns.
     """
 
-    for intent, keywords in INTENT_KEYWORDS.items():
+    for intent, keywords in get_rules().intent_keywords.items():
         if any(word in text for word in keywords):
             return intent
 
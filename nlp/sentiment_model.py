@@ -0,0 +1,485 @@
+"""
+Transformer sentiment backend for Physician Notetaker
+
+CPU-only sequence classifier behind analyze_sentiment_and_intent
+(SENTIMENT_BACKEND = "transformer"):
+- Linear layers quantized to int8 at load time (dynamic quantization:
+  weights stored as int8, activations quantized per batch)
+- Intra-op thread count fixed per process (SENTIMENT_TORCH_THREADS)
+- A micro-batcher groups texts from concurrent requests into one
+  forward pass, up to SENTIMENT_BATCH_MAX_SIZE texts or
+  SENTIMENT_BATCH_MAX_WAIT_MS
+
+The model directory is a transformers save_pretrained() checkpoint
+whose id2label names are SENTIMENT_LABELS. torch and transformers are
+optional; they are only imported by this module.
+
+Create a randomly initialized checkpoint (tests, benchmarks):
+    python -m nlp.sentiment_model init-random /tmp/sentiment --layers 2
+
+Python version: 3.13.5
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from config import (
+    SENTIMENT_BATCH_MAX_SIZE,
+    SENTIMENT_BATCH_MAX_TOKENS,
+    SENTIMENT_BATCH_MAX_WAIT_MS,
+    SENTIMENT_BATCH_TIMEOUT_SECONDS,
+    SENTIMENT_LABELS,
+    SENTIMENT_MAX_LENGTH,
+    SENTIMENT_MODEL_PATH,
+    SENTIMENT_QUANTIZE,
+    SENTIMENT_TORCH_THREADS,
+    WEB_WORKERS
+)
+from utils.logger import get_logger
+
+try:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+except ImportError:  # optional dependency
+    torch = None
+
+logger = get_logger(__name__)
+
+# Texts share a forward pass only if padding stays below this fraction
+MAX_PADDING_FRACTION = 0.1
+
+
+# -------------------------------------------------------------------
+# Micro-batching
+# -------------------------------------------------------------------
+
+class MicroBatcher:
+    """
+    Collects single texts from many threads and runs them through
+    predict(texts) -> labels in batches on one background thread.
+
+    Callers wait at most `timeout` seconds for their result. If the
+    batch thread dies, the batch it held fails and a new thread
+    serves the rest of the queue.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[List[str]], List[str]],
+        max_batch_size: int = SENTIMENT_BATCH_MAX_SIZE,
+        max_wait_ms: float = SENTIMENT_BATCH_MAX_WAIT_MS,
+        timeout: float = SENTIMENT_BATCH_TIMEOUT_SECONDS
+    ):
+        self.predict = predict
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.timeout = timeout
+
+        self.batches = 0
+        self.items = 0
+        self.restarts = 0
+
+        self._queue: "queue.SimpleQueue[Optional[Tuple[str, Future]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((text, future))
+        return future
+
+    def __call__(self, text: str, timeout: Optional[float] = None) -> str:
+        """
+        Label for one text.
+
+        Raises:
+            concurrent.futures.TimeoutError after `timeout` seconds
+            (default: the batcher's timeout)
+        """
+
+        future = self.submit(text)
+
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            future.cancel()  # dropped from its batch if still queued
+            raise
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="sentiment-batcher", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        batch: List[Tuple[str, Future]] = []
+
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+
+                batch = [item]
+                deadline = time.monotonic() + self.max_wait
+                closing = False
+
+                while len(batch) < self.max_batch_size:
+                    try:
+                        remaining = deadline - time.monotonic()
+                        item = (
+                            self._queue.get(timeout=remaining) if remaining > 0
+                            else self._queue.get_nowait()
+                        )
+                    except queue.Empty:
+                        break
+
+                    if item is None:
+                        closing = True
+                        break
+                    batch.append(item)
+
+                self._run_batch(batch)
+                batch = []
+                if closing:
+                    return
+
+        except BaseException as exc:
+            logger.exception("Sentiment batcher thread failed; restarting it")
+            self._fail(batch, exc)
+
+            with self._lock:
+                self._thread = None
+                self.restarts += 1
+            self._ensure_started()
+
+    def _run_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        # Skip requests whose caller gave up while queued
+        batch = [(text, f) for text, f in batch if f.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            labels = self.predict([text for text, _ in batch])
+            if len(labels) != len(batch):
+                raise ValueError(
+                    f"predict returned {len(labels)} labels for {len(batch)} texts"
+                )
+        except Exception as exc:
+            self._fail(batch, exc)
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+
+        for (_, future), label in zip(batch, labels):
+            future.set_result(label)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[str, Future]], exc: BaseException) -> None:
+        if not isinstance(exc, Exception):
+            # Do not re-raise SystemExit & co. in the callers' threads
+            error = RuntimeError(f"Sentiment batcher failed: {exc!r}")
+            error.__cause__ = exc
+            exc = error
+
+        for _, future in batch:
+            if future.cancelled() or future.done():
+                continue
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(exc)
+
+    def _reset_in_child(self) -> None:
+        # The batcher thread does not survive fork(); queued requests
+        # belong to the parent
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Classifier
+# -------------------------------------------------------------------
+
+def require_torch() -> None:
+    if torch is None:
+        raise ImportError(
+            "SENTIMENT_BACKEND is 'transformer' but torch / transformers "
+            "are not installed"
+        )
+
+
+def default_thread_count() -> int:
+    if SENTIMENT_TORCH_THREADS > 0:
+        return SENTIMENT_TORCH_THREADS
+
+    return max(1, (os.cpu_count() or 1) // max(1, WEB_WORKERS))
+
+
+class SentimentClassifier:
+    """
+    Tokenizer + (quantized) sequence classification model on CPU.
+    """
+
+    def __init__(
+        self,
+        model_dir: Path = SENTIMENT_MODEL_PATH,
+        quantize: bool = SENTIMENT_QUANTIZE,
+        max_length: int = SENTIMENT_MAX_LENGTH,
+        threads: Optional[int] = None,
+        max_batch_tokens: int = SENTIMENT_BATCH_MAX_TOKENS
+    ):
+        require_torch()
+
+        self.model_dir = Path(model_dir)
+        self.max_length = max_length
+        self.max_batch_tokens = max_batch_tokens
+        self.threads = threads or default_thread_count()
+        self._threads_pid: Optional[int] = None
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        # Patient text grows with the visit; keep its most recent part
+        self.tokenizer.truncation_side = "left"
+
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_dir)
+        model.eval()
+
+        self.labels = [model.config.id2label[i] for i in range(model.config.num_labels)]
+        unknown = set(self.labels) - set(SENTIMENT_LABELS)
+        if unknown:
+            raise ValueError(
+                f"Model labels {sorted(unknown)} are not in SENTIMENT_LABELS"
+            )
+
+        if quantize:
+            select_quantized_engine()
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        self.model = model
+        self.quantized = quantize
+
+        logger.info(
+            f"Sentiment model loaded from {self.model_dir} "
+            f"(int8={quantize}, threads={self.threads})"
+        )
+
+    def predict(self, texts: List[str]) -> List[str]:
+        """
+        Labels for a batch of texts. Texts are sorted by token length
+        and split into forward passes of at most max_batch_tokens
+        padded tokens and MAX_PADDING_FRACTION padding; on CPU,
+        padding costs more than batching saves.
+        """
+
+        # Applied per process: forked workers start from the master's setting
+        if self._threads_pid != os.getpid():
+            torch.set_num_threads(self.threads)
+            self._threads_pid = os.getpid()
+
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        ids = encoded["input_ids"]
+        order = sorted(range(len(texts)), key=lambda i: len(ids[i]))
+        labels: List[Optional[str]] = [None] * len(texts)
+
+        start = 0
+        while start < len(order):
+            # Lengths ascend, so the last text of a chunk sets its padding
+            end = start + 1
+            tokens = len(ids[order[start]])
+            while end < len(order):
+                padded = len(ids[order[end]]) * (end - start + 1)
+                if (
+                    padded > self.max_batch_tokens
+                    or tokens + len(ids[order[end]]) < padded * (1 - MAX_PADDING_FRACTION)
+                ):
+                    break
+                tokens += len(ids[order[end]])
+                end += 1
+
+            chunk = order[start:end]
+            inputs = self.tokenizer.pad(
+                {"input_ids": [ids[i] for i in chunk]}, return_tensors="pt"
+            )
+
+            with torch.inference_mode():
+                logits = self.model(**inputs).logits
+
+            for i, label in zip(chunk, logits.argmax(dim=-1).tolist()):
+                labels[i] = self.labels[label]
+            start = end
+
+        return labels
+
+
+def select_quantized_engine() -> None:
+    """
+    fbgemm on x86, qnnpack on ARM.
+    """
+
+    engines = torch.backends.quantized.supported_engines
+    if "fbgemm" not in engines and "qnnpack" in engines:
+        torch.backends.quantized.engine = "qnnpack"
+
+
+# -------------------------------------------------------------------
+# Process-wide Backend
+# -------------------------------------------------------------------
+
+_classifier: Optional[SentimentClassifier] = None
+_batcher: Optional[MicroBatcher] = None
+_load_lock = threading.Lock()
+
+
+def get_sentiment_batcher() -> MicroBatcher:
+    """
+    Load (once) the classifier from SENTIMENT_MODEL_PATH and return
+    the shared batcher in front of it.
+    """
+
+    global _classifier, _batcher
+
+    if _batcher is None:
+        with _load_lock:
+            if _batcher is None:
+                _classifier = SentimentClassifier()
+                _batcher = MicroBatcher(_classifier.predict)
+
+    return _batcher
+
+
+def classify_sentiment(text: str) -> str:
+    """
+    Sentiment label for one patient text via the micro-batcher.
+    """
+
+    if not text.strip():
+        return "Neutral"
+
+    return get_sentiment_batcher()(text)
+
+
+def _reset_in_child() -> None:
+    global _load_lock
+
+    _load_lock = threading.Lock()
+    if _batcher is not None:
+        _batcher._reset_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_in_child)
+
+
+# -------------------------------------------------------------------
+# Random Checkpoints
+# -------------------------------------------------------------------
+
+def create_random_model(
+    directory: Path,
+    words: Iterable[str] = (),
+    hidden_size: int = 768,
+    layers: int = 6,
+    heads: int = 12,
+    seed: int = 0
+) -> Path:
+    """
+    Save a randomly initialized BERT classifier with SENTIMENT_LABELS
+    and a small WordPiece vocabulary (characters + `words`). Its
+    predictions are meaningless; its size and speed are not.
+    """
+
+    require_torch()
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    characters = [chr(c) for c in range(ord("a"), ord("z") + 1)] + list("0123456789.,'?!-")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab += characters + [f"##{c}" for c in characters]
+    vocab += sorted({w.lower() for w in words} - set(vocab))
+
+    vocab_file = directory / "vocab.txt"
+    vocab_file.write_text("\n".join(vocab) + "\n", encoding="utf-8")
+    BertTokenizerFast(vocab_file=str(vocab_file), do_lower_case=True).save_pretrained(directory)
+
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=hidden_size,
+        num_hidden_layers=layers,
+        num_attention_heads=heads,
+        intermediate_size=hidden_size * 4,
+        max_position_embeddings=max(512, SENTIMENT_MAX_LENGTH),
+        num_labels=len(SENTIMENT_LABELS),
+        id2label=dict(enumerate(SENTIMENT_LABELS)),
+        label2id={label: i for i, label in enumerate(SENTIMENT_LABELS)}
+    )
+    BertForSequenceClassification(config).save_pretrained(directory)
+
+    return directory
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Transformer sentiment backend")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init-random", help="Save a random checkpoint")
+    init.add_argument("directory", type=Path)
+    init.add_argument("--hidden-size", type=int, default=768)
+    init.add_argument("--layers", type=int, default=6)
+    init.add_argument("--heads", type=int, default=12)
+
+    predict = commands.add_parser("predict", help="Classify texts")
+    predict.add_argument("texts", nargs="+")
+    predict.add_argument("--model-dir", type=Path, default=SENTIMENT_MODEL_PATH)
+    predict.add_argument("--no-quantize", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "init-random":
+        from nlp.rules import get_rules
+
+        tables = get_rules().tables
+        words = " ".join(
+            term
+            for terms in (
+                *tables["ner"].values(), tables["medical_key_terms"],
+                *tables["sentiment"].values(), *tables["intent"].values()
+            )
+            for term in terms
+        ).split()
+        create_random_model(
+            args.directory, words, args.hidden_size, args.layers, args.heads
+        )
+        print(f"Random sentiment checkpoint written to {args.directory}")
+        return 0
+
+    classifier = SentimentClassifier(args.model_dir, quantize=not args.no_quantize)
+    for text, label in zip(args.texts, classifier.predict(args.texts)):
+        print(f"{label}\t{text}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
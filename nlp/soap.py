@@ -9,29 +9,45 @@ structured SOAP note with clinical readability.
 Python version: 3.13.5
 """
 
-from typing import Dict
+from typing import Dict, List, Optional
 
 from nlp.ner import extract_medical_entities
 from nlp.preprocessing import handle_missing_data
 
 
+# -------------------------------------------------------------------
+# Inference Cues
+# -------------------------------------------------------------------
+
+# Lowercase phrases checked against the transcript below
+ACCIDENT_CUE = "car accident"
+FULL_RANGE_CUES = ("full range of movement", "full range of motion")
+
+INFERENCE_CUES = (ACCIDENT_CUE, *FULL_RANGE_CUES)
+
+
 # -------------------------------------------------------------------
 # Core SOAP Generator
 # -------------------------------------------------------------------
 
-def generate_soap_note(transcript: str) -> Dict:
+def generate_soap_note(
+    transcript: str,
+    entities: Optional[Dict[str, List[str]]] = None
+) -> Dict:
     """
     Generate SOAP note from a medical transcript.
 
     Args:
         transcript (str): Full physician–patient conversation
+        entities (Dict, optional): Precomputed medical entities
 
     Returns:
         Dict: SOAP note in structured JSON format
     """
 
     # Extract medical entities
-    entities = extract_medical_entities(transcript)
+    if entities is None:
+        entities = extract_medical_entities(transcript)
 
     symptoms = entities.get("Symptoms", [])
     diagnosis = entities.get("Diagnosis", [])
@@ -78,7 +94,7 @@ def build_objective_section(transcript: str) -> Dict:
 
     text = transcript.lower()
 
-    if "full range of movement" in text or "full range of motion" in text:
+    if any(cue in text for cue in FULL_RANGE_CUES):
         physical_exam = (
             "Full range of motion in cervical and lumbar spine, "
             "no tenderness observed."
@@ -147,7 +163,7 @@ def infer_history_of_present_illness(transcript: str) -> str:
 
     text = transcript.lower()
 
-    if "car accident" in text:
+    if ACCIDENT_CUE in text:
         return (
             "Patient was involved in a car accident and experienced neck "
             "and back pain for several weeks, now reporting improvement "
@@ -0,0 +1,265 @@
+"""
+Dependency-graph executor for NLP pipeline stages
+
+A pipeline run is a small graph of named stages. Each stage is a
+function of the results it depends on:
+- Stages whose dependencies are met run concurrently on a shared
+  thread pool, so a run takes roughly as long as its slowest path
+  rather than the sum of all stages
+- Every stage runs exactly once per run, so intermediates shared
+  by several stages (the parsed Doc, the entities) are computed once
+- A stage may have a timeout, counted from the moment it becomes
+  ready; StageTimeout is raised if it has not finished by then
+  (the worker thread cannot be interrupted and finishes in the
+  background, its result discarded)
+
+A run may be given precomputed results for some stages (e.g. Docs
+loaded from a cache); those stages are skipped.
+
+Stages run in the caller's context (contextvars), so a run keeps
+the rule tables it pinned. Runs happen inline, in dependency order,
+while the memory profiler or a CPU profile is active, since both
+only observe the calling thread.
+
+Python version: 3.13.5
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from config import PIPELINE_STAGE_WORKERS
+from utils.memory import memory_profiler
+from utils.profiling import profiling_active
+
+
+class StageTimeout(Exception):
+    """
+    A stage did not finish within its timeout.
+    """
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' timed out after {timeout}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class Stage:
+    """
+    One named step: func(*results of deps) -> result.
+    """
+
+    __slots__ = ("name", "func", "deps", "timeout")
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        deps: Sequence[str] = (),
+        timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, deps={self.deps!r}, timeout={self.timeout!r})"
+
+
+# -------------------------------------------------------------------
+# Shared Executor
+# -------------------------------------------------------------------
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_stage_executor() -> Optional[ThreadPoolExecutor]:
+    """
+    Process-wide stage pool, created on first use. None when
+    PIPELINE_STAGE_WORKERS is 0 (stages run inline).
+    """
+
+    global _executor
+
+    if PIPELINE_STAGE_WORKERS <= 0:
+        return None
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=PIPELINE_STAGE_WORKERS,
+                    thread_name_prefix="nlp-stage"
+                )
+
+    return _executor
+
+
+def _reset_in_child() -> None:
+    # Pool threads do not survive fork(); the master runs the
+    # self-check before forking workers
+    global _executor, _executor_lock
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_in_child)
+
+
+# -------------------------------------------------------------------
+# Graph
+# -------------------------------------------------------------------
+
+class StageGraph:
+    """
+    Stages plus the input names they may depend on.
+    """
+
+    def __init__(self, stages: Iterable[Stage], inputs: Sequence[str] = ()):
+        self.inputs = tuple(inputs)
+        self.stages: Dict[str, Stage] = {}
+
+        for stage in stages:
+            if stage.name in self.stages or stage.name in self.inputs:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[Stage]:
+        order = []
+        done = set(self.inputs)
+        remaining = list(self.stages.values())
+
+        for stage in remaining:
+            for dep in stage.deps:
+                if dep not in done and dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown '{dep}'")
+
+        while remaining:
+            ready = [s for s in remaining if all(d in done for d in s.deps)]
+            if not ready:
+                names = ", ".join(s.name for s in remaining)
+                raise ValueError(f"Dependency cycle among stages: {names}")
+
+            order.extend(ready)
+            done.update(s.name for s in ready)
+            remaining = [s for s in remaining if s.name not in done]
+
+        return order
+
+    def run(
+        self,
+        inputs: Dict[str, Any],
+        executor: Optional[ThreadPoolExecutor] = None,
+        concurrent: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every stage once, except stages whose result is already
+        given in inputs (e.g. a cached Doc); dependents use that value.
+
+        Args:
+            inputs (Dict): Values for the graph's input names, plus
+                any precomputed stage results
+            executor: Pool for concurrent stages (default: shared pool)
+            concurrent (bool, optional): Force (True) or disable (False)
+                concurrent execution; default decides from the profilers
+
+        Returns:
+            Dict: inputs plus one result per stage name
+
+        Raises:
+            StageTimeout, or the first exception raised by a stage
+        """
+
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing graph inputs: {', '.join(missing)}")
+
+        if concurrent is None:
+            concurrent = not (memory_profiler.enabled or profiling_active())
+
+        executor = executor or (get_stage_executor() if concurrent else None)
+
+        if executor is None or not concurrent:
+            return self._run_inline(dict(inputs))
+
+        return self._run_concurrent(dict(inputs), executor)
+
+    # ---------------------------------------------------------------
+    # Execution
+    # ---------------------------------------------------------------
+
+    def _run_inline(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        for stage in self.order:
+            if stage.name in results:
+                continue
+
+            start = time.monotonic()
+            results[stage.name] = _call_stage(
+                stage, [results[dep] for dep in stage.deps]
+            )
+
+            if stage.timeout is not None and time.monotonic() - start > stage.timeout:
+                raise StageTimeout(stage.name, stage.timeout)
+
+        return results
+
+    def _run_concurrent(
+        self,
+        results: Dict[str, Any],
+        executor: ThreadPoolExecutor
+    ) -> Dict[str, Any]:
+        context = contextvars.copy_context()
+        waiting = [s for s in self.order if s.name not in results]
+        running: Dict[Future, Stage] = {}
+        deadlines: Dict[Future, float] = {}
+
+        try:
+            while waiting or running:
+                # Submit everything whose dependencies are available
+                for stage in [s for s in waiting if all(d in results for d in s.deps)]:
+                    waiting.remove(stage)
+                    future = executor.submit(
+                        context.copy().run, _call_stage, stage,
+                        [results[dep] for dep in stage.deps]
+                    )
+                    running[future] = stage
+                    if stage.timeout is not None:
+                        deadlines[future] = time.monotonic() + stage.timeout
+
+                timeout = None
+                if deadlines:
+                    timeout = max(0.0, min(deadlines.values()) - time.monotonic())
+
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    stage = running.pop(future)
+                    deadlines.pop(future, None)
+                    results[stage.name] = future.result()
+
+                now = time.monotonic()
+                for future, deadline in deadlines.items():
+                    if deadline <= now and not future.done():
+                        stage = running[future]
+                        raise StageTimeout(stage.name, stage.timeout)
+
+        finally:
+            # Stages not yet started are dropped on failure
+            for future in running:
+                future.cancel()
+
+        return results
+
+
+def _call_stage(stage: Stage, args: List[Any]) -> Any:
+    with memory_profiler.stage(stage.name):
+        return stage.func(*args)
@@ -11,30 +11,59 @@ Responsibilities:
 Python version: 3.13.5
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from nlp.ner import extract_medical_entities
 from nlp.keywords import extract_keywords
 from nlp.preprocessing import handle_missing_data
 
 
+# -------------------------------------------------------------------
+# Inference Cues
+# -------------------------------------------------------------------
+
+# Lowercase phrases checked by the infer_* helpers below
+PATIENT_NAME_CUE = "ms. jones"
+OCCASIONAL_CUE = "occasional"
+PAIN_CUE = "pain"
+IMPROVING_CUES = ("improving", "better")
+FULL_RECOVERY_CUE = "full recovery"
+NO_LONG_TERM_CUES = ("no long-term", "no lasting damage")
+
+INFERENCE_CUES = (
+    PATIENT_NAME_CUE,
+    OCCASIONAL_CUE,
+    PAIN_CUE,
+    *IMPROVING_CUES,
+    FULL_RECOVERY_CUE,
+    *NO_LONG_TERM_CUES
+)
+
+
 # -------------------------------------------------------------------
 # Core Summarization Function
 # -------------------------------------------------------------------
 
-def generate_medical_summary(transcript: str) -> Dict:
+def generate_medical_summary(
+    transcript: str,
+    entities: Optional[Dict[str, List[str]]] = None,
+    keywords: Optional[List[str]] = None
+) -> Dict:
     """
     Generate structured medical summary from transcript.
 
     Args:
         transcript (str): Full physician-patient conversation
+        entities (Dict, optional): Precomputed medical entities
+        keywords (List[str], optional): Precomputed keywords
 
     Returns:
         Dict: Structured medical summary in JSON format
     """
 
     # 1️⃣ Extract medical entities using NER
-    entities = extract_medical_entities(transcript)
+    if entities is None:
+        entities = extract_medical_entities(transcript)
 
     symptoms = entities.get("Symptoms", [])
     diagnosis = entities.get("Diagnosis", [])
@@ -42,7 +71,8 @@ def generate_medical_summary(transcript: str) -> Dict:
     prognosis = entities.get("Prognosis", [])
 
     # 2️⃣ Extract medical keywords
-    keywords = extract_keywords(transcript)
+    if keywords is None:
+        keywords = extract_keywords(transcript)
 
     # 3️⃣ Infer current status from symptoms / keywords
     current_status = infer_current_status(transcript)
@@ -73,7 +103,7 @@ def infer_patient_name(transcript: str) -> str:
     Otherwise return 'Unknown'.
     """
 
-    if "ms. jones" in transcript.lower():
+    if PATIENT_NAME_CUE in transcript.lower():
         return "Janet Jones"
 
     return "Unknown"
@@ -86,11 +116,11 @@ def infer_current_status(transcript: str) -> str:
 
     text = transcript.lower()
 
-    if "occasional" in text and "pain" in text:
+    if OCCASIONAL_CUE in text and PAIN_CUE in text:
         return "Occasional backache"
-    if "improving" in text or "better" in text:
+    if any(cue in text for cue in IMPROVING_CUES):
         return "Symptoms improving"
-    if "pain" in text:
+    if PAIN_CUE in text:
         return "Ongoing pain"
 
     return "Not mentioned"
@@ -103,9 +133,9 @@ def infer_prognosis(transcript: str) -> str:
 
     text = transcript.lower()
 
-    if "full recovery" in text:
+    if FULL_RECOVERY_CUE in text:
         return "Full recovery expected"
-    if "no long-term" in text or "no lasting damage" in text:
+    if any(cue in text for cue in NO_LONG_TERM_CUES):
         return "No long-term complications expected"
 
     return "Not mentioned"
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Compact in-memory conversation turns
+
+A Turn holds an enum-coded role, the utterance text and an integer
+UTC timestamp (microseconds since the epoch) in __slots__, instead of
+a dict with three string values. Conversations stay as Turn objects
+through the pipeline; JSON dicts are built only when a turn leaves
+the process (files, API responses).
+
+Python version: 3.13.5
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from enum import StrEnum
+from typing import Dict, Optional, Tuple, Union
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class Role(StrEnum):
+    """
+    Speaker of a turn. Members compare equal to their label
+    ("Patient", "Physician") and serialize as it.
+    """
+
+    PATIENT = "Patient"
+    PHYSICIAN = "Physician"
+
+
+class Turn:
+    """
+    One conversation turn (role, text, timestamp_us).
+    """
+
+    __slots__ = ("role", "text", "timestamp_us")
+
+    def __init__(self, role: Role, text: str, timestamp_us: int):
+        self.role = role
+        self.text = text
+        self.timestamp_us = timestamp_us
+
+    @classmethod
+    def now(cls, role: Union[Role, str], text: str) -> "Turn":
+        return cls(Role(role), text, time.time_ns() // 1000)
+
+    @classmethod
+    def from_dict(cls, entry: Dict) -> "Turn":
+        timestamp = entry.get("timestamp")
+
+        return cls(
+            Role(entry["role"]),
+            entry["text"],
+            parse_timestamp(timestamp) if timestamp else time.time_ns() // 1000
+        )
+
+    @property
+    def timestamp(self) -> str:
+        """
+        Naive UTC ISO-8601 string, as previously stored.
+        """
+        return format_timestamp(self.timestamp_us)
+
+    def to_dict(self) -> Dict:
+        return {
+            "role": self.role.value,
+            "text": self.text,
+            "timestamp": self.timestamp
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Turn):
+            return NotImplemented
+
+        return (
+            self.role is other.role
+            and self.text == other.text
+            and self.timestamp_us == other.timestamp_us
+        )
+
+    def __repr__(self) -> str:
+        return f"Turn({self.role.value!r}, {self.text!r}, {self.timestamp})"
+
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+def format_timestamp(timestamp_us: int) -> str:
+    return (EPOCH + timedelta(microseconds=timestamp_us)).isoformat()
+
+
+def parse_timestamp(timestamp: str) -> int:
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+    delta = moment - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def turn_fields(entry: Union[Turn, Dict]) -> Tuple[Optional[str], str]:
+    """
+    (role, text) of a Turn or a {"role", "text"} dict, so pipeline
+    helpers accept either form.
+    """
+
+    if isinstance(entry, Turn):
+        return entry.role, entry.text
+
+    return entry.get("role"), entry.get("text", "")
@@ -3,6 +3,13 @@ document.addEventListener("DOMContentLoaded", () => {
     const userInput = document.getElementById("userInput");
     const chatBox = document.getElementById("chatBox");
 
+    // Delta responses: the server sends only fields changed since
+    // the version we hold; anything else is resynced from a snapshot
+    const sessionId = getSessionId();
+    let outputVersion = 0;
+    let outputEtag = null;  // server's ETag for the output we hold
+    let output = {};
+
     sendBtn.addEventListener("click", sendMessage);
     userInput.addEventListener("keypress", (e) => {
         if (e.key === "Enter") sendMessage();
@@ -19,10 +26,14 @@ document.addEventListener("DOMContentLoaded", () => {
         fetch("/chat", {
             method: "POST",
             headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ message })
+            body: JSON.stringify({
+                message,
+                session_id: sessionId,
+                base_version: outputVersion
+            })
         })
-        .then(res => res.json())
-        .then(data => {
+        .then(res => res.json().then(data => ({ data, etag: res.headers.get("ETag") })))
+        .then(({ data, etag }) => {
             if (data.error) {
                 console.error(data.error);
                 return;
@@ -31,14 +42,100 @@ document.addEventListener("DOMContentLoaded", () => {
             // Add physician reply
             addMessage("Physician", data.physician_reply);
 
-            // Update UI sections
-            updateSummary(data.summary);
-            updateSentiment(data.sentiment);
-            updateSOAP(data.soap_note);
+            // Overloaded server skipped the NLP stages; keep current panels
+            if (data.degraded) return;
+
+            applyUpdate(data, etag);
+        })
+        .catch(err => console.error("Error:", err));
+    }
+
+    function getSessionId() {
+        let id = sessionStorage.getItem("notetakerSession");
+        if (!id) {
+            id = crypto.randomUUID();
+            sessionStorage.setItem("notetakerSession", id);
+        }
+        return id;
+    }
+
+    // -------------------------------
+    // Snapshot / Patch Application
+    // -------------------------------
+    function applyUpdate(data, etag) {
+        if (data.snapshot) {
+            applySnapshot(data.version, data.snapshot, etag);
+        } else if (data.patch && data.base_version === outputVersion) {
+            output = mergePatch(output, data.patch);
+            outputVersion = data.version;
+            outputEtag = etag;
+            renderPatch(data.patch);
+        } else {
+            fetchSnapshot();
+        }
+    }
+
+    function applySnapshot(version, snapshot, etag) {
+        output = snapshot;
+        outputVersion = version;
+        outputEtag = etag;
+
+        updateSummary(output.summary);
+        updateSentiment(output.sentiment);
+        updateSOAP(output.soap_note);
+    }
+
+    // Revalidate with the ETag the server sent; it also encodes the
+    // rule tables version, so it must not be rebuilt client-side
+    function fetchSnapshot() {
+        fetch(`/chat/state?session_id=${encodeURIComponent(sessionId)}`, {
+            headers: outputEtag ? { "If-None-Match": outputEtag } : {}
+        })
+        .then(res => (
+            res.status === 304
+                ? null
+                : res.json().then(data => ({ data, etag: res.headers.get("ETag") }))
+        ))
+        .then(result => {
+            if (result && result.data.snapshot) {
+                applySnapshot(result.data.version, result.data.snapshot, result.etag);
+            }
         })
         .catch(err => console.error("Error:", err));
     }
 
+    // JSON merge patch (RFC 7396): null removes a field
+    function mergePatch(target, patch) {
+        const result = { ...target };
+
+        for (const [key, value] of Object.entries(patch)) {
+            if (value === null) {
+                delete result[key];
+            } else if (isObject(value) && isObject(result[key])) {
+                result[key] = mergePatch(result[key], value);
+            } else {
+                result[key] = value;
+            }
+        }
+        return result;
+    }
+
+    function isObject(value) {
+        return value !== null && typeof value === "object" && !Array.isArray(value);
+    }
+
+    // Re-render only the sections named in the patch
+    function renderPatch(patch) {
+        if ("summary" in patch) updateSummary(output.summary);
+        if ("sentiment" in patch) updateSentiment(output.sentiment);
+
+        if ("soap_note" in patch) {
+            for (const section of Object.keys(patch.soap_note || {})) {
+                updateSOAPSection(section, output.soap_note?.[section]);
+            }
+        }
+    }
+
     function addMessage(role, text) {
         const msg = document.createElement("div");
         msg.classList.add("chat-message", role.toLowerCase());
@@ -108,17 +205,14 @@ ${summary.Prognosis || "Not specified"}
     function updateSOAP(soap) {
         if (!soap) return;
 
-        document.getElementById("soapSubjective").textContent =
-            formatSection(soap.Subjective);
-
-        document.getElementById("soapObjective").textContent =
-            formatSection(soap.Objective);
-
-        document.getElementById("soapAssessment").textContent =
-            formatSection(soap.Assessment);
+        for (const section of ["Subjective", "Objective", "Assessment", "Plan"]) {
+            updateSOAPSection(section, soap[section]);
+        }
+    }
 
-        document.getElementById("soapPlan").textContent =
-            formatSection(soap.Plan);
+    function updateSOAPSection(section, content) {
+        const element = document.getElementById(`soap${section}`);
+        if (element) element.textContent = formatSection(content);
     }
 
     function formatSection(section) {
@@ -0,0 +1,79 @@
+"""
+Unit tests for pipeline admission control
+
+Tests:
+- Concurrency slots and queue limits
+- Fail-fast shedding with Retry-After
+- Metrics counters
+
+Run using:
+pytest tests/test_admission.py
+
+Python version: 3.13.5
+"""
+
+import threading
+
+import pytest
+
+from utils.admission import AdmissionController, Overloaded, render_prometheus
+
+
+def test_admits_within_concurrency_limit():
+    """
+    Requests within the concurrency limit are admitted immediately.
+    """
+    controller = AdmissionController(max_concurrent=2, max_queue=0, deadline=1)
+
+    with controller.admit():
+        with controller.admit():
+            assert controller.metrics()["inflight"] == 2
+
+    metrics = controller.metrics()
+    assert metrics["admitted"] == 2
+    assert metrics["inflight"] == 0
+
+
+def test_sheds_when_queue_is_full():
+    """
+    With no queue capacity, a request beyond the limit gets 429.
+    """
+    controller = AdmissionController(max_concurrent=1, max_queue=0, deadline=1)
+
+    with controller.admit():
+        with pytest.raises(Overloaded) as exc_info:
+            with controller.admit():
+                pass
+
+    assert exc_info.value.status == 429
+    assert exc_info.value.retry_after >= 1
+    assert controller.metrics()["shed_queue_full"] == 1
+
+
+def test_sheds_when_deadline_expires():
+    """
+    A queued request that cannot start before its deadline gets 503.
+    """
+    controller = AdmissionController(max_concurrent=1, max_queue=4, deadline=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold_slot():
+        with controller.admit():
+            started.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_slot)
+    holder.start()
+    started.wait()
+
+    with pytest.raises(Overloaded) as exc_info:
+        with controller.admit(deadline=0.05):
+            pass
+
+    release.set()
+    holder.join()
+
+    assert exc_info.value.status == 503
+    assert controller.metrics()["shed_deadline"] == 1
+    assert 'reason="deadline"} 1' in render_prometheus(controller.metrics())
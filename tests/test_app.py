@@ -0,0 +1,320 @@
+"""
+Integration tests for the Flask chat endpoints
+
+Tests:
+- Each session's turns are analyzed and indexed separately
+  (entity search returns only the session that mentioned a term)
+- Delta responses patch against the session's own previous output
+- A worker catches up on turns another worker stored for a session
+- The flat-file log tags turns with their session
+- A windowed session keeps only the window's turns in memory
+- A busy session queues on its own lock, not on pipeline slots
+- /debug/memory is gated by the debug token
+- X-Profile is ignored without a valid debug token
+- Syncing stored turns neither skips nor duplicates concurrent writes
+- Rule reloads are validated, then built in the background
+
+Run using:
+pytest tests/test_app.py
+
+Python version: 3.13.5
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import pytest
+
+import app as app_module
+from nlp.context_window import ConversationWindow
+from nlp.rules import get_rules
+from nlp.turns import Role, Turn
+from utils import profiling
+from utils.admission import AdmissionController
+from utils.sessions import ConversationStore
+from utils.storage import SQLiteStorage
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    storage = SQLiteStorage(tmp_path / "test.db")
+
+    monkeypatch.setattr(app_module, "storage", storage)
+    monkeypatch.setattr(app_module, "conversations", ConversationStore())
+
+    yield app_module.app.test_client()
+
+    storage.close()
+
+
+def test_entity_index_keeps_sessions_apart(client):
+    """
+    Session B's output (and index postings) must not include the
+    diagnosis mentioned only in session A.
+    """
+    for session_id, message in (
+        ("session-a", "I was diagnosed with a whiplash injury."),
+        ("session-b", "I have a mild headache.")
+    ):
+        response = client.post(
+            "/chat", json={"message": message, "session_id": session_id}
+        )
+        assert response.status_code == 200
+
+    state = client.get("/chat/state?session_id=session-b").get_json()
+    assert state["snapshot"]["summary"]["Diagnosis"] == "Not mentioned"
+
+    found = client.get("/search/entities?all=whiplash").get_json()
+    assert [s["session_id"] for s in found["sessions"]] == ["session-a"]
+
+    found = client.get("/search/entities?all=headache").get_json()
+    assert [s["session_id"] for s in found["sessions"]] == ["session-b"]
+
+
+def test_delta_patch_ignores_other_sessions(client):
+    """
+    A turn in another session between two turns of session B does
+    not leak into B's patch.
+    """
+    first = client.post(
+        "/chat", json={"message": "I have a mild headache.", "session_id": "b"}
+    ).get_json()
+
+    client.post(
+        "/chat",
+        json={"message": "I was diagnosed with a whiplash injury.", "session_id": "a"}
+    )
+
+    second = client.post(
+        "/chat",
+        json={
+            "message": "The headache is getting better.",
+            "session_id": "b",
+            "base_version": first["version"]
+        }
+    ).get_json()
+
+    assert second["base_version"] == first["version"]
+    assert "Whiplash" not in json.dumps(second["patch"])
+    assert second["patch"]["summary"]["Current_Status"] == "Symptoms improving"
+
+
+def test_worker_catches_up_on_stored_turns(client, monkeypatch):
+    """
+    A turn handled by a second worker (its own in-memory store, same
+    database) is analyzed with the turns the first worker stored.
+    """
+    client.post(
+        "/chat",
+        json={"message": "I was diagnosed with a whiplash injury.", "session_id": "s"}
+    )
+
+    monkeypatch.setattr(app_module, "conversations", ConversationStore())
+
+    response = client.post(
+        "/chat", json={"message": "It is getting better.", "session_id": "s"}
+    ).get_json()
+
+    assert "Whiplash" in response["snapshot"]["summary"]["Diagnosis"]
+    assert len(app_module.conversations.get("s").turns) == 4
+    assert len(app_module.storage.get_turns("s")) == 4
+
+
+def test_flat_file_log_tags_turns_with_session(tmp_path, monkeypatch):
+    """
+    Without a database, each session's turns are appended to the
+    shared log with their session_id.
+    """
+    monkeypatch.setattr(app_module, "storage", None)
+    monkeypatch.setattr(app_module, "conversations", ConversationStore())
+    monkeypatch.setattr(app_module, "LOG_FILE", tmp_path / "conversation_log.json")
+    for name in ("SUMMARY_FILE", "SENTIMENT_FILE", "SOAP_FILE"):
+        monkeypatch.setattr(app_module, name, tmp_path / f"{name.lower()}.json")
+
+    client = app_module.app.test_client()
+    for session_id in ("a", "b"):
+        client.post(
+            "/chat", json={"message": "I have a mild headache.", "session_id": session_id}
+        )
+
+    log = json.loads((tmp_path / "conversation_log.json").read_text())
+    assert [entry["session_id"] for entry in log] == ["a", "a", "b", "b"]
+    assert [entry["role"] for entry in log] == ["Patient", "Physician"] * 2
+
+
+def test_windowed_session_holds_only_window_turns(client, monkeypatch):
+    """
+    With a context window, folded turns leave memory without being
+    fetched again from the database on the next turn.
+    """
+    monkeypatch.setattr(
+        app_module, "conversations",
+        ConversationStore(make_window=lambda: ConversationWindow(size=2))
+    )
+
+    for message in ("I had a car accident.", "My neck hurts.", "It is better now."):
+        client.post("/chat", json={"message": message, "session_id": "w"})
+
+    conversation = app_module.conversations.get("w")
+    assert len(conversation.turns) == 2
+    assert conversation.turn_count == len(app_module.storage.get_turns("w")) == 6
+
+
+def test_busy_session_does_not_hold_pipeline_slots(client, monkeypatch):
+    """
+    A turn waiting behind its own session's slow turn takes no
+    pipeline slot, so another session is still served; a turn that
+    waits past its deadline is shed.
+    """
+    monkeypatch.setattr(
+        app_module, "admission_controller",
+        AdmissionController(max_concurrent=1, max_queue=0, deadline=5)
+    )
+
+    busy = app_module.conversations.get("busy")
+    busy.lock.acquire()  # a slow turn of "busy" in progress
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        waiting = pool.submit(
+            app_module.app.test_client().post,
+            "/chat", json={"message": "I have neck pain.", "session_id": "busy"}
+        )
+        time.sleep(0.1)
+
+        other = client.post(
+            "/chat", json={"message": "I have a mild headache.", "session_id": "other"}
+        )
+        assert other.status_code == 200
+
+        busy.lock.release()
+        assert waiting.result(10).status_code == 200
+
+    busy.lock.acquire()
+    shed = client.post(
+        "/chat",
+        json={"message": "Still there?", "session_id": "busy"},
+        headers={"X-Request-Deadline": "0.1"}
+    )
+    busy.lock.release()
+
+    assert shed.status_code == 503
+    assert "Retry-After" in shed.headers
+
+
+def test_debug_memory_requires_token(client, monkeypatch):
+    """
+    404 without a configured token, 403 without a matching header,
+    otherwise the profiler report plus store sizes.
+    """
+    monkeypatch.setattr(app_module, "DEBUG_ENDPOINT_TOKEN", "")
+    assert client.get("/debug/memory").status_code == 404
+    assert client.get(
+        "/debug/memory", headers={"X-Debug-Token": ""}
+    ).status_code == 404
+
+    monkeypatch.setattr(app_module, "DEBUG_ENDPOINT_TOKEN", "secret")
+    assert client.get("/debug/memory").status_code == 403
+    assert client.get(
+        "/debug/memory", headers={"X-Debug-Token": "wrong"}
+    ).status_code == 403
+
+    client.post("/chat", json={"message": "I have neck pain.", "session_id": "m"})
+
+    response = client.get("/debug/memory", headers={"X-Debug-Token": "secret"})
+    report = response.get_json()
+
+    assert response.status_code == 200
+    assert report["rss_bytes"] > 0
+    assert "stages" in report
+    assert report["stores"]["conversation_sessions"] == 1
+    assert report["stores"]["conversation_turns"] == 2
+    assert report["stores"]["conversation_chars"] > 0
+
+
+def test_profile_header_requires_debug_token(monkeypatch):
+    """
+    X-Profile: 1 is honored only with a matching X-Debug-Token.
+    """
+    monkeypatch.setattr(app_module, "DEBUG_ENDPOINT_TOKEN", "secret")
+
+    assert not app_module.profile_requested({"X-Profile": "1"})
+    assert not app_module.profile_requested(
+        {"X-Profile": "1", "X-Debug-Token": "wrong"}
+    )
+    assert not app_module.profile_requested({"X-Debug-Token": "secret"})
+    assert app_module.profile_requested({"X-Profile": "1", "X-Debug-Token": "secret"})
+
+    monkeypatch.setattr(app_module, "DEBUG_ENDPOINT_TOKEN", "")
+    assert not app_module.profile_requested({"X-Profile": "1", "X-Debug-Token": ""})
+
+
+def test_chat_ignores_unauthorized_profile_header(client, monkeypatch):
+    calls = []
+
+    def record(label, enabled, *args):
+        calls.append(enabled)
+        return nullcontext()
+
+    monkeypatch.setattr(app_module, "DEBUG_ENDPOINT_TOKEN", "secret")
+    monkeypatch.setattr(app_module, "cpu_profile", record)
+    monkeypatch.setattr(profiling, "CPU_PROFILE_SAMPLE_RATE", 0.0)
+
+    for headers in ({"X-Profile": "1"}, {"X-Profile": "1", "X-Debug-Token": "secret"}):
+        client.post(
+            "/chat", json={"message": "I have neck pain.", "session_id": "p"},
+            headers=headers
+        )
+
+    assert calls == [False, True]
+
+
+def test_sync_reads_turns_in_one_query(client, monkeypatch):
+    """
+    Turns another worker stores while this worker syncs are neither
+    skipped nor duplicated.
+    """
+    storage = app_module.storage
+    storage.save_chat_turn("s", [Turn.now(Role.PATIENT, "I have neck pain.")], None)
+
+    def stale_count(session_id):
+        count = SQLiteStorage.count_turns(storage, session_id)
+        # Another worker appends between the count and the turn read
+        storage.save_chat_turn("s", [Turn.now(Role.PHYSICIAN, "Since when?")], None)
+        return count
+
+    monkeypatch.setattr(storage, "count_turns", stale_count)
+
+    conversation = app_module.conversations.get("s")
+    app_module.sync_conversation("s", conversation)
+    app_module.sync_conversation("s", conversation)
+
+    stored = SQLiteStorage.get_turns(storage, "s")
+    assert [t.text for t in conversation.turns] == [row["text"] for row in stored]
+
+
+def test_rules_reload_builds_in_background(client, monkeypatch):
+    """
+    The endpoint answers 202 with the pending version; the new
+    RuleSet replaces the active one once built.
+    """
+    monkeypatch.setattr(app_module, "DEBUG_ENDPOINT_TOKEN", "secret")
+    active = get_rules()
+
+    response = client.post("/admin/rules/reload", headers={"X-Debug-Token": "secret"})
+
+    assert response.status_code == 202
+    assert response.get_json()["pending_version"] == active.version
+
+    deadline = time.monotonic() + 10
+    while get_rules() is active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert get_rules() is not active
+
+    def invalid(*args):
+        raise ValueError("Missing section: ner")
+
+    monkeypatch.setattr(app_module, "read_rule_tables", invalid)
+    response = client.post("/admin/rules/reload", headers={"X-Debug-Token": "secret"})
+    assert response.status_code == 422
@@ -0,0 +1,62 @@
+"""
+Integration tests for the ASGI chat endpoints
+
+Tests:
+- Requests beyond the admission slots and queue are shed with 429
+  and Retry-After instead of waiting
+
+Run using:
+pytest tests/test_asgi.py
+
+Python version: 3.13.5
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("quart")
+
+import app as wsgi_app
+import asgi
+from utils.admission import AdmissionController
+
+
+def test_overload_is_shed_not_queued(monkeypatch):
+    """
+    With one slot and no queue, a second concurrent request gets 429
+    while the first is still running.
+    """
+    controller = AdmissionController(max_concurrent=1, max_queue=0, deadline=5)
+    release = threading.Event()
+
+    def slow_turn(conversation, patient_message, profile=False):
+        release.wait(5)
+        return {"physician_reply": "ok"}, 200, None, []
+
+    monkeypatch.setattr(wsgi_app, "admission_controller", controller)
+    monkeypatch.setattr(wsgi_app, "run_chat_turn", slow_turn)
+    monkeypatch.setattr(wsgi_app, "storage", None)
+    monkeypatch.setattr(wsgi_app, "append_conversation_log", lambda *args: None)
+
+    async def scenario():
+        client = asgi.app.test_client()
+        first = asyncio.create_task(
+            client.post("/chat", json={"message": "neck pain"})
+        )
+
+        while controller.metrics()["inflight"] < 1:
+            await asyncio.sleep(0.01)
+
+        second = await client.post("/chat", json={"message": "back pain"})
+        release.set()
+
+        return await first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
+    assert controller.metrics()["shed_queue_full"] == 1
@@ -0,0 +1,69 @@
+"""
+Unit tests for the bounded context window
+
+Tests:
+- Old turns are folded into the rollup
+- Rollup entities are merged into windowed pipeline output
+- Rollup keyword counts are capped to the most frequent
+
+Run using:
+pytest tests/test_context_window.py
+
+Python version: 3.13.5
+"""
+
+from nlp import context_window
+from nlp.context_window import ConversationRollup, ConversationWindow
+from nlp.pipeline import run_windowed_nlp_pipeline
+
+
+def test_window_folds_old_turns():
+    """
+    Only the most recent turns stay in the window.
+    """
+    window = ConversationWindow(size=2)
+
+    window.append({"role": "Patient", "text": "I had a car accident."})
+    window.append({"role": "Physician", "text": "Did you take painkillers?"})
+    window.append({"role": "Patient", "text": "Yes, and physiotherapy."})
+
+    turns, rollup = window.snapshot()
+
+    assert len(turns) == 2
+    assert rollup.turns_folded == 1
+    assert "car accident" in rollup.cues
+
+
+def test_windowed_pipeline_keeps_folded_entities():
+    """
+    Entities mentioned only in folded turns still reach the summary.
+    """
+    window = ConversationWindow(size=2)
+
+    window.append({"role": "Patient", "text": "I took painkillers for a month."})
+    window.append({"role": "Physician", "text": "How are you now?"})
+    window.append({"role": "Patient", "text": "I feel better now."})
+    window.append({"role": "Physician", "text": "Good to hear."})
+
+    output = run_windowed_nlp_pipeline(window)
+
+    assert "Painkillers" in output["summary"]["Treatment"]
+    assert output["sentiment"] == "Reassured"
+    assert {"Subjective", "Objective", "Assessment", "Plan"}.issubset(
+        output["soap_note"].keys()
+    )
+
+
+def test_rollup_keeps_most_frequent_keywords(monkeypatch):
+    """
+    Keyword counts stay bounded; the most frequent survive.
+    """
+    monkeypatch.setattr(context_window, "CONTEXT_ROLLUP_MAX_KEYWORDS", 2)
+    rollup = ConversationRollup()
+
+    for text in ("neck pain", "neck pain", "back pain", "whiplash injury"):
+        rollup.fold({"role": "Patient", "text": f"I have {text}."})
+
+    assert len(rollup.keyword_counts) == 2
+    assert rollup.keyword_counts.most_common(1)[0][1] >= 2
+    assert rollup.copy().keyword_counts == rollup.keyword_counts
@@ -0,0 +1,56 @@
+"""
+Unit tests for the parsed Doc cache
+
+Tests:
+- Re-analysis from cached Docs matches the full pipeline
+- Rebuilds only parse new transcripts
+
+Run using:
+pytest tests/test_doc_cache.py
+
+Python version: 3.13.5
+"""
+
+from nlp.doc_cache import DocCache, reanalyze, transcript_key
+from nlp.pipeline import run_nlp_pipeline
+from nlp.preprocessing import build_transcript_string
+from nlp.turns import Role, Turn
+
+
+CONVERSATIONS = [
+    ("visit-1", [
+        {"role": "Patient", "text": "I had a car accident and neck pain."},
+        {"role": "Physician", "text": "Did you take painkillers or physiotherapy?"},
+        {"role": "Patient", "text": "Yes, ten physiotherapy sessions."}
+    ]),
+    ("visit-2", [
+        Turn.now(Role.PATIENT, "My back pain is improving."),
+        Turn.now(Role.PHYSICIAN, "I expect a full recovery.")
+    ])
+]
+
+
+def test_reanalysis_matches_full_pipeline(tmp_path):
+    cache = DocCache(tmp_path)
+    assert cache.build(CONVERSATIONS, shard_size=1) == 2
+    assert len(cache.shards) == 2
+
+    results = dict(reanalyze(DocCache(tmp_path)))
+
+    for conversation_id, turns in CONVERSATIONS:
+        assert results[conversation_id] == run_nlp_pipeline(turns)
+
+
+def test_rebuild_parses_only_new_transcripts(tmp_path):
+    cache = DocCache(tmp_path)
+    cache.build(CONVERSATIONS[:1])
+
+    reopened = DocCache(tmp_path)
+    assert reopened.build(CONVERSATIONS) == 1
+    assert len(reopened) == 2
+
+    key = transcript_key(build_transcript_string(CONVERSATIONS[1][1]))
+    doc, lowered = reopened.get(key)
+    assert doc.text == build_transcript_string(CONVERSATIONS[1][1])
+    assert lowered.text == doc.text.lower()
+    assert reopened.get("missing") is None
@@ -0,0 +1,116 @@
+"""
+Unit tests for batch evaluation
+
+Tests:
+- Entity-level precision / recall / F1 counting
+- Corpus aggregation of accuracy and latency
+- Backend warm-up is not charged to the first timed record
+- Gold transcripts are split with the production speaker rules
+
+Run using:
+pytest tests/test_evaluation.py
+
+Python version: 3.13.5
+"""
+
+import time
+
+import numpy as np
+
+from utils.evaluation import (
+    EVALUATION_BACKENDS,
+    aggregate_metrics,
+    entity_counts,
+    parse_transcript,
+    run_backend
+)
+
+
+def test_entity_counts_ignore_case_and_placeholders():
+    """
+    Matching is case-insensitive and "Not mentioned" is not an entity.
+    """
+    predicted = {"Symptoms": ["Back Pain", "Headache"], "Diagnosis": "Not mentioned"}
+    reference = {"Symptoms": ["back pain", "Neck Pain"], "Diagnosis": "Whiplash Injury"}
+
+    counts = entity_counts(predicted, reference)
+
+    # Symptoms: 1 tp, 1 fp, 1 fn; Diagnosis: 0 tp, 0 fp, 1 fn
+    assert counts[0].tolist() == [1, 1, 1]
+    assert counts[1].tolist() == [0, 0, 1]
+
+
+def test_aggregate_metrics_over_corpus():
+    """
+    Micro-averaged F1, accuracies and latency percentiles.
+    """
+    soap = {"Subjective": {}, "Objective": {}, "Assessment": {}, "Plan": {}}
+    outputs = [
+        {"summary": {"Symptoms": ["Back Pain"]}, "sentiment": "Anxious",
+         "intent": "Reporting symptoms", "soap_note": soap},
+        {"summary": {"Symptoms": ["Neck Pain"]}, "sentiment": "Neutral",
+         "intent": "Reporting symptoms", "soap_note": {"Plan": {}}}
+    ]
+    records = [
+        {"summary": {"Symptoms": ["Back Pain"]}, "sentiment": "Anxious",
+         "intent": "Reporting symptoms", "soap_note": soap},
+        {"summary": {"Symptoms": ["Back Pain"]}, "sentiment": "Anxious",
+         "intent": "Reporting symptoms", "soap_note": soap}
+    ]
+
+    metrics = aggregate_metrics(outputs, records, np.array([10.0, 30.0]), 2.0)
+
+    assert metrics["records"] == 2
+    assert metrics["throughput_rps"] == 1.0
+    assert metrics["latency_ms"]["p50"] == 20.0
+    assert metrics["entities"]["micro"]["precision"] == 0.5
+    assert metrics["entities"]["micro"]["recall"] == 0.5
+    assert metrics["sentiment_accuracy"] == 0.5
+    assert metrics["intent_accuracy"] == 1.0
+    assert metrics["soap_section_completeness"] == 0.625
+
+
+def test_parse_transcript_keeps_roles():
+    conversation = parse_transcript("Physician: Hello.\n\nPatient: My back hurts.")
+
+    assert conversation == [
+        {"role": "Physician", "text": "Hello."},
+        {"role": "Patient", "text": "My back hurts."}
+    ]
+
+
+def test_parse_transcript_matches_production_speaker_rules():
+    """
+    Prefixes are matched case-insensitively, as classify_speaker does.
+    """
+    conversation = parse_transcript("PHYSICIAN: Any pain?\npatient: Yes, Neck Pain.\nOkay.")
+
+    assert conversation == [
+        {"role": "Physician", "text": "Any pain?"},
+        {"role": "Patient", "text": "Yes, Neck Pain."},
+        {"role": "Patient", "text": "Okay."}
+    ]
+
+
+def test_run_backend_excludes_cold_start(monkeypatch):
+    """
+    A backend that is slow on its first call (model loading) is
+    warmed up before timing starts.
+    """
+    calls = []
+
+    def cold_backend(conversation):
+        if not calls:
+            time.sleep(0.3)
+        calls.append(conversation)
+        return {"summary": {}}
+
+    monkeypatch.setitem(EVALUATION_BACKENDS, "cold", cold_backend)
+    records = [{"id": str(i), "conversation": []} for i in range(3)]
+
+    outputs, latencies, wall_time = run_backend("cold", records, workers=1)
+
+    assert len(outputs) == 3
+    assert len(calls) == 4  # one untimed warm-up
+    assert latencies.max() < 100
+    assert wall_time < 0.3
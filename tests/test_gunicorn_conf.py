@@ -0,0 +1,59 @@
+"""
+Unit tests for the gunicorn configuration
+
+Tests:
+- Default settings start on a multi-core host (one worker, JSON storage)
+- SQLite storage defaults to one worker per core
+- Several workers without SQLite refuse to start
+
+Run using:
+pytest tests/test_gunicorn_conf.py
+
+Python version: 3.13.5
+"""
+
+import importlib
+import os
+import runpy
+
+import pytest
+
+import config
+
+
+CONF_PATH = config.BASE_DIR / "gunicorn.conf.py"
+
+
+@pytest.fixture
+def load_conf(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    monkeypatch.delenv("WEB_WORKERS", raising=False)
+    monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+
+    def load(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        importlib.reload(config)
+        return runpy.run_path(str(CONF_PATH))
+
+    yield load
+
+    monkeypatch.undo()
+    importlib.reload(config)
+
+
+def test_default_env_starts_one_worker(load_conf):
+    conf = load_conf()
+
+    assert conf["workers"] == 1
+
+
+def test_sqlite_defaults_to_one_worker_per_core(load_conf):
+    conf = load_conf(STORAGE_BACKEND="sqlite")
+
+    assert conf["workers"] == 8
+
+
+def test_several_workers_require_sqlite(load_conf):
+    with pytest.raises(SystemExit):
+        load_conf(WEB_WORKERS="4")
@@ -0,0 +1,158 @@
+"""
+Unit tests for TF-IDF keyword ranking
+
+Tests:
+- Offline IDF table build and memory-mapped load
+- Vectorized phrase scoring and ranking
+- POS-pattern noun phrases from a known tag sequence
+
+Run using:
+pytest tests/test_keywords.py
+
+Python version: 3.13.5
+"""
+
+from spacy.tokens import Doc
+
+from nlp import keywords
+from nlp.idf import IdfTable, build_idf_table
+
+
+def test_idf_table_round_trip(tmp_path):
+    """
+    Built table loads memory-mapped with one value per term.
+    """
+    size = build_idf_table(
+        ["neck pain after the accident", "the pain is better"],
+        tmp_path
+    )
+
+    table = IdfTable.load(tmp_path)
+
+    assert size == len(table.values) == len(table.index)
+    assert table.values[table.index["pain"]] < table.values[table.index["neck"]]
+
+
+def test_rare_terms_rank_above_common_terms(tmp_path):
+    """
+    Phrases made of rare corpus terms outrank common ones at equal tf.
+    """
+    build_idf_table(
+        [
+            "pain in my back",
+            "pain again today",
+            "the pain is worse",
+            "whiplash injury from the crash"
+        ],
+        tmp_path
+    )
+    table = IdfTable.load(tmp_path)
+
+    ranked = table.rank({"pain": 1, "whiplash injury": 1})
+
+    assert ranked == ["whiplash injury", "pain"]
+
+
+def test_term_frequency_boosts_score(tmp_path):
+    """
+    A phrase mentioned more often scores higher.
+    """
+    build_idf_table(["neck pain", "back pain"], tmp_path)
+    table = IdfTable.load(tmp_path)
+
+    scores = table.score(["neck pain", "back pain"], [3, 1])
+
+    assert scores[0] > scores[1]
+
+
+# -------------------------------------------------------------------
+# POS-pattern extraction
+# -------------------------------------------------------------------
+
+# "my neck pain and the whiplash injury improved after the car accident"
+TAGGED_WORDS = [
+    ("my", "PRP$", "PRON"), ("neck", "NN", "NOUN"), ("pain", "NN", "NOUN"),
+    ("and", "CC", "CCONJ"), ("the", "DT", "DET"), ("whiplash", "NN", "NOUN"),
+    ("injury", "NN", "NOUN"), ("improved", "VBD", "VERB"), ("after", "IN", "ADP"),
+    ("the", "DT", "DET"), ("car", "NN", "NOUN"), ("accident", "NN", "NOUN")
+]
+
+
+def tagged_doc():
+    words, tags, pos = zip(*TAGGED_WORDS)
+    return Doc(keywords.nlp.vocab, words=list(words), tags=list(tags), pos=list(pos))
+
+
+def test_noun_phrase_pattern_matches_longest_phrases():
+    """
+    Determiner/possessive + modifiers + noun head, longest match only.
+    """
+    spans = keywords.noun_phrase_matcher(tagged_doc(), as_spans=True)
+
+    assert [span.text for span in spans] == [
+        "my neck pain", "the whiplash injury", "the car accident"
+    ]
+
+
+def test_pos_pattern_keywords_without_idf(monkeypatch):
+    """
+    Medical phrases plus standalone medical tokens, alphabetical.
+    """
+    monkeypatch.setattr(keywords, "KEYWORD_RANKING", "alphabetical")
+
+    assert keywords.keywords_from_pos_patterns(tagged_doc()) == [
+        "Accident", "Injury", "My Neck Pain", "Neck", "Pain",
+        "The Car Accident", "The Whiplash Injury", "Whiplash"
+    ]
+    assert keywords.keywords_from_pos_patterns(tagged_doc(), max_keywords=3) == [
+        "Accident", "Injury", "My Neck Pain"
+    ]
+
+
+def test_pos_pattern_keywords_ranked_by_idf(tmp_path, monkeypatch):
+    """
+    With an IDF table, rare phrases lead and the limit applies after ranking.
+    """
+    build_idf_table(
+        [
+            "my neck pain",
+            "neck pain and the accident",
+            "pain after the car accident",
+            "the injury",
+            "car injury",
+            "my pain"
+        ],
+        tmp_path
+    )
+    table = IdfTable.load(tmp_path)
+    monkeypatch.setattr(keywords, "KEYWORD_RANKING", "tfidf")
+    monkeypatch.setattr(keywords, "get_idf_table", lambda: table)
+
+    assert keywords.keywords_from_pos_patterns(tagged_doc()) == [
+        "Whiplash", "The Whiplash Injury", "Accident", "Injury", "Neck",
+        "The Car Accident", "My Neck Pain", "Pain"
+    ]
+    assert keywords.keywords_from_pos_patterns(tagged_doc(), max_keywords=3) == [
+        "Whiplash", "The Whiplash Injury", "Accident"
+    ]
+
+
+def test_extract_keywords_pos_patterns_skips_parser(monkeypatch):
+    """
+    Parses the lowercased text with the parser-free components only.
+    """
+    calls = []
+    doc = tagged_doc()
+
+    def fake_nlp(text, disable=()):
+        calls.append((text, list(disable)))
+        return doc
+
+    monkeypatch.setattr(keywords, "KEYWORD_RANKING", "alphabetical")
+    monkeypatch.setattr(keywords, "nlp", fake_nlp)
+
+    assert keywords.extract_keywords_pos_patterns("") == []
+    assert keywords.extract_keywords_pos_patterns("My Neck Pain", max_keywords=2) == [
+        "Accident", "Injury"
+    ]
+    assert calls == [("my neck pain", keywords.PARSER_FREE_DISABLED)]
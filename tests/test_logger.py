@@ -0,0 +1,65 @@
+"""
+Unit tests for queue-based logging
+
+Tests:
+- Records prepared for the queue keep the exception traceback
+- JSON lines output includes the "exception" field
+
+Run using:
+pytest tests/test_logger.py
+
+Python version: 3.13.5
+"""
+
+import json
+import logging
+import queue
+import sys
+
+from utils.logger import JsonLinesFormatter, NonBlockingQueueHandler
+
+
+def test_json_lines_keep_exception_through_queue():
+    """
+    An exception logged through the queue handler is written by the
+    listener's JSON formatter with its traceback.
+    """
+    log_queue = queue.Queue()
+    logger = logging.getLogger("tests.logger.json")
+    logger.propagate = False
+    logger.addHandler(NonBlockingQueueHandler(log_queue))
+
+    try:
+        try:
+            raise ValueError("bad transcript")
+        except ValueError:
+            logger.exception("Failed to parse %s", "turn 3")
+    finally:
+        logger.handlers.clear()
+
+    record = log_queue.get_nowait()
+    line = json.loads(JsonLinesFormatter().format(record))
+
+    assert line["message"] == "Failed to parse turn 3"
+    assert line["level"] == "ERROR"
+    assert "ValueError: bad transcript" in line["exception"]
+    assert record.exc_info is None
+
+
+def test_text_format_keeps_traceback_after_queue():
+    log_queue = queue.Queue()
+    handler = NonBlockingQueueHandler(log_queue)
+
+    try:
+        raise KeyError("soap")
+    except KeyError:
+        record = logging.LogRecord(
+            "tests.logger.text", logging.ERROR, __file__, 1,
+            "Lookup failed", None, sys.exc_info()
+        )
+
+    handler.handle(record)
+    text = logging.Formatter().format(log_queue.get_nowait())
+
+    assert text.startswith("Lookup failed")
+    assert "KeyError: 'soap'" in text
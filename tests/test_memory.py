@@ -0,0 +1,98 @@
+"""
+Unit tests for the memory profiler
+
+Tests:
+- Stage hooks record allocation deltas and the sites that grew
+- A disabled profiler records nothing and does not trace
+- Interval snapshots are diffed against the previous one
+
+Run using:
+pytest tests/test_memory.py
+
+Python version: 3.13.5
+"""
+
+import tracemalloc
+
+import pytest
+
+from utils.memory import MemoryProfiler, diff_top_sites
+
+
+@pytest.fixture
+def profiler():
+    profiler = MemoryProfiler(enabled=False, interval=0, top_n=5)
+    profiler.start()
+
+    yield profiler
+
+    profiler.stop()
+
+
+def allocate(count: int = 100, size: int = 10_000):
+    return [bytearray(size) for _ in range(count)]
+
+
+def test_stage_records_delta_and_top_sites(profiler):
+    with profiler.stage("alloc"):
+        data = allocate()
+
+    stats = profiler.report()["stages"]["alloc"]
+
+    assert stats["calls"] == 1
+    assert stats["last_delta_bytes"] >= 100 * 10_000
+    assert stats["max_delta_bytes"] == stats["total_delta_bytes"] == stats["last_delta_bytes"]
+    assert "test_memory.py" in stats["last_top_sites"][0]["site"]
+    assert stats["last_top_sites"][0]["size_diff_bytes"] >= 100 * 10_000
+    assert len(stats["last_top_sites"]) <= 5
+
+    with profiler.stage("alloc"):
+        pass
+
+    assert profiler.report()["stages"]["alloc"]["calls"] == 2
+    del data
+
+
+def test_disabled_profiler_is_a_no_op():
+    profiler = MemoryProfiler(enabled=False, interval=0)
+
+    with profiler.stage("alloc"):
+        allocate(10)
+
+    report = profiler.report()
+
+    assert not tracemalloc.is_tracing()
+    assert report["enabled"] is False
+    assert report["stages"] == {}
+    assert "traced_current_bytes" not in report
+    assert report["rss_bytes"] > 0
+
+
+def test_interval_snapshots_are_diffed(profiler):
+    profiler.take_interval_snapshot()
+    assert profiler.report()["interval_top_sites"] == []
+
+    data = allocate()
+    profiler.take_interval_snapshot()
+
+    report = profiler.report()
+    assert report["interval_taken_at"] is not None
+    assert "test_memory.py" in report["interval_top_sites"][0]["site"]
+    del data
+
+
+def test_diff_top_sites_orders_by_growth():
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        small, large = allocate(10, 100), allocate(10, 100_000)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    sites = diff_top_sites(before, after, limit=2)
+
+    assert len(sites) == 2
+    assert sites[0]["size_diff_bytes"] >= sites[1]["size_diff_bytes"]
+    assert sites[0]["size_diff_bytes"] >= 10 * 100_000
+    del small, large
@@ -0,0 +1,121 @@
+"""
+Unit tests for transcript preprocessing
+
+Tests:
+- Streaming ingestion matches split_by_speaker turn for turn
+- Conversation boundaries and header ids
+- Memory use does not grow with file size
+- Batch normalization matches per-line normalization
+
+Run using:
+pytest tests/test_preprocessing.py
+
+Python version: 3.13.5
+"""
+
+import tracemalloc
+
+from nlp.preprocessing import (
+    iter_conversations,
+    normalize_text,
+    normalize_texts,
+    parse_speaker_line,
+    split_by_speaker,
+    split_speaker_lines,
+    stream_turns
+)
+
+
+EXPORT = """﻿Session: enc-17
+Physician: How are you feeling today?
+Patient: My neck still hurts!
+
+I also had trouble sleeping.
+---
+Physician: Any dizziness?
+Patient: No.
+===
+Encounter #A-9
+Patient: Backache again.
+"""
+
+
+def test_streamed_turns_match_split_by_speaker():
+    transcript = "\n".join(
+        line for line in EXPORT.lstrip("﻿").splitlines()
+        if not line.startswith(("Session", "Encounter", "---", "==="))
+    )
+
+    streamed = [turn for _, turn in stream_turns(EXPORT.lstrip("﻿").splitlines())]
+
+    assert streamed == split_by_speaker(transcript)
+    assert streamed[2] == {"role": "Patient", "text": "i also had trouble sleeping."}
+
+
+def test_conversation_boundaries(tmp_path):
+    path = tmp_path / "export.txt"
+    path.write_text(EXPORT, encoding="utf-8")
+
+    for use_mmap in (True, False):
+        conversations = list(iter_conversations(path, use_mmap=use_mmap))
+
+        assert [(cid, len(turns)) for cid, turns in conversations] == [
+            ("enc-17", 3), ("conversation-1", 2), ("A-9", 1)
+        ]
+        assert conversations[1][1][0] == {"role": "Physician", "text": "any dizziness"}
+
+    empty = tmp_path / "empty.txt"
+    empty.write_text("", encoding="utf-8")
+    assert list(iter_conversations(empty)) == []
+
+
+def test_memory_independent_of_file_size(tmp_path):
+    def peak_kib(conversations: int) -> int:
+        path = tmp_path / f"export_{conversations}.txt"
+        with path.open("w", encoding="utf-8") as f:
+            for i in range(conversations):
+                f.write(f"Session: {i}\n" + EXPORT.split("\n", 1)[1].split("---")[0])
+
+        tracemalloc.start()
+        count = sum(1 for _ in iter_conversations(path))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        assert count == conversations
+        return peak // 1024
+
+    small, large = peak_kib(100), peak_kib(20_000)
+
+    assert large < small * 2 + 64
+
+
+def test_batch_normalization_matches_per_line():
+    texts = [
+        "Pain   was 7/10 -- maybe 8/10!!",
+        "  Café visit, then NECK pain…  ",
+        "tabs\tand\nnewlines",
+        "nul\x00byte",
+        "",
+        None,
+        "?!"
+    ]
+
+    expected = [normalize_text(text) for text in texts]
+
+    assert expected[0] == "pain was 710 maybe 810"
+    assert expected[1] == "café visit, then neck pain"
+    assert normalize_texts(texts) == expected
+    assert normalize_texts(texts * 50, workers=4) == expected * 50
+    assert normalize_texts([t for t in texts if t and t.isascii()]) == [
+        normalize_text(t) for t in texts if t and t.isascii()
+    ]
+
+
+def test_speaker_prefixes_in_one_pass():
+    lines = ["Physician: Any pain?", "PATIENT: Yes.", "patient:no", "Well: it hurts", "  "]
+
+    turns = split_speaker_lines(lines)
+
+    assert turns == [parse_speaker_line(line) for line in lines if line.strip()]
+    assert [t["role"] for t in turns] == ["Physician", "Patient", "Patient", "Patient"]
+    assert [t["text"] for t in turns] == ["any pain", "yes.", "no", "well it hurts"]
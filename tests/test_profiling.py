@@ -0,0 +1,69 @@
+"""
+Unit tests for the CPU stack sampler
+
+Tests:
+- A profiled run writes a .folded file of "frame;frame count" lines
+- A disabled profile is a null context and starts no thread
+- Sampling-rate and header opt-in decisions
+
+Run using:
+pytest tests/test_profiling.py
+
+Python version: 3.13.5
+"""
+
+import re
+import threading
+import time
+from contextlib import nullcontext
+
+from utils import profiling
+from utils.profiling import cpu_profile, profiling_active, should_profile
+
+
+FOLDED_LINE = re.compile(r"^[^;\n]+(;[^;\n]+)* \d+$")
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profile_writes_folded_stacks(tmp_path):
+    with cpu_profile("test", True, output_dir=tmp_path) as sampler:
+        assert profiling_active()
+        busy_wait(0.1)
+
+    assert not profiling_active()
+
+    files = list(tmp_path.glob("test_*.folded"))
+    assert files == [sampler.output_path]
+
+    lines = files[0].read_text(encoding="utf-8").splitlines()
+    assert lines
+    assert all(FOLDED_LINE.match(line) for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sampler.samples
+    assert any("busy_wait (test_profiling.py:" in line for line in lines)
+
+
+def test_disabled_profile_starts_no_thread(tmp_path):
+    threads = threading.active_count()
+
+    context = cpu_profile("test", False, output_dir=tmp_path)
+
+    assert isinstance(context, nullcontext)
+    with context:
+        assert not profiling_active()
+        assert threading.active_count() == threads
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_should_profile(monkeypatch):
+    monkeypatch.setattr(profiling, "CPU_PROFILE_SAMPLE_RATE", 0.0)
+    assert should_profile(requested=True)
+    assert not should_profile()
+
+    monkeypatch.setattr(profiling, "CPU_PROFILE_SAMPLE_RATE", 1.0)
+    assert should_profile()
@@ -0,0 +1,79 @@
+"""
+Unit tests for hot-reloadable rule tables
+
+Tests:
+- Reload swaps the tables; a run in flight keeps the version it pinned
+- An invalid rules file leaves the active rules in place
+- Background reloads swap in valid files and keep the rules otherwise
+
+Run using:
+pytest tests/test_rules.py
+
+Python version: 3.13.5
+"""
+
+import json
+
+import pytest
+
+from config import RULES_PATH
+from nlp.pipeline import run_nlp_pipeline
+from nlp.rules import get_rules, pinned_rules, reload_rules, start_reload
+from nlp.sentiment_intent import detect_sentiment
+
+
+def write_rules(path, **changes):
+    tables = json.loads(RULES_PATH.read_text(encoding="utf-8"))
+    tables.update(changes)
+    path.write_text(json.dumps(tables), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def restore_rules():
+    yield
+    reload_rules(RULES_PATH)
+
+
+def test_reload_swaps_tables_after_pinned_run(tmp_path, restore_rules):
+    original = get_rules()
+    sentiment = dict(original.tables["sentiment"])
+    sentiment["Anxious"] = sentiment["Anxious"] + ["jittery"]
+
+    path = write_rules(tmp_path / "rules.json", version="test-2", sentiment=sentiment)
+
+    with pinned_rules() as rules:
+        previous, current = reload_rules(path)
+
+        # The pinned run still sees the tables it started with
+        assert get_rules() is rules is original
+        assert detect_sentiment("i feel jittery") == "Neutral"
+
+    assert (previous, current) == (original.version, "test-2")
+    assert detect_sentiment("i feel jittery") == "Anxious"
+
+    output = run_nlp_pipeline([{"role": "Patient", "text": "I feel jittery."}])
+    assert output["rules_version"] == "test-2"
+    assert output["sentiment"] == "Anxious"
+
+
+def test_invalid_file_keeps_active_rules(tmp_path, restore_rules):
+    active = get_rules()
+
+    with pytest.raises(ValueError):
+        reload_rules(write_rules(tmp_path / "bad.json", intent={"Unknown": ["x"]}))
+
+    with pytest.raises(ValueError):
+        reload_rules(write_rules(tmp_path / "bad.json", version="v 1"))
+
+    assert get_rules() is active
+
+
+def test_background_reload_swaps_or_keeps_rules(tmp_path, restore_rules):
+    active = get_rules()
+
+    start_reload(write_rules(tmp_path / "bad.json", version="v 1")).join(10)
+    assert get_rules() is active
+
+    start_reload(write_rules(tmp_path / "rules.json", version="test-3")).join(10)
+    assert get_rules().version == "test-3"
@@ -0,0 +1,123 @@
+"""
+Unit tests for the transformer sentiment backend
+
+Tests:
+- The micro-batcher groups concurrent requests and propagates errors
+- Callers time out on a stalled batch; a dead batch thread restarts
+- A tiny random checkpoint loads, quantizes and classifies offline
+  (skipped without torch / transformers)
+
+Run using:
+pytest tests/test_sentiment_model.py
+
+Python version: 3.13.5
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import pytest
+
+from config import SENTIMENT_LABELS
+from nlp.sentiment_model import MicroBatcher
+
+
+def test_batcher_groups_concurrent_requests():
+    batch_sizes = []
+    release = threading.Event()
+
+    def predict(texts):
+        release.wait(1)  # hold the first batch so the rest queue up
+        batch_sizes.append(len(texts))
+        return [text.upper() for text in texts]
+
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=50)
+    first = batcher.submit("a")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(batcher, text) for text in "bcdefgh"]
+        release.set()
+        results = [f.result(5) for f in futures]
+
+    assert first.result(5) == "A"
+    assert results == list("BCDEFGH")
+    assert sum(batch_sizes) == 8
+    assert max(batch_sizes) <= 4
+    assert len(batch_sizes) < 8
+
+    batcher.close()
+
+
+def test_batcher_propagates_errors():
+    def predict(texts):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(predict, max_batch_size=2, max_wait_ms=0)
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        batcher("text", timeout=5)
+
+    batcher.close()
+
+
+def test_caller_times_out_on_stalled_batch():
+    release = threading.Event()
+
+    def predict(texts):
+        release.wait(5)
+        return ["Neutral"] * len(texts)
+
+    batcher = MicroBatcher(predict, max_batch_size=1, max_wait_ms=0, timeout=0.1)
+
+    with pytest.raises(FutureTimeout):
+        batcher("stalled")
+
+    release.set()
+    assert batcher("next", timeout=5) == "Neutral"
+
+    batcher.close()
+
+
+def test_dead_batch_thread_fails_batch_and_restarts():
+    calls = []
+
+    def predict(texts):
+        calls.append(texts)
+        if len(calls) == 1:
+            raise SystemExit("model crashed")
+        return [text.upper() for text in texts]
+
+    batcher = MicroBatcher(predict, max_batch_size=1, max_wait_ms=0, timeout=5)
+
+    with pytest.raises(RuntimeError, match="batcher failed"):
+        batcher("a")
+
+    assert batcher("b") == "B"
+    assert batcher.restarts == 1
+
+    batcher.close()
+
+
+def test_tiny_random_model_classifies_offline(tmp_path):
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+
+    from nlp.sentiment_model import SentimentClassifier, create_random_model
+
+    create_random_model(
+        tmp_path, ["neck", "pain", "worried", "better"],
+        hidden_size=32, layers=2, heads=2
+    )
+
+    classifier = SentimentClassifier(tmp_path, quantize=True, max_length=32, threads=1)
+    texts = ["My neck pain is better.", "I'm worried " * 40]
+
+    assert classifier.labels == SENTIMENT_LABELS
+    assert all(label in SENTIMENT_LABELS for label in classifier.predict(texts))
+    assert not any(
+        type(module) is torch.nn.Linear for module in classifier.model.modules()
+    )
+
+    batcher = MicroBatcher(classifier.predict, max_batch_size=8, max_wait_ms=1)
+    assert batcher(texts[0], timeout=30) in SENTIMENT_LABELS
+    batcher.close()
@@ -0,0 +1,106 @@
+"""
+Unit tests for serialization and response compression
+
+Tests:
+- Compact and pretty JSON round-trip
+- gzip negotiation above the size threshold
+- Appending to a JSON array file matches a full dump
+- The appended file rotates at its size cap
+
+Run using:
+pytest tests/test_serialization.py
+
+Python version: 3.13.5
+"""
+
+import gzip
+import json
+
+from flask import Flask, jsonify, request
+
+from config import RESPONSE_COMPRESSION_MIN_BYTES
+from utils.serialization import (
+    FastJSONProvider,
+    append_json_array,
+    compress_response,
+    dumps,
+    rotated_path
+)
+
+
+def make_app() -> Flask:
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, request.accept_encodings)
+
+    @app.route("/size/<int:n>")
+    def sized(n):
+        return jsonify({"text": "é" * n})
+
+    return app
+
+
+def test_dumps_round_trip():
+    data = {"Symptoms": ["Back Pain", "Nausée"], "count": 2}
+
+    compact = dumps(data)
+    assert "\n" not in compact and "Nausée" in compact
+    assert json.loads(compact) == data
+    assert json.loads(dumps(data, pretty=True)) == data
+
+
+def test_append_json_array_matches_full_dump(tmp_path):
+    """
+    Appending batches gives the same bytes as dumping the whole list.
+    """
+    batches = [[{"text": "Neck pain – mild"}], [{"a": 1}, {"b": [1, 2]}], [{}]]
+
+    for pretty in (False, True):
+        path = tmp_path / f"log_{pretty}.json"
+        items = []
+
+        for batch in batches:
+            items.extend(batch)
+            append_json_array(path, dumps(batch, pretty=pretty))
+
+        assert path.read_text(encoding="utf-8") == dumps(items, pretty=pretty)
+
+    path = tmp_path / "empty.json"
+    path.write_text("[]\n")
+    append_json_array(path, dumps([1, 2]))
+    assert json.loads(path.read_text()) == [1, 2]
+
+
+def test_append_json_array_rotates_at_size_cap(tmp_path):
+    """
+    A full file moves to log.1.json and a new array is started.
+    """
+    path = tmp_path / "log.json"
+    batch = dumps([{"text": "x" * 20}])
+
+    for _ in range(3):
+        append_json_array(path, batch, max_bytes=len(batch) * 2 + 1)
+
+    assert rotated_path(path) == tmp_path / "log.1.json"
+    assert len(json.loads(rotated_path(path).read_text())) == 2
+    assert len(json.loads(path.read_text())) == 1
+
+
+def test_large_responses_are_gzipped_when_accepted():
+    client = make_app().test_client()
+    n = RESPONSE_COMPRESSION_MIN_BYTES
+
+    response = client.get(f"/size/{n}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data)) == {"text": "é" * n}
+
+    # Not accepted, or too small: sent as-is
+    response = client.get(f"/size/{n}", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in response.headers
+
+    response = client.get("/size/1", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
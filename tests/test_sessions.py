@@ -0,0 +1,105 @@
+"""
+Unit tests for delta /chat responses
+
+Tests:
+- Patches contain only changed fields and round-trip
+- Version mismatches fall back to a full snapshot
+- Conversations are kept per session and evicted least recently used
+- Turns folded into the window's rollup are dropped from memory
+
+Run using:
+pytest tests/test_sessions.py
+
+Python version: 3.13.5
+"""
+
+from nlp.context_window import ConversationWindow
+from nlp.turns import Role, Turn
+from utils.sessions import ConversationStore, SessionStateStore, apply_patch
+
+
+def make_output(sentiment: str, plan: str) -> dict:
+    return {
+        "summary": {"Symptoms": ["Back Pain"], "Prognosis": "Improving"},
+        "sentiment": sentiment,
+        "intent": "Reporting symptoms",
+        "soap_note": {
+            "Subjective": {"Chief_Complaint": "Back Pain"},
+            "Plan": {"Treatment": plan}
+        }
+    }
+
+
+def test_patch_contains_only_changed_fields():
+    """
+    The second turn sends just the changed sentiment and SOAP plan.
+    """
+    store = SessionStateStore()
+    first = make_output("Anxious", "Painkillers")
+    second = make_output("Reassured", "Physiotherapy")
+
+    update = store.update("s1", first)
+    assert update == {"version": 1, "snapshot": first}
+
+    update = store.update("s1", second, base_version=1)
+    assert update["version"] == 2
+    assert update["patch"] == {
+        "sentiment": "Reassured",
+        "soap_note": {"Plan": {"Treatment": "Physiotherapy"}}
+    }
+    assert apply_patch(first, update["patch"]) == second
+
+    # Unchanged output keeps the version (and so the ETag)
+    update = store.update("s1", second, base_version=2)
+    assert update == {"version": 2, "base_version": 2, "patch": {}}
+
+
+def test_version_mismatch_returns_snapshot():
+    store = SessionStateStore(max_sessions=1)
+    output = make_output("Anxious", "Painkillers")
+
+    store.update("s1", output)
+    update = store.update("s1", make_output("Neutral", "Painkillers"), base_version=7)
+    assert "snapshot" in update and update["version"] == 2
+
+    # Evicted sessions start over with a snapshot
+    store.update("s2", output)
+    assert store.get("s1") is None
+    assert "snapshot" in store.update("s1", output, base_version=2)
+
+
+def test_conversations_are_kept_per_session():
+    """
+    Each session has its own turns and analysis window.
+    """
+    store = ConversationStore(
+        max_sessions=2, make_window=lambda: ConversationWindow(size=4)
+    )
+
+    store.get("a").append(Turn.now(Role.PATIENT, "I had a whiplash injury."))
+    store.get("b").append(Turn.now(Role.PATIENT, "I have a mild headache."))
+
+    assert [t.text for t in store.get("a").turns] == ["I had a whiplash injury."]
+    window_turns, _ = store.get("b").window.snapshot()
+    assert [t.text for t in window_turns] == ["I have a mild headache."]
+
+    store.get("c")  # evicts "a", the least recently used
+
+    assert len(store) == 2
+    assert store.get("a").turns == []
+
+
+def test_folded_turns_are_dropped_from_memory():
+    """
+    A windowed conversation holds only the window's turns in full.
+    """
+    conversation = ConversationStore(
+        make_window=lambda: ConversationWindow(size=2)
+    ).get("a")
+
+    for text in ("I had a car accident.", "My neck hurts.", "It is better now."):
+        conversation.append(Turn.now(Role.PATIENT, text))
+
+    assert [t.text for t in conversation.turns] == ["My neck hurts.", "It is better now."]
+    assert conversation.turn_count == 3
+    assert conversation.window.rollup.turns_folded == 1
@@ -0,0 +1,115 @@
+"""
+Unit tests for the pipeline stage graph
+
+Tests:
+- Independent stages overlap; shared intermediates run once
+- Per-stage timeouts and graph validation
+- Precomputed stage results skip the stage
+- Concurrent pipeline output matches inline execution
+
+Run using:
+pytest tests/test_stage_graph.py
+
+Python version: 3.13.5
+"""
+
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+import pytest
+
+from nlp.pipeline import PIPELINE_GRAPH
+from nlp.stage_graph import Stage, StageGraph, StageTimeout
+
+
+def test_independent_stages_overlap_and_run_once():
+    calls = Counter()
+    request_id = ContextVar("request_id")
+
+    def slow(name, value):
+        def run(*deps):
+            calls[name] += 1
+            time.sleep(0.2)
+            return value
+        return run
+
+    graph = StageGraph(
+        [
+            Stage("shared", slow("shared", 1), ["x"]),
+            Stage("left", slow("left", 2), ["shared"]),
+            Stage("right", slow("right", 3), ["shared"]),
+            Stage("context", lambda: request_id.get()),
+            Stage("total", lambda a, b: a + b, ["left", "right"])
+        ],
+        inputs=["x"]
+    )
+
+    request_id.set("req-1")
+    start = time.perf_counter()
+    results = graph.run({"x": 0}, concurrent=True)
+    elapsed = time.perf_counter() - start
+
+    assert results["total"] == 5
+    assert results["context"] == "req-1"
+    assert calls == {"shared": 1, "left": 1, "right": 1}
+    assert elapsed < 0.55  # two levels of 0.2s, not three stages in a row
+
+
+def test_stage_timeout_and_validation():
+    graph = StageGraph(
+        [
+            Stage("fast", lambda: 1),
+            Stage("slow", lambda: time.sleep(0.5), timeout=0.05)
+        ]
+    )
+
+    with pytest.raises(StageTimeout) as exc:
+        graph.run({}, concurrent=True)
+    assert exc.value.stage == "slow"
+
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", len, ["b"]), Stage("b", len, ["a"])])
+
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", len, ["missing"])])
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_precomputed_stage_is_not_run(concurrent):
+    calls = Counter()
+
+    def parse(text):
+        calls["parse"] += 1
+        return text.upper()
+
+    graph = StageGraph(
+        [
+            Stage("parsed", parse, ["text"]),
+            Stage("length", len, ["parsed"])
+        ],
+        inputs=["text"]
+    )
+
+    results = graph.run({"text": "abc", "parsed": "cached"}, concurrent=concurrent)
+
+    assert results["parsed"] == "cached"
+    assert results["length"] == 6
+    assert not calls
+
+
+def test_concurrent_pipeline_matches_inline():
+    inputs = {
+        "transcript": (
+            "Physician: How are you feeling?\n"
+            "Patient: I had a car accident and neck pain, I'm worried.\n"
+            "Physician: You had ten physiotherapy sessions for whiplash."
+        ),
+        "patient_text": "I had a car accident and neck pain, I'm worried."
+    }
+
+    inline = PIPELINE_GRAPH.run(inputs, concurrent=False)
+    concurrent = PIPELINE_GRAPH.run(inputs, concurrent=True)
+
+    for name in ("summary", "sentiment_intent", "soap"):
+        assert concurrent[name] == inline[name]
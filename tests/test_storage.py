@@ -0,0 +1,203 @@
+"""
+Unit tests for the SQLite storage backend
+
+Tests:
+- Chat turns and outputs are appended per session
+- Bulk import keeps turn order across batches
+- Readers see committed data while a writer is active (WAL)
+- Per-thread connections are closed when their thread exits
+- Entity index AND/OR and date-range queries
+- Full-text turn search with ranked snippets
+- Stored timestamps use the turns' UTC format
+
+Run using:
+pytest tests/test_storage.py
+
+Python version: 3.13.5
+"""
+
+import gc
+import sqlite3
+import threading
+
+import pytest
+
+from nlp.turns import Role, Turn, parse_timestamp
+from utils.storage import SQLiteStorage, utc_now
+
+
+OUTPUT = {
+    "summary": {"Symptoms": ["Back Pain"]},
+    "sentiment": "Anxious",
+    "intent": "Reporting symptoms",
+    "soap_note": {"Plan": {"Treatment": "Physiotherapy"}}
+}
+
+
+def make_turns(n: int, prefix: str = "turn") -> list:
+    return [
+        {
+            "role": "Patient" if i % 2 == 0 else "Physician",
+            "text": f"{prefix} {i}",
+            "timestamp": f"2026-01-01T00:00:{i % 60:02d}"
+        }
+        for i in range(n)
+    ]
+
+
+def test_chat_turns_append_per_session(tmp_path):
+    storage = SQLiteStorage(tmp_path / "test.db")
+
+    storage.save_chat_turn("a", make_turns(2, "first"), OUTPUT)
+    storage.save_chat_turn("a", make_turns(2, "second"), None)
+    storage.save_chat_turn("b", make_turns(2), OUTPUT)
+
+    texts = [t["text"] for t in storage.get_turns("a")]
+    assert texts == ["first 0", "first 1", "second 0", "second 1"]
+
+    latest = storage.get_latest_output("a")
+    assert latest["summary"] == OUTPUT["summary"]
+    assert latest["sentiment"] == "Anxious"
+    assert storage.get_latest_output("missing") is None
+
+    sessions = {s["session_id"]: s["turn_count"] for s in storage.list_sessions()}
+    assert sessions == {"a": 4, "b": 2}
+
+    storage.close()
+
+
+def test_bulk_import_and_concurrent_reader(tmp_path):
+    storage = SQLiteStorage(tmp_path / "test.db")
+    storage.save_chat_turn("s", make_turns(1), None)
+
+    reads = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            reads.append(len(storage.get_turns("s")))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+
+    written = storage.import_conversations(
+        [("s", make_turns(2500)), ("t", make_turns(10))]
+    )
+
+    stop.set()
+    thread.join()
+
+    assert written == 2510
+    turns = storage.get_turns("s")
+    assert len(turns) == 2501
+    assert turns[-1]["text"] == "turn 2499"
+
+    # The reader only ever saw committed states, never a partial batch
+    assert reads and set(reads) <= {1, 2501}
+
+    storage.close()
+
+
+def test_thread_connections_closed_on_exit(tmp_path):
+    """
+    Short-lived request threads do not leave connections behind.
+    """
+    storage = SQLiteStorage(tmp_path / "test.db")
+    opened = []
+
+    def request():
+        opened.append(storage.connection())
+        storage.save_chat_turn("s1", make_turns(2), None)
+
+    for _ in range(5):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+    gc.collect()
+
+    assert len(opened) == 5
+    assert len(storage._connections) == 1  # this thread's
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+    assert storage.get_turns("s1")[-1]["text"] == "turn 1"
+    assert len(storage.get_turns("s1")) == 10
+
+    storage.close()
+
+
+def test_entity_index_and_or_date_queries(tmp_path):
+    storage = SQLiteStorage(tmp_path / "test.db")
+
+    def summary(diagnosis, treatment):
+        return {
+            "Symptoms": ["Neck Pain"],
+            "Diagnosis": diagnosis,
+            "Treatment": treatment,
+            "Prognosis": "Not mentioned"
+        }
+
+    storage.index_outputs([
+        ("v1", summary("Whiplash Injury", ["Physiotherapy"]), "2026-03-02T10:00:00"),
+        ("v2", summary("Whiplash Injury", ["Painkillers"]), "2026-03-20T10:00:00"),
+        ("v3", summary("Not mentioned", ["Physiotherapy"]), "2026-04-01T10:00:00")
+    ])
+
+    def ids(**kwargs):
+        return sorted(r["session_id"] for r in storage.search_sessions(**kwargs))
+
+    assert ids(all_of=["whiplash injury", "Physiotherapy"]) == ["v1"]
+    assert ids(any_of=["painkillers", "physiotherapy"]) == ["v1", "v2", "v3"]
+    assert ids(all_of=["neck pain"], any_of=["painkillers"]) == ["v2"]
+    assert ids(all_of=["neck pain"], since="2026-03-01", until="2026-03-31") == ["v1", "v2"]
+    assert ids(any_of=["whiplash injury"], field="treatment") == []
+    assert ids(any_of=["not mentioned"]) == []
+
+    # Outputs saved through /chat are indexed as they are produced
+    storage.save_chat_turn("v4", make_turns(2), OUTPUT)
+    assert ids(all_of=["back pain"]) == ["v4"]
+
+    storage.close()
+
+
+def test_full_text_search_snippets(tmp_path):
+    storage = SQLiteStorage(tmp_path / "test.db")
+
+    storage.import_conversations([
+        ("a", [
+            {"role": "Patient", "text": "I hit my head on the steering wheel."},
+            {"role": "Patient", "text": "I had trouble sleeping for weeks."}
+        ]),
+        ("b", [{"role": "Physician", "text": "Any trouble with the wheel?"}])
+    ])
+
+    results = storage.search_turns("steering wheel", mode="phrase")
+    assert [(r["session_id"], r["turn_index"]) for r in results] == [("a", 0)]
+    assert "<mark>steering wheel</mark>" in results[0]["snippet"]
+
+    assert len(storage.search_turns("trouble")) == 2
+    assert len(storage.search_turns("trouble", session_id="b")) == 1
+    assert len(storage.search_turns("sleeps wheel", mode="any")) == 3
+
+    # Operators in user input are treated as plain words
+    assert storage.search_turns('wheel" NOT steering') == []
+
+    # Turns saved through /chat are searchable immediately
+    storage.save_chat_turn("c", [{"role": "Patient", "text": "Backache again"}], None)
+    assert storage.search_turns("backache")[0]["session_id"] == "c"
+
+    storage.close()
+
+
+
+def test_utc_now_matches_turn_timestamps():
+    """
+    Output timestamps use the turn timestamp format and clock (UTC).
+    """
+    turn_time = Turn.now(Role.PATIENT, "hello").timestamp
+    now = utc_now()
+
+    assert "+" not in now and not now.endswith("Z")
+    assert turn_time <= now
+    assert abs(parse_timestamp(now) - parse_timestamp(turn_time)) < 5_000_000
@@ -0,0 +1,52 @@
+"""
+Unit tests for compact conversation turns
+
+Tests:
+- Dict round trip at the API boundary
+- Preprocessing and validation accept Turn objects directly
+
+Run using:
+pytest tests/test_turns.py
+
+Python version: 3.13.5
+"""
+
+from nlp.preprocessing import build_transcript_string, extract_patient_sentences
+from nlp.turns import Role, Turn, format_timestamp, parse_timestamp
+from utils.validators import validate_conversation
+
+
+def test_dict_round_trip():
+    entry = {
+        "role": "Physician",
+        "text": "Any dizziness?",
+        "timestamp": "2026-03-02T10:15:30.250000"
+    }
+
+    turn = Turn.from_dict(entry)
+
+    assert turn.role is Role.PHYSICIAN
+    assert isinstance(turn.timestamp_us, int)
+    assert turn.to_dict() == entry
+    assert not hasattr(turn, "__dict__")
+
+    assert parse_timestamp("2026-03-02T10:15:30+01:00") == parse_timestamp(
+        "2026-03-02T09:15:30"
+    )
+    assert format_timestamp(0) == "1970-01-01T00:00:00"
+
+
+def test_pipeline_helpers_accept_turns():
+    turns = [
+        Turn.now(Role.PATIENT, "My neck hurts."),
+        Turn.now("Physician", "Since when?"),
+        Turn.now(Role.PATIENT, "Since the accident.")
+    ]
+    dicts = [t.to_dict() for t in turns]
+
+    assert build_transcript_string(turns) == build_transcript_string(dicts)
+    assert build_transcript_string(turns).startswith("Patient: My neck hurts.\nPhysician:")
+    assert extract_patient_sentences(turns) == "My neck hurts. Since the accident."
+
+    assert validate_conversation(turns)
+    assert not validate_conversation(turns + [Turn.now(Role.PATIENT, "  ")])
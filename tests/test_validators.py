@@ -0,0 +1,77 @@
+"""
+Unit tests for validation utilities
+
+Tests:
+- Incremental conversation validation
+- Nested type checks in compiled output schemas
+- Bulk validation of pipeline outputs
+
+Run using:
+pytest tests/test_validators.py
+
+Python version: 3.13.5
+"""
+
+from utils.validators import (
+    validate_conversation,
+    validate_nlp_outputs_bulk,
+    validate_soap_note,
+    validate_structured_summary
+)
+
+
+VALID_OUTPUT = {
+    "summary": {
+        "Patient_Name": "Ms. Jones",
+        "Symptoms": ["Back Pain"],
+        "Diagnosis": "Whiplash Injury",
+        "Treatment": "Not mentioned",
+        "Current_Status": "Symptoms improving",
+        "Prognosis": "Full recovery expected",
+        "Keywords": ["car accident"]
+    },
+    "sentiment": "Reassured",
+    "intent": "Reporting improvement",
+    "soap_note": {
+        "Subjective": {"Chief_Complaint": "Back Pain", "History_of_Present_Illness": "..."},
+        "Objective": {"Physical_Exam": "...", "Observations": "..."},
+        "Assessment": {"Diagnosis": "Whiplash Injury", "Severity": "Mild"},
+        "Plan": {"Treatment": "Physiotherapy", "Follow_Up": "..."}
+    }
+}
+
+
+def test_incremental_conversation_checks_only_new_entries():
+    """
+    Entries before `start` are trusted as already validated.
+    """
+    conversation = [
+        {"role": "Nurse", "text": "already accepted"},
+        {"role": "Patient", "text": "My back hurts."}
+    ]
+
+    assert not validate_conversation(conversation)
+    assert validate_conversation(conversation, start=1)
+
+    conversation.append({"role": "Physician", "text": "   "})
+    assert not validate_conversation(conversation, start=1)
+
+
+def test_nested_field_types_are_checked():
+    """
+    Wrong types inside fields are rejected, not only missing keys.
+    """
+    assert validate_structured_summary(VALID_OUTPUT["summary"])
+    assert validate_soap_note(VALID_OUTPUT["soap_note"])
+
+    summary = dict(VALID_OUTPUT["summary"], Symptoms=["Back Pain", 3])
+    assert not validate_structured_summary(summary)
+
+    soap = dict(VALID_OUTPUT["soap_note"], Plan={"Treatment": ["Physiotherapy"]})
+    assert not validate_soap_note(soap)
+
+
+def test_bulk_validation_returns_invalid_indices():
+    outputs = [VALID_OUTPUT] * 1000 + [dict(VALID_OUTPUT, sentiment="Happy"), {}]
+
+    assert validate_nlp_outputs_bulk(outputs) == [1000, 1001]
@@ -0,0 +1,231 @@
+"""
+Admission control for the NLP pipeline
+
+Provides:
+- A bounded pending-work queue in front of run_nlp_pipeline
+- Per-request deadlines with fail-fast rejection
+- Retry-After estimates from observed pipeline latency
+- Shed / degraded counters exposed as metrics
+
+Requests beyond the concurrency limit wait in the queue; when the
+queue is full (429) or the estimated wait exceeds the deadline (503)
+they are rejected immediately instead of piling up.
+
+Python version: 3.13.5
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from config import (
+    ADMISSION_MAX_CONCURRENT,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_DEADLINE_SECONDS
+)
+
+
+class Overloaded(Exception):
+    """
+    Raised when a request is shed.
+
+    Attributes:
+        reason (str): "queue_full" or "deadline"
+        status (int): HTTP status to return (429 or 503)
+        retry_after (int): Suggested client back-off in seconds
+    """
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.status = 429 if reason == "queue_full" else 503
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded concurrency + bounded queue with deadline-aware admission.
+    """
+
+    # Weight of the newest sample in the latency moving average
+    EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        max_concurrent: int = ADMISSION_MAX_CONCURRENT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        deadline: float = ADMISSION_DEADLINE_SECONDS
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.deadline = deadline
+
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waiting = 0
+        self._avg_latency: Optional[float] = None
+
+        self._counters = {
+            "admitted": 0,
+            "shed_queue_full": 0,
+            "shed_deadline": 0,
+            "degraded": 0
+        }
+
+    # ---------------------------------------------------------------
+    # Admission
+    # ---------------------------------------------------------------
+
+    @contextmanager
+    def admit(self, deadline: Optional[float] = None):
+        """
+        Hold a pipeline slot for the duration of the block.
+
+        Raises:
+            Overloaded: if the queue is full or the deadline
+            cannot be met
+        """
+
+        deadline = self.deadline if deadline is None else deadline
+        self._acquire(deadline)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - start)
+
+    def check_capacity(self) -> None:
+        """
+        Shed without waiting when every slot and queue place is taken.
+        For callers that must not block (an event loop) before handing
+        the request to a worker; admit() still decides the rest.
+
+        Raises:
+            Overloaded: queue_full (429)
+        """
+
+        with self._cond:
+            if self._running >= self.max_concurrent and self._waiting >= self.max_queue:
+                self._counters["shed_queue_full"] += 1
+                raise Overloaded("queue_full", self._retry_after())
+
+    def shed(self, reason: str) -> Overloaded:
+        """
+        Count a request shed before it reached admit() (e.g. it timed
+        out waiting for an earlier turn of its session).
+
+        Returns:
+            Overloaded: the error to report
+        """
+
+        with self._cond:
+            self._counters[f"shed_{reason}"] += 1
+            return Overloaded(reason, self._retry_after())
+
+    def record_degraded(self) -> None:
+        with self._cond:
+            self._counters["degraded"] += 1
+
+    def _acquire(self, deadline: float) -> None:
+        with self._cond:
+            if self._running < self.max_concurrent and not self._waiting:
+                self._running += 1
+                self._counters["admitted"] += 1
+                return
+
+            if self._waiting >= self.max_queue:
+                self._counters["shed_queue_full"] += 1
+                raise Overloaded("queue_full", self._retry_after())
+
+            if self._estimated_wait(self._waiting + 1) > deadline:
+                self._counters["shed_deadline"] += 1
+                raise Overloaded("deadline", self._retry_after())
+
+            self._waiting += 1
+            expires_at = time.monotonic() + deadline
+
+            try:
+                while self._running >= self.max_concurrent:
+                    remaining = expires_at - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["shed_deadline"] += 1
+                        raise Overloaded("deadline", self._retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+            self._running += 1
+            self._counters["admitted"] += 1
+
+    def _release(self, elapsed: float) -> None:
+        with self._cond:
+            self._running -= 1
+
+            if self._avg_latency is None:
+                self._avg_latency = elapsed
+            else:
+                self._avg_latency += self.EWMA_ALPHA * (elapsed - self._avg_latency)
+
+            self._cond.notify()
+
+    # ---------------------------------------------------------------
+    # Estimates & Metrics
+    # ---------------------------------------------------------------
+
+    def _estimated_wait(self, position: int) -> float:
+        """
+        Seconds until the request at this queue position gets a slot.
+        """
+
+        if self._avg_latency is None:
+            return 0.0
+
+        slots = max(1, self.max_concurrent)
+        return self._avg_latency * math.ceil(position / slots)
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._estimated_wait(self._waiting + 1)))
+
+    def metrics(self) -> Dict:
+        """
+        Snapshot of counters and gauges.
+        """
+
+        with self._cond:
+            snapshot = dict(self._counters)
+            snapshot["inflight"] = self._running
+            snapshot["queued"] = self._waiting
+            snapshot["avg_latency_seconds"] = round(self._avg_latency or 0.0, 4)
+
+        return snapshot
+
+
+def render_prometheus(metrics: Dict, prefix: str = "physician_notetaker") -> str:
+    """
+    Render admission metrics in the Prometheus text exposition format.
+    """
+
+    lines = [
+        f"# TYPE {prefix}_admitted_total counter",
+        f"{prefix}_admitted_total {metrics['admitted']}",
+        f"# TYPE {prefix}_shed_total counter",
+        f'{prefix}_shed_total{{reason="queue_full"}} {metrics["shed_queue_full"]}',
+        f'{prefix}_shed_total{{reason="deadline"}} {metrics["shed_deadline"]}',
+        f"# TYPE {prefix}_degraded_total counter",
+        f"{prefix}_degraded_total {metrics['degraded']}",
+        f"# TYPE {prefix}_pipeline_inflight gauge",
+        f"{prefix}_pipeline_inflight {metrics['inflight']}",
+        f"# TYPE {prefix}_pipeline_queued gauge",
+        f"{prefix}_pipeline_queued {metrics['queued']}",
+        f"# TYPE {prefix}_pipeline_latency_seconds_avg gauge",
+        f"{prefix}_pipeline_latency_seconds_avg {metrics['avg_latency_seconds']}"
+    ]
+
+    return "\n".join(lines) + "\n"
+
+
+# Shared process-wide controller
+admission_controller = AdmissionController()
@@ -3,29 +3,253 @@ Central logging utility for Physician Notetaker
 
 Provides:
 - Console logging
-- File-based logging
-- Standard log formatting
+- File-based logging (daily file with size/time rotation)
+- Standard or JSON-lines log formatting
+- Non-blocking, queue-based dispatch to a single listener thread
+- Per-level sampling for high-volume log lines
+
+Every named logger only enqueues records; one background
+listener thread owns the console and file handlers, so request
+threads never block on disk I/O or contend for the handler lock.
 
 Python version: 3.13.5
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config import (
+    LOGS_DIR,
+    LOG_LEVEL,
+    LOG_FILE_PREFIX,
+    LOG_FORMAT,
+    LOG_ROTATION,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_QUEUE_SIZE,
+    LOG_SAMPLING_RATES
+)
 
 
 # -------------------------------------------------------------------
 # Logger Configuration
 # -------------------------------------------------------------------
 
-LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
+LOG_DIR = LOGS_DIR
 
-LOG_FILE = os.path.join(
-    LOG_DIR,
-    f"physician_notetaker_{datetime.utcnow().strftime('%Y%m%d')}.log"
+LOG_FILE = LOG_DIR / (
+    f"{LOG_FILE_PREFIX}_{datetime.now(timezone.utc).strftime('%Y%m%d')}.log"
 )
 
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_log_queue: Optional[queue.Queue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+# -------------------------------------------------------------------
+# Formatters & Filters
+# -------------------------------------------------------------------
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Format each record as a single JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName
+        }
+
+        # Records from the queue carry the traceback pre-rendered
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
+
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class LevelSamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of records per level.
+
+    Rates are probabilities in [0, 1]; levels without a rate
+    are always kept. WARNING and above should normally stay at 1.0.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = {
+            logging.getLevelName(level.upper()): float(rate)
+            for level, rate in rates.items()
+        }
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+
+        if rate is None or rate >= 1.0:
+            return True
+
+        return random.random() < rate
+
+
+# -------------------------------------------------------------------
+# Handler Construction
+# -------------------------------------------------------------------
+
+def build_formatter(log_format: str = LOG_FORMAT) -> logging.Formatter:
+    """
+    Return the formatter for the configured output format
+    ("text" or "json").
+    """
+
+    if log_format == "json":
+        return JsonLinesFormatter()
+
+    return logging.Formatter(fmt=TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+
+def build_file_handler(rotation: Optional[str] = LOG_ROTATION) -> logging.Handler:
+    """
+    Build the daily log file handler.
+
+    Rotation:
+    - "size": rotate when the file exceeds LOG_MAX_BYTES
+    - "time": rotate at UTC midnight
+    - None:   plain append-only file
+    """
+
+    if rotation == "size":
+        return logging.handlers.RotatingFileHandler(
+            LOG_FILE,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding="utf-8"
+        )
+
+    if rotation == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE,
+            when="midnight",
+            backupCount=LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            utc=True
+        )
+
+    return logging.FileHandler(LOG_FILE, encoding="utf-8")
+
+
+def start_log_listener() -> queue.Queue:
+    """
+    Start the shared background listener (once per process)
+    and return the queue that loggers should write to.
+    """
+
+    global _log_queue, _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            return _log_queue
+
+        formatter = build_formatter()
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        file_handler = build_file_handler()
+        file_handler.setFormatter(formatter)
+
+        # Reuse the queue across restarts so existing handlers stay attached
+        if _log_queue is None:
+            _log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+
+        _listener = logging.handlers.QueueListener(
+            _log_queue,
+            console_handler,
+            file_handler,
+            respect_handler_level=True
+        )
+        _listener.start()
+
+        atexit.register(stop_log_listener)
+
+    return _log_queue
+
+
+def stop_log_listener() -> None:
+    """
+    Flush pending records and stop the listener thread.
+    """
+
+    global _listener
+
+    with _listener_lock:
+        if _listener is None:
+            return
+
+        _listener.stop()
+        _listener = None
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that drops records instead of blocking
+    the caller when the queue is full.
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merge args into the message and render the traceback to
+        exc_text, leaving the final formatting to the listener.
+
+        The default prepare() formats the whole record with this
+        handler's (plain) formatter and clears exc_info, so the
+        listener's JSON formatter would never see the exception.
+        """
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _traceback_formatter.formatException(
+                    record.exc_info
+                )
+            # Do not keep frames alive while the record waits in the queue
+            record.exc_info = None
+
+        return record
+
+
+_traceback_formatter = logging.Formatter()
+
+
+# -------------------------------------------------------------------
+# Public API
+# -------------------------------------------------------------------
 
 def get_logger(name: str) -> logging.Logger:
     """
@@ -39,30 +263,55 @@ def get_logger(name: str) -> logging.Logger:
     """
 
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(LOG_LEVEL)
 
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
 
-    # Formatter
-    formatter = logging.Formatter(
-        fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    queue_handler = NonBlockingQueueHandler(start_log_listener())
+
+    if LOG_SAMPLING_RATES:
+        queue_handler.addFilter(LevelSamplingFilter(LOG_SAMPLING_RATES))
+
+    logger.addHandler(queue_handler)
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
+    return logger
 
-    # File handler
-    file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
 
-    # Attach handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+def _restart_listener_in_child() -> None:
+    """
+    Threads do not survive fork(); give a forked worker its own
+    queue and listener and repoint the existing queue handlers.
+    """
+
+    global _log_queue, _listener, _listener_lock
+
+    if _listener is None:
+        return
+
+    _listener_lock = threading.Lock()
+    _listener = None
+    _log_queue = None
+
+    new_queue = start_log_listener()
+
+    for logger in logging.Logger.manager.loggerDict.values():
+        for handler in getattr(logger, "handlers", []):
+            if isinstance(handler, NonBlockingQueueHandler):
+                handler.queue = new_queue
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def get_log_queue_size() -> int:
+    """
+    Number of records waiting for the background listener.
+    """
+
+    if _log_queue is None:
+        return 0
 
-    return logger
\ No newline at end of file
+    return _log_queue.qsize()
@@ -0,0 +1,262 @@
+"""
+Memory profiling utilities for Physician Notetaker
+
+Provides:
+- Process RSS lookup
+- Opt-in tracemalloc snapshots around pipeline stages
+- Periodic background snapshots
+- Top allocation sites diffed between snapshots
+
+Profiling is disabled by default (see MEMORY_PROFILING_ENABLED
+in config.py); when disabled, stage hooks are no-ops.
+
+Python version: 3.13.5
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from config import (
+    MEMORY_PROFILING_ENABLED,
+    MEMORY_SNAPSHOT_INTERVAL,
+    MEMORY_TOP_N,
+    MEMORY_TRACE_FRAMES
+)
+
+
+# -------------------------------------------------------------------
+# Process Memory
+# -------------------------------------------------------------------
+
+def get_rss_bytes() -> int:
+    """
+    Return the current resident set size of this process.
+
+    Reads /proc on Linux; elsewhere falls back to the peak RSS
+    reported by getrusage.
+    """
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if resource is None:
+        return 0
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+# -------------------------------------------------------------------
+# Snapshot Diffing
+# -------------------------------------------------------------------
+
+def diff_top_sites(
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+    limit: int = MEMORY_TOP_N
+) -> List[Dict]:
+    """
+    Compare two snapshots and return the allocation sites
+    with the largest growth.
+    """
+
+    stats = after.compare_to(before, "lineno")
+
+    top_sites = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        top_sites.append({
+            "site": f"{frame.filename}:{frame.lineno}",
+            "size_diff_bytes": stat.size_diff,
+            "size_bytes": stat.size,
+            "count_diff": stat.count_diff
+        })
+
+    return top_sites
+
+
+# -------------------------------------------------------------------
+# Memory Profiler
+# -------------------------------------------------------------------
+
+class MemoryProfiler:
+    """
+    Collects per-stage allocation deltas and periodic snapshot diffs.
+
+    Stage deltas are process-wide: with concurrent requests,
+    allocations from overlapping stages are attributed to each
+    stage that was running at the time.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = MEMORY_PROFILING_ENABLED,
+        interval: float = MEMORY_SNAPSHOT_INTERVAL,
+        top_n: int = MEMORY_TOP_N
+    ):
+        self.enabled = enabled
+        self.interval = interval
+        self.top_n = top_n
+
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+        self._interval_diff: List[Dict] = []
+        self._interval_taken_at: Optional[float] = None
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        if self.enabled:
+            self.start()
+
+    def start(self) -> None:
+        """
+        Start tracing allocations and the interval snapshot thread.
+        """
+
+        self.enabled = True
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_TRACE_FRAMES)
+
+        if self.interval > 0 and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run_interval_snapshots,
+                name="memory-profiler",
+                daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the interval thread and allocation tracing.
+        """
+
+        self.enabled = False
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Record allocation growth and top allocation sites
+        for the wrapped pipeline stage.
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        before = tracemalloc.take_snapshot()
+        current_before, _ = tracemalloc.get_traced_memory()
+
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            current_after, _ = tracemalloc.get_traced_memory()
+
+            self._record_stage(
+                name,
+                current_after - current_before,
+                diff_top_sites(before, after, self.top_n)
+            )
+
+    def take_interval_snapshot(self) -> None:
+        """
+        Take a snapshot and diff it against the previous interval snapshot.
+        """
+
+        if not tracemalloc.is_tracing():
+            return
+
+        snapshot = tracemalloc.take_snapshot()
+
+        with self._lock:
+            if self._last_snapshot is not None:
+                self._interval_diff = diff_top_sites(
+                    self._last_snapshot, snapshot, self.top_n
+                )
+            self._last_snapshot = snapshot
+            self._interval_taken_at = time.time()
+
+    def report(self) -> Dict:
+        """
+        Return collected statistics as a JSON-serializable dict.
+        """
+
+        report = {
+            "enabled": self.enabled,
+            "rss_bytes": get_rss_bytes()
+        }
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report["traced_current_bytes"] = current
+            report["traced_peak_bytes"] = peak
+
+        with self._lock:
+            report["stages"] = {
+                name: dict(stats) for name, stats in self._stages.items()
+            }
+            report["interval_top_sites"] = list(self._interval_diff)
+            report["interval_taken_at"] = self._interval_taken_at
+
+        return report
+
+    def _record_stage(self, name: str, delta: int, top_sites: List[Dict]) -> None:
+        with self._lock:
+            stats = self._stages.setdefault(name, {
+                "calls": 0,
+                "total_delta_bytes": 0,
+                "max_delta_bytes": 0
+            })
+            stats["calls"] += 1
+            stats["total_delta_bytes"] += delta
+            stats["max_delta_bytes"] = max(stats["max_delta_bytes"], delta)
+            stats["last_delta_bytes"] = delta
+            stats["last_top_sites"] = top_sites
+
+    def _run_interval_snapshots(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.take_interval_snapshot()
+
+    def _restart_in_child(self) -> None:
+        # The interval thread does not survive fork()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        if self.enabled:
+            self.start()
+
+
+# Shared process-wide profiler
+memory_profiler = MemoryProfiler()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=memory_profiler._restart_in_child)
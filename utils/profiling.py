@@ -0,0 +1,193 @@
+"""
+CPU profiling utilities for Physician Notetaker
+
+Provides:
+- A low-overhead stack sampler for a single thread
+- Collapsed-stack output ("frame;frame;frame count") accepted by
+  flamegraph.pl, speedscope and inferno
+- Per-request switching via header or sampling rate
+
+When profiling is not requested, the hooks return a null
+context and no sampler thread is started.
+
+Python version: 3.13.5
+"""
+
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+from config import (
+    CPU_PROFILE_DIR,
+    CPU_PROFILE_SAMPLE_RATE,
+    CPU_PROFILE_INTERVAL
+)
+
+
+# -------------------------------------------------------------------
+# Stack Sampler
+# -------------------------------------------------------------------
+
+class StackSampler:
+    """
+    Periodically sample the call stack of one thread and
+    count identical stacks.
+    """
+
+    def __init__(
+        self,
+        thread_id: Optional[int] = None,
+        interval: float = CPU_PROFILE_INTERVAL
+    ):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.output_path: Optional[Path] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run,
+            name="cpu-profiler",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """
+        Return samples in collapsed-stack format, one stack per line.
+        """
+
+        lines = [
+            f"{stack} {count}"
+            for stack, count in self.stacks.most_common()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            self.stacks[collapse_frame(frame)] += 1
+            self.samples += 1
+
+
+def collapse_frame(frame) -> str:
+    """
+    Render a frame and its callers as "outer;...;inner".
+    """
+
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+            f"{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+
+    names.reverse()
+    return ";".join(names)
+
+
+# -------------------------------------------------------------------
+# Public API
+# -------------------------------------------------------------------
+
+# Set while the current context is being sampled
+_sampling: ContextVar[bool] = ContextVar("cpu_profile_sampling", default=False)
+
+
+def profiling_active() -> bool:
+    """
+    True inside cpu_profile(); the sampler only sees the calling
+    thread, so work should not be handed to other threads.
+    """
+
+    return _sampling.get()
+
+
+def should_profile(requested: bool = False) -> bool:
+    """
+    Decide whether the current call should be profiled.
+
+    Args:
+        requested (bool): Explicit opt-in (e.g. an authorized header)
+
+    Returns:
+        bool
+    """
+
+    if requested:
+        return True
+
+    if CPU_PROFILE_SAMPLE_RATE <= 0:
+        return False
+
+    return random.random() < CPU_PROFILE_SAMPLE_RATE
+
+
+@contextmanager
+def _sample_to_file(label: str, output_dir: Path):
+    sampler = StackSampler()
+    sampler.start()
+    token = _sampling.set(True)
+
+    try:
+        yield sampler
+    finally:
+        _sampling.reset(token)
+        sampler.stop()
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = output_dir / (
+            f"{label}_{timestamp}_{os.getpid()}_{sampler.thread_id}.folded"
+        )
+        path.write_text(sampler.collapsed(), encoding="utf-8")
+        sampler.output_path = path
+
+
+def cpu_profile(
+    label: str,
+    enabled: bool,
+    output_dir: Path = CPU_PROFILE_DIR
+):
+    """
+    Context manager that samples the calling thread and writes a
+    collapsed-stack file to output_dir. Returns a null context when
+    enabled is False.
+    """
+
+    if not enabled:
+        return nullcontext()
+
+    return _sample_to_file(label, output_dir)
+
+
+def profile_call(label: str, func: Callable, *args, **kwargs):
+    """
+    Run func under the profiler if the sampling rate selects it.
+    Intended for batch jobs that have no request headers.
+    """
+
+    with cpu_profile(label, should_profile()):
+        return func(*args, **kwargs)
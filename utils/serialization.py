@@ -0,0 +1,281 @@
+"""
+JSON serialization and response compression
+
+Provides:
+- dumps / dumps_bytes backed by orjson when installed (standard
+  library json otherwise), selected by JSON_BACKEND
+- A Flask JSON provider using the same backend for jsonify
+- append_json_array: extend a JSON array file by rewriting its tail,
+  rotating it once it reaches a size cap
+- gzip helpers for responses above a size threshold
+
+orjson is optional; output is equivalent JSON either way (UTF-8,
+no ASCII escaping).
+
+Python version: 3.13.5
+"""
+
+import gzip
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+from config import (
+    JSON_BACKEND,
+    RESPONSE_COMPRESSION_MIN_BYTES,
+    RESPONSE_COMPRESSION_LEVEL
+)
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+
+if JSON_BACKEND not in {"auto", "orjson", "json"}:
+    raise ValueError(f"Unknown JSON_BACKEND: {JSON_BACKEND}")
+
+if JSON_BACKEND == "orjson" and orjson is None:
+    raise ImportError("JSON_BACKEND is 'orjson' but orjson is not installed")
+
+USE_ORJSON = orjson is not None and JSON_BACKEND != "json"
+
+# Bytes read from the end of a file to find the closing bracket
+ARRAY_TAIL_BYTES = 64
+
+_append_lock = threading.Lock()
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    "application/json",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "application/javascript",
+    "text/javascript"
+})
+
+
+# -------------------------------------------------------------------
+# JSON
+# -------------------------------------------------------------------
+
+def dumps_bytes(
+    obj: Any,
+    pretty: bool = False,
+    sort_keys: bool = False,
+    default=None
+) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes.
+    """
+
+    if USE_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+
+    text = dumps(obj, pretty=pretty, sort_keys=sort_keys, default=default)
+    return text.encode("utf-8")
+
+
+def dumps(
+    obj: Any,
+    pretty: bool = False,
+    sort_keys: bool = False,
+    default=None
+) -> str:
+    """
+    Serialize to a JSON string (compact unless pretty).
+    """
+
+    if USE_ORJSON:
+        return dumps_bytes(obj, pretty, sort_keys, default).decode("utf-8")
+
+    return json.dumps(
+        obj,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+        default=default
+    )
+
+
+def loads(data) -> Any:
+    if USE_ORJSON:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider routed through dumps/loads.
+    """
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        if not USE_ORJSON:
+            return super().dumps(obj, **kwargs)
+
+        return dumps(
+            obj,
+            pretty=kwargs.get("indent") is not None,
+            sort_keys=kwargs.get("sort_keys", self.sort_keys),
+            default=kwargs.get("default", self.default)
+        )
+
+    def loads(self, s, **kwargs) -> Any:
+        if not USE_ORJSON:
+            return super().loads(s, **kwargs)
+
+        return loads(s)
+
+
+def append_json_array(path: Path, rendered: str, max_bytes: int = 0) -> None:
+    """
+    Append the items of `rendered` (a JSON array as produced by dumps)
+    to the array stored at `path`, creating the file if needed.
+
+    Only the closing bracket is rewritten, so the cost depends on the
+    number of new items rather than the size of the file, and the
+    result is byte-identical to dumping the combined list. Writers in
+    other threads and processes are serialized with flock.
+
+    With max_bytes, a file the append would grow past it is first
+    rotated to rotated_path(path), replacing the previous one, and a
+    new array is started.
+    """
+
+    data = rendered.encode("utf-8")
+
+    while True:
+        with _append_lock, open(path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+
+            # Another process rotated the file while we waited for the lock
+            if not _is_current_file(f, path):
+                continue
+
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                f.write(data)
+                return
+
+            if max_bytes and size + len(data) > max_bytes:
+                os.replace(path, rotated_path(path))
+                continue
+
+            tail_start = max(0, size - ARRAY_TAIL_BYTES)
+            f.seek(tail_start)
+            tail = f.read().rstrip()
+
+            if not tail.endswith(b"]"):
+                raise ValueError(f"{path} does not end with a JSON array")
+
+            body = tail[:-1].rstrip()
+            f.truncate(tail_start + len(body))
+
+            # Items start after the new array's "["; "[]" files get no comma
+            f.write(data[1:] if body.endswith(b"[") else b"," + data[1:])
+            return
+
+
+def rotated_path(path: Path) -> Path:
+    """
+    Where append_json_array moves a full file: log.json -> log.1.json
+    """
+    return path.with_name(f"{path.stem}.1{path.suffix}")
+
+
+def _is_current_file(f, path: Path) -> bool:
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+# -------------------------------------------------------------------
+# Compression
+# -------------------------------------------------------------------
+
+def should_compress(
+    status: int,
+    mimetype: Optional[str],
+    content_encoding: Optional[str],
+    size: int,
+    gzip_quality: float
+) -> bool:
+    """
+    Whether a response body should be gzip-encoded.
+
+    gzip_quality is the client's q-value for gzip (0 = not accepted).
+    """
+
+    return (
+        200 <= status < 300
+        and status != 204
+        and not content_encoding
+        and mimetype in COMPRESSIBLE_MIMETYPES
+        and size >= RESPONSE_COMPRESSION_MIN_BYTES
+        and gzip_quality > 0
+    )
+
+
+def gzip_body(data: bytes, level: int = RESPONSE_COMPRESSION_LEVEL) -> bytes:
+    # mtime=0 keeps output deterministic for identical bodies
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_response(response, accept_encodings):
+    """
+    gzip a Flask response in place if worthwhile (after_request hook).
+    """
+
+    if response.direct_passthrough or response.is_streamed:
+        return response
+
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+
+    if not should_compress(
+        response.status_code,
+        response.mimetype,
+        response.headers.get("Content-Encoding"),
+        len(data),
+        accept_encodings["gzip"]
+    ):
+        return response
+
+    response.set_data(gzip_body(data))
+    mark_gzip_encoded(response)
+
+    return response
+
+
+def mark_gzip_encoded(response) -> None:
+    """
+    Set Content-Encoding and weaken a strong ETag: the encoded body is
+    a different representation of the same version.
+    """
+
+    response.headers["Content-Encoding"] = "gzip"
+
+    tag, weak = response.get_etag()
+    if tag and not weak:
+        response.set_etag(tag, weak=True)
@@ -0,0 +1,250 @@
+"""
+Per-session state for /chat
+
+ConversationStore keeps each session's turns (and analysis window)
+apart, so the pipeline for one client never sees another client's
+turns.
+
+SessionStateStore keeps the last NLP output sent to each client
+session together with a version number. Each new output is diffed against it and returned
+as a JSON merge patch (RFC 7396): only changed fields are sent, and
+a removed field is sent as null.
+
+A client that sends the version it holds (base_version) gets a patch
+against it; any mismatch (unknown session, evicted state, another
+worker process) gets a full snapshot instead.
+
+Python version: 3.13.5
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import SESSION_STATE_MAX_SESSIONS, SESSION_ID_MAX_LENGTH
+from nlp.turns import Turn
+
+
+OUTPUT_FIELDS = ("summary", "sentiment", "intent", "soap_note", "rules_version")
+
+
+# -------------------------------------------------------------------
+# Merge Patch Helpers
+# -------------------------------------------------------------------
+
+def diff_outputs(previous: Dict, current: Dict) -> Dict:
+    """
+    Merge patch that turns `previous` into `current`.
+    Nested dicts are diffed recursively; other values are replaced whole.
+    """
+
+    patch = {}
+
+    for key, value in current.items():
+        old = previous.get(key)
+
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = diff_outputs(old, value)
+            if nested:
+                patch[key] = nested
+        elif key not in previous or old != value:
+            patch[key] = value
+
+    for key in previous.keys() - current.keys():
+        patch[key] = None
+
+    return patch
+
+
+def apply_patch(document: Dict, patch: Dict) -> Dict:
+    """
+    Apply a merge patch, returning a new document.
+    """
+
+    result = dict(document)
+
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        elif isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = apply_patch(result[key], value)
+        else:
+            result[key] = value
+
+    return result
+
+
+def make_etag(version: int, rules_version: Optional[str] = None) -> str:
+    """
+    Entity tag (unquoted) for a session output version, qualified by
+    the rule tables version that produced it.
+    """
+
+    if rules_version is None:
+        return f"v{version}"
+
+    return f"v{version}.{rules_version}"
+
+
+def valid_session_id(session_id: Any) -> bool:
+    return (
+        isinstance(session_id, str)
+        and 0 < len(session_id) <= SESSION_ID_MAX_LENGTH
+    )
+
+
+# -------------------------------------------------------------------
+# Session Store
+# -------------------------------------------------------------------
+
+class SessionStateStore:
+    """
+    Bounded LRU map of session_id -> (version, last output sent).
+    """
+
+    def __init__(self, max_sessions: int = SESSION_STATE_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._states: "OrderedDict[str, Tuple[int, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        session_id: str,
+        output: Dict,
+        base_version: Optional[int] = None
+    ) -> Dict:
+        """
+        Record a new output for the session.
+
+        The version only advances when the output changed.
+
+        Returns:
+            Dict: {"version", "base_version", "patch"} when the client
+            holds base_version, else {"version", "snapshot"}
+        """
+
+        output = {field: output[field] for field in OUTPUT_FIELDS if field in output}
+
+        with self._lock:
+            previous_version, previous = self._states.get(session_id, (0, None))
+
+            patch = diff_outputs(previous, output) if previous is not None else None
+            version = previous_version + 1 if patch is None or patch else previous_version
+
+            self._states[session_id] = (version, output)
+            self._states.move_to_end(session_id)
+
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+        if patch is None or base_version != previous_version:
+            return {"version": version, "snapshot": output}
+
+        return {
+            "version": version,
+            "base_version": base_version,
+            "patch": patch
+        }
+
+    def get(self, session_id: str) -> Optional[Tuple[int, Dict]]:
+        """
+        Current (version, output) for the session, if tracked.
+        """
+
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None:
+                self._states.move_to_end(session_id)
+
+        return state
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+# -------------------------------------------------------------------
+# Conversation Store
+# -------------------------------------------------------------------
+
+class Conversation:
+    """
+    Turns of one session and, if enabled, its bounded analysis window.
+    Hold `lock` while appending and analyzing, so one session's turns
+    are processed in order.
+
+    With a window, `turns` keeps only the turns still in the window;
+    older ones live on in the window's rollup (and in storage).
+    `turn_count` counts every turn appended.
+    """
+
+    __slots__ = ("turns", "turn_count", "window", "lock")
+
+    def __init__(self, window=None):
+        self.turns: List[Turn] = []
+        self.turn_count = 0
+        self.window = window
+        self.lock = threading.Lock()
+
+    def append(self, turn: Turn) -> None:
+        self.turns.append(turn)
+        self.turn_count += 1
+
+        if self.window is not None:
+            self.window.append(turn)
+
+            # Folded into the rollup; no longer needed in full
+            if len(self.turns) > self.window.size:
+                del self.turns[:len(self.turns) - self.window.size]
+
+
+class ConversationStore:
+    """
+    Bounded LRU map of session_id -> Conversation.
+
+    make_window builds the analysis window for a new session
+    (None = analyze the full history).
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_STATE_MAX_SESSIONS,
+        make_window: Optional[Callable[[], Any]] = None
+    ):
+        self.max_sessions = max_sessions
+        self.make_window = make_window
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Conversation:
+        """
+        The session's conversation, created empty on first use.
+        """
+
+        with self._lock:
+            conversation = self._conversations.get(session_id)
+
+            if conversation is None:
+                window = self.make_window() if self.make_window else None
+                conversation = self._conversations[session_id] = Conversation(window)
+
+            self._conversations.move_to_end(session_id)
+
+            while len(self._conversations) > self.max_sessions:
+                self._conversations.popitem(last=False)
+
+        return conversation
+
+    def values(self) -> List[Conversation]:
+        with self._lock:
+            return list(self._conversations.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conversations.clear()
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+
+# Shared process-wide store
+session_store = SessionStateStore()
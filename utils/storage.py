@@ -0,0 +1,783 @@
+"""
+Storage backends for conversations and pipeline outputs
+
+Provides:
+- StorageBackend: abstract interface used by the chat endpoints and
+  batch jobs
+- SQLiteStorage: embedded database with sessions, turns and outputs
+  tables, indexed by session and timestamp
+- An inverted entity index (term -> sessions with first/last seen
+  timestamps) filled from each pipeline output, with AND/OR and
+  date-range queries
+- Full-text search over turn text (FTS5, bm25-ranked snippets),
+  kept current by triggers on every turn insert
+- get_storage(): the configured backend (None = flat JSON files)
+
+SQLite runs in WAL mode, so readers never block the writer and the
+writer never blocks readers. Each thread gets its own connection,
+closed when the thread exits; statements are constant SQL strings,
+which sqlite3 prepares once and reuses from its per-connection
+statement cache. A chat turn is one short transaction; bulk imports
+batch rows through executemany.
+
+Python version: 3.13.5
+"""
+
+import heapq
+import os
+import re
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from config import (
+    STORAGE_BACKEND,
+    SQLITE_DB_PATH,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_IMPORT_BATCH_SIZE,
+    SEARCH_MAX_CANDIDATES
+)
+from nlp.turns import Turn
+from utils.serialization import dumps, loads
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id  TEXT PRIMARY KEY,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    turn_count  INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+
+CREATE TABLE IF NOT EXISTS turns (
+    turn_id     INTEGER PRIMARY KEY,
+    session_id  TEXT NOT NULL REFERENCES sessions (session_id),
+    turn_index  INTEGER NOT NULL,
+    role        TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    timestamp   TEXT NOT NULL,
+    UNIQUE (session_id, turn_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_turns_timestamp ON turns (timestamp);
+
+CREATE TABLE IF NOT EXISTS outputs (
+    output_id   INTEGER PRIMARY KEY,
+    session_id  TEXT NOT NULL REFERENCES sessions (session_id),
+    created_at  TEXT NOT NULL,
+    summary     TEXT NOT NULL,
+    sentiment   TEXT NOT NULL,
+    intent      TEXT NOT NULL,
+    soap_note   TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_outputs_session_time ON outputs (session_id, created_at);
+
+CREATE TABLE IF NOT EXISTS entity_postings (
+    term        TEXT NOT NULL,
+    session_id  TEXT NOT NULL,
+    fields      INTEGER NOT NULL,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    PRIMARY KEY (term, session_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_postings_term_seen ON entity_postings (term, last_seen);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5 (
+    text,
+    content = 'turns',
+    content_rowid = 'turn_id',
+    tokenize = 'porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS turns_fts_insert AFTER INSERT ON turns BEGIN
+    INSERT INTO turns_fts (rowid, text) VALUES (new.turn_id, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS turns_fts_delete AFTER DELETE ON turns BEGIN
+    INSERT INTO turns_fts (turns_fts, rowid, text)
+    VALUES ('delete', old.turn_id, old.text);
+END;
+"""
+
+UPSERT_SESSION = """
+INSERT INTO sessions (session_id, created_at, updated_at, turn_count)
+VALUES (?, ?, ?, 0)
+ON CONFLICT (session_id) DO UPDATE SET updated_at = excluded.updated_at
+"""
+
+SELECT_TURN_COUNT = "SELECT turn_count FROM sessions WHERE session_id = ?"
+
+UPDATE_TURN_COUNT = "UPDATE sessions SET turn_count = ? WHERE session_id = ?"
+
+INSERT_TURN = """
+INSERT INTO turns (session_id, turn_index, role, text, timestamp)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+INSERT_OUTPUT = """
+INSERT INTO outputs (session_id, created_at, summary, sentiment, intent, soap_note)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_POSTING = """
+INSERT INTO entity_postings (term, session_id, fields, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (term, session_id) DO UPDATE SET
+    fields = fields | excluded.fields,
+    first_seen = min(first_seen, excluded.first_seen),
+    last_seen = max(last_seen, excluded.last_seen)
+"""
+
+# Summary field -> posting field name
+INDEXED_FIELDS = {
+    "Symptoms": "symptom",
+    "Diagnosis": "diagnosis",
+    "Treatment": "treatment",
+    "Prognosis": "prognosis",
+    "Keywords": "keyword"
+}
+
+# Posting field name -> bit in entity_postings.fields
+FIELD_BITS = {field: 1 << i for i, field in enumerate(INDEXED_FIELDS.values())}
+
+# Highlight markers and context size for full-text snippets
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_TOKENS = 12
+
+# Placeholders written by handle_missing_data; never indexed
+PLACEHOLDER_VALUES = {"", "not mentioned", "unknown"}
+
+
+def utc_now() -> str:
+    # Same ISO format as turn timestamps (UTC, no offset suffix), so
+    # columns sort and range-compare together
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def turn_row(turn: Union[Turn, Dict], now: str) -> Tuple[str, str, str]:
+    """
+    (role, text, timestamp) column values of a Turn or a turn dict.
+    """
+
+    if isinstance(turn, Turn):
+        return turn.role.value, turn.text, turn.timestamp
+
+    return turn["role"], turn["text"], turn.get("timestamp") or now
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(str(term).lower().split())
+
+
+def entity_terms(summary: Dict) -> Dict[str, int]:
+    """
+    Terms to index from a structured summary, with their field bits.
+    """
+
+    terms: Dict[str, int] = {}
+
+    for key, field in INDEXED_FIELDS.items():
+        values = summary.get(key)
+        if values is None:
+            continue
+
+        for value in values if isinstance(values, list) else [values]:
+            term = normalize_term(value)
+            if term not in PLACEHOLDER_VALUES:
+                terms[term] = terms.get(term, 0) | FIELD_BITS[field]
+
+    return terms
+
+
+FTS_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+SEARCH_MODES = ("all", "any", "phrase")
+
+
+def build_fts_query(text: str, mode: str = "all") -> str:
+    """
+    Turn free text into a safe FTS5 query: every word is quoted, so
+    user input can never be parsed as FTS5 operators.
+
+    mode: "all" (every word), "any" (at least one) or "phrase"
+    """
+
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+
+    tokens = FTS_TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return ""
+
+    if mode == "phrase":
+        return '"' + " ".join(tokens) + '"'
+
+    quoted = [f'"{token}"' for token in tokens]
+    return (" OR " if mode == "any" else " ").join(quoted)
+
+
+def range_bounds(since: Optional[str], until: Optional[str]) -> Tuple[str, str]:
+    """
+    ISO bounds for timestamp comparisons; a date-only `until`
+    covers that whole day.
+    """
+
+    if until is not None and len(until) == 10:
+        until += "T23:59:59.999999"
+
+    return since or "", until or "9999"
+
+
+# -------------------------------------------------------------------
+# Interface
+# -------------------------------------------------------------------
+
+class StorageBackend(ABC):
+    """
+    Persistence for session turns and pipeline outputs.
+    """
+
+    @abstractmethod
+    def save_chat_turn(
+        self,
+        session_id: str,
+        turns: List[Union[Turn, Dict]],
+        nlp_output: Optional[Dict]
+    ) -> None:
+        """
+        Append the turns of one /chat call and its output atomically.
+        """
+
+    @abstractmethod
+    def import_conversations(
+        self,
+        conversations: Iterable[Tuple[str, List[Dict]]]
+    ) -> int:
+        """
+        Bulk-append (session_id, turns) pairs. Returns turns written.
+        """
+
+    @abstractmethod
+    def get_turns(self, session_id: str, start: int = 0) -> List[Dict]:
+        """
+        Turns of a session in order, from turn index `start`.
+        """
+
+    @abstractmethod
+    def count_turns(self, session_id: str) -> int:
+        """
+        Number of turns stored for a session (0 if unknown).
+        """
+
+    @abstractmethod
+    def get_latest_output(self, session_id: str) -> Optional[Dict]:
+        """
+        The most recent pipeline output saved for a session.
+        """
+
+    @abstractmethod
+    def list_sessions(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Sessions active in [since, until] (ISO timestamps), newest first.
+        """
+
+    @abstractmethod
+    def search_sessions(
+        self,
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        field: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict]:
+        """
+        Sessions whose outputs mention every term in all_of and at
+        least one term in any_of, with each term last mentioned
+        within [since, until].
+        """
+
+    @abstractmethod
+    def search_turns(
+        self,
+        text: str,
+        mode: str = "all",
+        session_id: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """
+        Turns matching free text, best first, with highlighted snippets.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+# -------------------------------------------------------------------
+# SQLite
+# -------------------------------------------------------------------
+
+class _ConnectionHolder:
+    """
+    Thread-local owner of one connection. The thread's locals are
+    released when it exits, which fires the holder's finalizer.
+    """
+
+    __slots__ = ("conn", "pid", "finalizer", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.pid = os.getpid()
+        self.finalizer: Optional[weakref.finalize] = None
+
+
+def _close_connection(
+    conn: sqlite3.Connection,
+    connections: Set[sqlite3.Connection],
+    lock: threading.Lock
+) -> None:
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Embedded SQLite backend (WAL, one connection per thread).
+    """
+
+    def __init__(self, path: Path = SQLITE_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._local = threading.local()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._lock = threading.Lock()
+
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    # ---------------------------------------------------------------
+    # Connections
+    # ---------------------------------------------------------------
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        This thread's connection; reopened after fork since SQLite
+        handles must not be shared across processes. It is closed
+        when the thread exits, so short-lived request threads do not
+        accumulate open handles.
+        """
+
+        holder = getattr(self._local, "holder", None)
+
+        if holder is None or holder.pid != os.getpid():
+            if holder is not None:
+                # Inherited from the parent: drop it without closing,
+                # the parent still owns the database handle
+                holder.finalizer.detach()
+                with self._lock:
+                    self._connections.discard(holder.conn)
+
+            conn = sqlite3.connect(
+                self.path,
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+
+            holder = _ConnectionHolder(conn)
+            holder.finalizer = weakref.finalize(
+                holder, _close_connection, conn, self._connections, self._lock
+            )
+            self._local.holder = holder
+
+            with self._lock:
+                self._connections.add(conn)
+
+        return holder.conn
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+        self._local = threading.local()
+
+    # ---------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------
+
+    def _append_turns(
+        self,
+        conn: sqlite3.Connection,
+        session_id: str,
+        turns: List[Union[Turn, Dict]],
+        now: str
+    ) -> None:
+        conn.execute(UPSERT_SESSION, (session_id, now, now))
+        start = conn.execute(SELECT_TURN_COUNT, (session_id,)).fetchone()[0]
+
+        for offset in range(0, len(turns), SQLITE_IMPORT_BATCH_SIZE):
+            batch = turns[offset:offset + SQLITE_IMPORT_BATCH_SIZE]
+            conn.executemany(
+                INSERT_TURN,
+                [
+                    (session_id, start + offset + i, *turn_row(turn, now))
+                    for i, turn in enumerate(batch)
+                ]
+            )
+
+        conn.execute(UPDATE_TURN_COUNT, (start + len(turns), session_id))
+
+    def save_chat_turn(
+        self,
+        session_id: str,
+        turns: List[Union[Turn, Dict]],
+        nlp_output: Optional[Dict]
+    ) -> None:
+        conn = self.connection()
+        now = utc_now()
+
+        # IMMEDIATE takes the write lock up front, so the turn_count
+        # read and the inserts cannot interleave with another writer
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._append_turns(conn, session_id, turns, now)
+
+            if nlp_output is not None:
+                self._index_entities(conn, [(session_id, nlp_output["summary"], now)])
+                conn.execute(
+                    INSERT_OUTPUT,
+                    (
+                        session_id,
+                        now,
+                        dumps(nlp_output["summary"]),
+                        nlp_output["sentiment"],
+                        nlp_output["intent"],
+                        dumps(nlp_output["soap_note"])
+                    )
+                )
+
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def import_conversations(
+        self,
+        conversations: Iterable[Tuple[str, List[Dict]]]
+    ) -> int:
+        conn = self.connection()
+        now = utc_now()
+        written = 0
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for session_id, turns in conversations:
+                self._append_turns(conn, session_id, turns, now)
+                written += len(turns)
+
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return written
+
+    def _index_entities(
+        self,
+        conn: sqlite3.Connection,
+        items: Iterable[Tuple[str, Dict, str]]
+    ) -> int:
+        rows = [
+            (term, session_id, fields, timestamp, timestamp)
+            for session_id, summary, timestamp in items
+            for term, fields in entity_terms(summary).items()
+        ]
+        conn.executemany(UPSERT_POSTING, rows)
+        return len(rows)
+
+    def index_outputs(self, items: Iterable[Tuple[str, Dict, str]]) -> int:
+        """
+        Bulk-index (session_id, summary, timestamp) triples, e.g. when
+        backfilling archived sessions. Returns postings written.
+        """
+
+        conn = self.connection()
+        items = iter(items)
+        written = 0
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                batch = list(islice(items, SQLITE_IMPORT_BATCH_SIZE))
+                if not batch:
+                    break
+                written += self._index_entities(conn, batch)
+
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return written
+
+    # ---------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------
+
+    def get_turns(self, session_id: str, start: int = 0) -> List[Dict]:
+        rows = self.connection().execute(
+            "SELECT role, text, timestamp FROM turns "
+            "WHERE session_id = ? AND turn_index >= ? ORDER BY turn_index",
+            (session_id, start)
+        )
+        return [dict(row) for row in rows]
+
+    def count_turns(self, session_id: str) -> int:
+        row = self.connection().execute(SELECT_TURN_COUNT, (session_id,)).fetchone()
+        return row[0] if row is not None else 0
+
+    def get_latest_output(self, session_id: str) -> Optional[Dict]:
+        row = self.connection().execute(
+            "SELECT summary, sentiment, intent, soap_note, created_at FROM outputs "
+            "WHERE session_id = ? ORDER BY created_at DESC, output_id DESC LIMIT 1",
+            (session_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            "summary": loads(row["summary"]),
+            "sentiment": row["sentiment"],
+            "intent": row["intent"],
+            "soap_note": loads(row["soap_note"]),
+            "created_at": row["created_at"]
+        }
+
+    def list_sessions(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Sessions active in [since, until] (ISO timestamps), newest first.
+        """
+
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("updated_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("updated_at <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+
+        rows = self.connection().execute(
+            "SELECT session_id, created_at, updated_at, turn_count FROM sessions "
+            f"{where}ORDER BY updated_at DESC",
+            params
+        )
+        return [dict(row) for row in rows]
+
+    def search_sessions(
+        self,
+        all_of: Sequence[str] = (),
+        any_of: Sequence[str] = (),
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        field: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict]:
+        """
+        Newest sessions first. Postings are walked in last_seen order
+        through the (term, last_seen) index and the scan stops once
+        `limit` sessions match, so cost tracks the result size rather
+        than the posting list lengths.
+        """
+
+        all_terms = list(dict.fromkeys(normalize_term(t) for t in all_of))
+        any_terms = list(dict.fromkeys(normalize_term(t) for t in any_of))
+
+        if field is not None and field not in FIELD_BITS:
+            raise ValueError(f"Unknown entity field: {field}")
+
+        lower, upper = range_bounds(since, until)
+
+        # Date-range (and field) filter for a posting alias; the range
+        # applies to last_seen so it is an index range, not a scan
+        def matches(alias: str) -> Tuple[str, List]:
+            sql = f"{alias}.last_seen BETWEEN ? AND ?"
+            params = [lower, upper]
+            if field is not None:
+                sql += f" AND {alias}.fields & ? != 0"
+                params.append(FIELD_BITS[field])
+            return sql, params
+
+        conn = self.connection()
+        p_filter, p_params = matches("p")
+        q_filter, q_params = matches("q")
+
+        if all_terms:
+            # Drive from one AND term; check the others per candidate
+            # through the (term, session_id) primary key
+            driver, *others = all_terms
+            sql = (
+                "SELECT p.session_id, p.last_seen FROM entity_postings p "
+                f"WHERE p.term = ? AND {p_filter}"
+            )
+            params = [driver, *p_params]
+
+            for term in others:
+                sql += (
+                    " AND EXISTS (SELECT 1 FROM entity_postings q WHERE q.term = ? "
+                    f"AND q.session_id = p.session_id AND {q_filter})"
+                )
+                params += [term, *q_params]
+
+            if any_terms:
+                placeholders = ", ".join("?" * len(any_terms))
+                sql += (
+                    " AND EXISTS (SELECT 1 FROM entity_postings q "
+                    f"WHERE q.term IN ({placeholders}) "
+                    f"AND q.session_id = p.session_id AND {q_filter})"
+                )
+                params += [*any_terms, *q_params]
+
+            rows = conn.execute(f"{sql} ORDER BY p.last_seen DESC LIMIT ?", [*params, limit])
+            return [dict(row) for row in rows]
+
+        # OR only: merge per-term streams newest first, skipping repeats
+        streams = [
+            conn.execute(
+                "SELECT p.session_id, p.last_seen FROM entity_postings p "
+                f"WHERE p.term = ? AND {p_filter} ORDER BY p.last_seen DESC",
+                [term, *p_params]
+            )
+            for term in any_terms
+        ]
+
+        results: List[Dict] = []
+        seen = set()
+
+        for session_id, last_seen in heapq.merge(
+            *streams, key=lambda row: row[1], reverse=True
+        ):
+            if session_id in seen:
+                continue
+            seen.add(session_id)
+            results.append({"session_id": session_id, "last_seen": last_seen})
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def search_turns(
+        self,
+        text: str,
+        mode: str = "all",
+        session_id: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """
+        Ranks the newest SEARCH_MAX_CANDIDATES matches by bm25 and
+        builds snippets only for the returned page, so a common word
+        costs the same as a rare one; an older turn that would have
+        outranked them is not returned.
+        """
+
+        query = build_fts_query(text, mode)
+        if not query:
+            return []
+
+        candidates = "SELECT rowid, rank FROM turns_fts WHERE turns_fts MATCH ?"
+        params: List = [query]
+
+        if session_id is not None:
+            candidates += (
+                " AND rowid IN (SELECT turn_id FROM turns WHERE session_id = ?)"
+            )
+            params.append(session_id)
+
+        sql = (
+            "SELECT t.session_id, t.turn_index, t.role, t.timestamp, "
+            f"snippet(turns_fts, 0, '{SNIPPET_OPEN}', '{SNIPPET_CLOSE}', '…', "
+            f"{SNIPPET_TOKENS}) AS snippet, "
+            "top.rank AS score "
+            "FROM ("
+            f"SELECT rowid, rank FROM ({candidates} ORDER BY rowid DESC LIMIT ?) "
+            "ORDER BY rank LIMIT ?"
+            ") AS top "
+            "JOIN turns_fts ON turns_fts.rowid = top.rowid "
+            "JOIN turns t ON t.turn_id = top.rowid "
+            "WHERE turns_fts MATCH ? "
+            "ORDER BY top.rank"
+        )
+
+        rows = self.connection().execute(
+            sql, [*params, SEARCH_MAX_CANDIDATES, limit, query]
+        )
+
+        # bm25 rank is lower-is-better; report higher-is-better
+        return [
+            {**dict(row), "score": round(-row["score"], 4)}
+            for row in rows
+        ]
+
+    def rebuild_search_index(self) -> None:
+        """
+        Re-index all stored turns (for databases created before the
+        full-text index existed).
+        """
+
+        self.connection().execute(
+            "INSERT INTO turns_fts (turns_fts) VALUES ('rebuild')"
+        )
+
+
+# -------------------------------------------------------------------
+# Factory
+# -------------------------------------------------------------------
+
+STORAGE_BACKENDS = {
+    "sqlite": SQLiteStorage
+}
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> Optional[StorageBackend]:
+    """
+    The configured backend, created once per process.
+    None means the flat JSON files in data/ are used.
+    """
+
+    if STORAGE_BACKEND == "json":
+        return None
+
+    if STORAGE_BACKEND not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+    return STORAGE_BACKENDS[STORAGE_BACKEND]()
@@ -2,41 +2,155 @@
 Validation utilities for Physician Notetaker
 
 Provides:
-- Conversation schema validation
+- Conversation schema validation (full or incremental)
 - NLP output validation
 - Medical field checks
+- Bulk validation for batch jobs
+
+Output schemas are declared once and compiled into nested checker
+functions at import time, so each call only runs the type checks
+and never re-interprets the schema.
 
 Python version: 3.13.5
 """
 
-from typing import List, Dict
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+from nlp.turns import Role, Turn
+
+
+# -------------------------------------------------------------------
+# Schema Compilation
+# -------------------------------------------------------------------
+
+Checker = Callable[[Any], bool]
+
+
+def compile_schema(spec) -> Checker:
+    """
+    Compile a schema spec into a checker function.
+
+    Spec forms:
+    - type: isinstance check (e.g. str)
+    - frozenset: value must be one of the members
+    - [spec]: list whose items all match spec
+    - (spec, spec, ...): matches any alternative
+    - {key: spec}: dict with all keys present, each value matching
+    - callable: used as the predicate itself
+    """
+
+    if isinstance(spec, type):
+        return lambda value: isinstance(value, spec)
+
+    if isinstance(spec, frozenset):
+        return lambda value: value in spec
+
+    if isinstance(spec, list):
+        item_check = compile_schema(spec[0])
+        return lambda value: (
+            isinstance(value, list) and all(item_check(item) for item in value)
+        )
+
+    if isinstance(spec, tuple):
+        alternatives = [compile_schema(s) for s in spec]
+        return lambda value: any(check(value) for check in alternatives)
+
+    if isinstance(spec, dict):
+        fields = [(key, compile_schema(s)) for key, s in spec.items()]
+
+        def check_dict(value) -> bool:
+            if not isinstance(value, dict):
+                return False
+            for key, check in fields:
+                if key not in value or not check(value[key]):
+                    return False
+            return True
+
+        return check_dict
+
+    if callable(spec):
+        return spec
+
+    raise TypeError(f"Unsupported schema spec: {spec!r}")
+
+
+def non_empty_str(value) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+# "Not mentioned" placeholders replace empty lists (see handle_missing_data)
+STR_OR_STR_LIST = (str, [str])
+
+SUMMARY_SCHEMA = {
+    "Patient_Name": str,
+    "Symptoms": STR_OR_STR_LIST,
+    "Diagnosis": STR_OR_STR_LIST,
+    "Treatment": STR_OR_STR_LIST,
+    "Current_Status": str,
+    "Prognosis": STR_OR_STR_LIST
+}
+
+SENTIMENTS = frozenset({"Anxious", "Neutral", "Reassured"})
+
+SOAP_SCHEMA = {
+    "Subjective": {"Chief_Complaint": str, "History_of_Present_Illness": str},
+    "Objective": {"Physical_Exam": str, "Observations": str},
+    "Assessment": {"Diagnosis": str, "Severity": str},
+    "Plan": {"Treatment": str, "Follow_Up": str}
+}
+
+_check_summary = compile_schema(SUMMARY_SCHEMA)
+_check_keywords = compile_schema([str])
+_check_sentiment = compile_schema(SENTIMENTS)
+_check_soap = compile_schema(SOAP_SCHEMA)
 
 
 # -------------------------------------------------------------------
 # Conversation Validation
 # -------------------------------------------------------------------
 
-def validate_conversation(conversation: List[Dict]) -> bool:
+VALID_ROLES = frozenset({"Patient", "Physician"})
+
+
+def validate_turn(entry: Union[Turn, Dict]) -> bool:
+    """
+    Validate a single conversation entry (Turn or dict).
+    """
+
+    if isinstance(entry, Turn):
+        return isinstance(entry.role, Role) and non_empty_str(entry.text)
+
+    if not isinstance(entry, dict):
+        return False
+
+    if entry.get("role") not in VALID_ROLES:
+        return False
+
+    return non_empty_str(entry.get("text"))
+
+
+def validate_conversation(
+    conversation: List[Union[Turn, Dict]],
+    start: int = 0
+) -> bool:
     """
     Validate conversation structure.
 
     Each entry must contain:
     - role (Patient or Physician)
     - text (non-empty string)
+
+    Args:
+        start (int): Number of leading entries already validated;
+            only entries from this index on are checked, so an
+            append-only history costs O(new turns) per call.
     """
 
     if not isinstance(conversation, list):
         return False
 
-    for entry in conversation:
-        if not isinstance(entry, dict):
-            return False
-
-        if entry.get("role") not in {"Patient", "Physician"}:
-            return False
-
-        text = entry.get("text")
-        if not isinstance(text, str) or not text.strip():
+    for index in range(start, len(conversation)):
+        if not validate_turn(conversation[index]):
             return False
 
     return True
@@ -48,23 +162,13 @@ def validate_conversation(conversation: List[Dict]) -> bool:
 
 def validate_structured_summary(summary: Dict) -> bool:
     """
-    Validate structured medical summary JSON.
+    Validate structured medical summary JSON, including field types.
     """
 
-    required_fields = {
-        "Patient_Name",
-        "Symptoms",
-        "Diagnosis",
-        "Treatment",
-        "Current_Status",
-        "Prognosis"
-    }
-
-    if not isinstance(summary, dict):
+    if not _check_summary(summary):
         return False
 
-    missing = required_fields - summary.keys()
-    if missing:
+    if "Keywords" in summary and not _check_keywords(summary["Keywords"]):
         return False
 
     return True
@@ -79,15 +183,7 @@ def validate_sentiment_intent(sentiment: str, intent: str) -> bool:
     Validate sentiment and intent values.
     """
 
-    valid_sentiments = {"Anxious", "Neutral", "Reassured"}
-
-    if sentiment not in valid_sentiments:
-        return False
-
-    if not isinstance(intent, str) or not intent.strip():
-        return False
-
-    return True
+    return _check_sentiment(sentiment) and non_empty_str(intent)
 
 
 # -------------------------------------------------------------------
@@ -96,20 +192,41 @@ def validate_sentiment_intent(sentiment: str, intent: str) -> bool:
 
 def validate_soap_note(soap_note: Dict) -> bool:
     """
-    Validate SOAP note structure.
+    Validate SOAP note structure and section field types.
     """
 
-    required_sections = {
-        "Subjective",
-        "Objective",
-        "Assessment",
-        "Plan"
-    }
+    return _check_soap(soap_note)
 
-    if not isinstance(soap_note, dict):
-        return False
 
-    if not required_sections.issubset(soap_note.keys()):
+# -------------------------------------------------------------------
+# Pipeline Output Validation
+# -------------------------------------------------------------------
+
+def validate_nlp_output(output: Dict) -> bool:
+    """
+    Validate one run_nlp_pipeline result.
+    """
+
+    try:
+        return (
+            validate_structured_summary(output["summary"])
+            and validate_sentiment_intent(output["sentiment"], output["intent"])
+            and validate_soap_note(output["soap_note"])
+        )
+    except (KeyError, TypeError):
         return False
 
-    return True
\ No newline at end of file
+
+def validate_nlp_outputs_bulk(outputs: Iterable[Dict]) -> List[int]:
+    """
+    Validate many pipeline results in one call.
+
+    Returns:
+        List[int]: Indices of invalid outputs (empty if all valid)
+    """
+
+    return [
+        index
+        for index, output in enumerate(outputs)
+        if not validate_nlp_output(output)
+    ]
\ No newline at end of file